@@ -0,0 +1,344 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from .encoding import dumps_json
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Two-tier result cache (dashboards, segments, KPIs)
+# ---------------------------------------------------------
+# Tier 1: per-process LRU, no I/O. Tier 2 (optional): a Redis-protocol server
+# shared by every worker, so one worker's computation serves all of them.
+#
+# Keys embed a per-well data version (and a fleet-wide one), so invalidation
+# never has to find keys: bumping the version makes old entries unreachable.
+# Writers bump the shared version and publish the well on CHANNEL; every
+# worker drops its local entries for that well when the message arrives.
+# Local entries also expire after LOCAL_TTL_SECONDS, which bounds staleness
+# if a worker misses a message (e.g. while its subscriber reconnects).
+#
+# Stampedes: concurrent misses on one key compute once per process
+# (single-flight), and once across workers through a short SET NX lock; the
+# other workers poll the shared tier for the result instead of recomputing.
+CACHE_URL = os.getenv("CACHE_URL", "")  # e.g. redis://localhost:6379/0; empty = local tier only
+LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "512"))
+LOCAL_TTL_SECONDS = 30
+SHARED_TTL_SECONDS = 600
+LOCK_TTL_MS = 15000
+LOCK_WAIT_SECONDS = 10.0
+LOCK_POLL_SECONDS = 0.05
+
+KEY_PREFIX = "drilling:cache:"
+CHANNEL = "drilling:cache:invalidate"
+FLEET = "*"  # version scope that invalidates every well (e.g. a fleet rescore)
+
+# Deletes the lock only if we still own it (it may have expired and been re-taken)
+_RELEASE_LOCK = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+_MISS = object()
+
+
+class LocalLRU:
+    def __init__(self, max_entries: int = LOCAL_MAX_ENTRIES, ttl: float = LOCAL_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return _MISS
+            if item[0] < time.monotonic():
+                del self._items[key]
+                return _MISS
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def drop_scope(self, scope: str) -> None:
+        """
+        Removes every entry of one well (all of them for FLEET).
+        """
+        prefix = f"{KEY_PREFIX}{scope}:"
+        with self._lock:
+            if scope == FLEET:
+                self._items.clear()
+                return
+            for key in [k for k in self._items if k.startswith(prefix)]:
+                del self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _SingleFlight:
+    """
+    One lock per key in use: the first caller computes, the rest wait for it.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, list] = {}
+
+    @contextmanager
+    def __call__(self, key: str):
+        with self._lock:
+            entry = self._keys.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._keys[key]
+
+
+class TieredCache:
+    def __init__(self, shared=None, max_entries: int = LOCAL_MAX_ENTRIES, local_ttl: float = LOCAL_TTL_SECONDS):
+        """
+        shared: a redis-py compatible client (redis.Redis, or a local stand-in
+        such as fakeredis.FakeRedis), or None for a process-local cache.
+        """
+        self.local = LocalLRU(max_entries, local_ttl)
+        self.shared = shared
+        self.local_ttl = local_ttl
+        self._flight = _SingleFlight()
+        # scope -> (fetched_at, version); local-only deployments keep the version here
+        self._versions: Dict[str, Tuple[float, int]] = {}
+        self._versions_lock = threading.Lock()
+        self._subscriber = None
+        if shared is not None:
+            self._subscribe()
+
+    # ----------------------------
+    # Versions + invalidation
+    # ----------------------------
+    def _subscribe(self) -> None:
+        pubsub = self.shared.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CHANNEL: self._on_invalidate})
+        self._subscriber = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._on_subscriber_error
+        )
+
+    def _on_invalidate(self, message: Dict[str, Any]) -> None:
+        scope = message["data"]
+        self._forget(scope.decode() if isinstance(scope, bytes) else str(scope))
+
+    def _on_subscriber_error(self, exc, pubsub, thread) -> None:
+        # Messages may have been missed: start over from the shared tier
+        logger.warning(f"Cache invalidation subscriber error: {exc}")
+        with self._versions_lock:
+            self._versions.clear()
+        self.local.drop_scope(FLEET)
+        time.sleep(1.0)
+
+    def _forget(self, scope: str) -> None:
+        with self._versions_lock:
+            if scope == FLEET:
+                self._versions.clear()
+            else:
+                self._versions.pop(scope, None)
+        self.local.drop_scope(scope)
+
+    def _version(self, scope: str) -> int:
+        now = time.monotonic()
+        with self._versions_lock:
+            cached = self._versions.get(scope)
+        if self.shared is None:
+            return cached[1] if cached else 0
+        if cached and now - cached[0] < self.local_ttl:
+            return cached[1]
+        try:
+            version = int(self.shared.get(f"{KEY_PREFIX}version:{scope}") or 0)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable ({e}); using the local tier only")
+            return cached[1] if cached else 0
+        with self._versions_lock:
+            self._versions[scope] = (now, version)
+        return version
+
+    def invalidate_well(self, well_id: str = FLEET) -> None:
+        """
+        Called after a write that changes a well's data (FLEET: every well).
+        """
+        if self.shared is None:
+            with self._versions_lock:
+                version = self._versions.get(well_id, (0.0, 0))[1] + 1
+                if well_id == FLEET:
+                    self._versions = {FLEET: (0.0, version)}
+                else:
+                    self._versions[well_id] = (0.0, version)
+            self.local.drop_scope(well_id)
+            return
+
+        try:
+            pipe = self.shared.pipeline()
+            pipe.incr(f"{KEY_PREFIX}version:{well_id}")
+            pipe.publish(CHANNEL, well_id)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Shared cache invalidation failed for {well_id}: {e}")
+        # This worker does not wait for its own message
+        self._forget(well_id)
+
+    def invalidate_all(self) -> None:
+        self.invalidate_well(FLEET)
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def key(self, well_id: str, name: str, params: Sequence[Any] = ()) -> str:
+        suffix = ":".join("" if p is None else str(p) for p in params)
+        return f"{KEY_PREFIX}{well_id}:v{self._version(well_id)}.{self._version(FLEET)}:{name}:{suffix}"
+
+    def _shared_get(self, key: str) -> Any:
+        try:
+            raw = self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            return _MISS
+        return _MISS if raw is None else json.loads(raw)
+
+    def _wait_for_shared(self, key: str) -> Any:
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            value = self._shared_get(key)
+            if value is not _MISS:
+                return value
+        return _MISS
+
+    def _release_lock(self, lock_key: str, token: str) -> None:
+        try:
+            self.shared.eval(_RELEASE_LOCK, 1, lock_key, token)
+        except Exception:
+            # Servers/stand-ins without scripting: non-atomic compare-and-delete
+            try:
+                if self.shared.get(lock_key) in (token, token.encode()):
+                    self.shared.delete(lock_key)
+            except Exception:
+                pass  # expires after LOCK_TTL_MS
+
+    def get_or_compute(
+        self,
+        well_id: str,
+        name: str,
+        compute: Callable[[], Any],
+        params: Sequence[Any] = (),
+        ttl: int = SHARED_TTL_SECONDS,
+    ) -> Any:
+        """
+        Cached result of compute() for (well, name, params). compute() must
+        return JSON-serializable data; exceptions are not cached.
+        """
+        key = self.key(well_id, name, params)
+        value = self.local.get(key)
+        if value is not _MISS:
+            CACHE_REQUESTS.inc("local", "hit")
+            return value
+
+        with self._flight(key):
+            value = self.local.get(key)
+            if value is not _MISS:
+                CACHE_REQUESTS.inc("local", "hit")
+                return value
+
+            if self.shared is None:
+                CACHE_REQUESTS.inc("local", "miss")
+                value = compute()
+                self.local.set(key, value)
+                return value
+
+            value = self._shared_get(key)
+            if value is not _MISS:
+                CACHE_REQUESTS.inc("shared", "hit")
+                self.local.set(key, value)
+                return value
+
+            token = uuid.uuid4().hex
+            lock_key = f"{key}:lock"
+            try:
+                locked = bool(self.shared.set(lock_key, token, nx=True, px=LOCK_TTL_MS))
+            except Exception:
+                locked = True  # shared tier down: compute locally
+            if not locked:
+                value = self._wait_for_shared(key)
+                if value is not _MISS:
+                    CACHE_REQUESTS.inc("shared", "hit_after_wait")
+                    self.local.set(key, value)
+                    return value
+
+            CACHE_REQUESTS.inc("shared", "miss")
+            try:
+                body = dumps_json(compute())
+                try:
+                    self.shared.set(key, body, ex=ttl)
+                except Exception as e:
+                    logger.warning(f"Shared cache write failed: {e}")
+            finally:
+                if locked:
+                    self._release_lock(lock_key, token)
+
+            # Every worker serves the JSON form, whichever tier it came from
+            value = json.loads(body)
+            self.local.set(key, value)
+            return value
+
+    def close(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.stop()
+            self._subscriber = None
+
+
+# ---------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+_init_lock = threading.Lock()
+
+
+def configure_cache(shared=None, url: str = CACHE_URL, **kwargs) -> TieredCache:
+    """
+    (Re)builds the process cache. shared overrides url, e.g. a local stand-in.
+    """
+    global _cache
+    if shared is None and url:
+        # Optional, and only imported when a shared tier is configured (slow import)
+        try:
+            import redis
+        except ImportError:
+            logger.warning("CACHE_URL is set but redis-py is not installed; using the local tier only")
+        else:
+            shared = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = TieredCache(shared, **kwargs)
+    return _cache
+
+
+def get_cache() -> TieredCache:
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                configure_cache()
+    return _cache
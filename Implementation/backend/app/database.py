@@ -1,13 +1,23 @@
+import os
+from pathlib import Path
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# SQLite database file (created automatically)
-DATABASE_URL = "sqlite:///./drilling.db"
+# Where the app keeps its own files by default (drilling.db, blob_store/,
+# archive/): the backend directory, whatever the working directory is.
+STORAGE_DIR = Path(os.getenv("STORAGE_DIR", Path(__file__).resolve().parents[1]))
+
+# SQLite database file (created automatically).
+# Override with DATABASE_URL (e.g. a throwaway file for load tests).
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{STORAGE_DIR / 'drilling.db'}")
+
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL, connect_args=connect_args
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
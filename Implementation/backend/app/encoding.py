@@ -0,0 +1,205 @@
+import gzip
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import brotli
+import msgpack
+from fastapi import Request
+from fastapi.responses import Response
+
+# ---------------------------------------------------------
+# Optional accelerator (plain json when missing)
+# ---------------------------------------------------------
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ---------------------------------------------------------
+# Content negotiation for row-heavy responses (/segments, /operations)
+# ---------------------------------------------------------
+# Accept:
+#   application/json                      rows as objects (default, unchanged shape)
+#   application/vnd.drilling.columns+json struct-of-arrays JSON
+#   application/x-msgpack                 struct-of-arrays MessagePack
+#   application/vnd.apache.arrow.stream   Arrow IPC stream of the rows
+# Accept-Encoding: br or gzip, for bodies above MIN_COMPRESS_BYTES.
+JSON = "application/json"
+COLUMNS_JSON = "application/vnd.drilling.columns+json"
+MSGPACK = "application/x-msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+# String columns with few distinct values are dictionary-encoded in columnar output
+MAX_DICTIONARY_VALUES = 256
+
+
+def available_media_types() -> List[str]:
+    return [JSON, COLUMNS_JSON, MSGPACK, ARROW]
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(payload, default=_json_default, separators=(",", ":")).encode()
+
+
+def _accept_list(header: Optional[str]) -> List[Tuple[str, float]]:
+    """
+    Parses an Accept / Accept-Encoding header into (value, q) pairs, best first.
+    """
+    items = []
+    for part in (header or "").split(","):
+        fields = part.strip().split(";")
+        value = fields[0].strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, v = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        items.append((value, q))
+    return sorted(items, key=lambda item: -item[1])
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Picks the response format. JSON when nothing acceptable is offered (e.g. a
+    browser's text/html,application/xhtml+xml): every endpoint answered JSON
+    before the other formats existed, and those clients must keep working.
+    """
+    offered = available_media_types()
+    accepted = _accept_list(accept)
+    if not accepted:
+        return JSON
+    for value, q in accepted:
+        if q <= 0:
+            continue
+        if value in ("*/*", "application/*"):
+            return JSON
+        if value in ("application/msgpack", "application/vnd.msgpack"):
+            value = MSGPACK
+        if value in offered:
+            return value
+    return JSON
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    for value, q in _accept_list(accept_encoding):
+        if q <= 0:
+            continue
+        if value == "br":
+            return "br"
+        if value == "gzip":
+            return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def to_columns(rows: Sequence[Dict[str, Any]], names: Sequence[str]) -> Dict[str, Any]:
+    """
+    Struct-of-arrays layout. Low-cardinality string columns become
+    {"dictionary": [...], "codes": [...]} (null -> code -1).
+    """
+    columns: Dict[str, Any] = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        if any(isinstance(v, str) for v in values):
+            dictionary: Dict[str, int] = {}
+            codes = []
+            for v in values:
+                if v is None:
+                    codes.append(-1)
+                    continue
+                code = dictionary.get(v)
+                if code is None:
+                    code = dictionary[v] = len(dictionary)
+                    if len(dictionary) > MAX_DICTIONARY_VALUES:
+                        break
+                codes.append(code)
+            if len(dictionary) <= MAX_DICTIONARY_VALUES:
+                columns[name] = {"dictionary": list(dictionary), "codes": codes}
+                continue
+        columns[name] = values
+    return columns
+
+
+def _arrow_body(rows: Sequence[Dict[str, Any]], names: Sequence[str], meta: Dict[str, Any]) -> bytes:
+    import pyarrow as pa  # NumPy: loaded on first Arrow response, not at startup
+
+    data = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        array = pa.array(values)
+        if pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        data[name] = array
+    table = pa.table(data)
+    table = table.replace_schema_metadata({k: str(v) for k, v in meta.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_rows(
+    media_type: str,
+    rows: Sequence[Dict[str, Any]],
+    names: Sequence[str],
+    meta: Optional[Dict[str, Any]] = None,
+    rows_key: Optional[str] = None,
+) -> bytes:
+    """
+    Serializes rows in the negotiated format. For JSON the original response
+    shape is kept: {**meta, rows_key: rows}, or the bare list when rows_key is None.
+    """
+    meta = meta or {}
+    if media_type == JSON:
+        return dumps_json({**meta, rows_key: rows} if rows_key else rows)
+    if media_type == ARROW:
+        return _arrow_body(rows, names, meta)
+
+    columnar = {**meta, "count": len(rows), "columns": to_columns(rows, names)}
+    if media_type == MSGPACK:
+        return msgpack.packb(columnar, default=_json_default, use_bin_type=True)
+    return dumps_json(columnar)
+
+
+def encoded_response(
+    request: Request,
+    rows: Sequence[Dict[str, Any]],
+    names: Sequence[str],
+    meta: Optional[Dict[str, Any]] = None,
+    rows_key: Optional[str] = None,
+) -> Response:
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body = encode_rows(media_type, rows, names, meta, rows_key)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type=media_type, headers=headers)
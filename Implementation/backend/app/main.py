@@ -1,10 +1,34 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import Base, engine
-from .routers import upload, wells, operations  # or segments if separate
+from .database import engine
+from .metrics import install_sql_hooks
+from .migrations import run_migrations
+from .middleware import InstrumentationMiddleware, instrument_endpoints
+from .routers import upload, wells, operations, risk, metrics, reports, search, timeline, progress  # or segments if separate
+
+# Schema setup is a release step, run once before the workers start:
+#     python -m app.migrations
+# RUN_MIGRATIONS_ON_STARTUP=1 also applies pending migrations in the lifespan
+# (single-process development); concurrent runners serialize on the write lock.
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations(engine)
+    yield
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+
+# Request timing / SQL counting / opt-in profiling (see middleware.py)
+app.add_middleware(InstrumentationMiddleware)
+install_sql_hooks(engine)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,9 +41,15 @@ app.add_middleware(
 app.include_router(upload.router)
 app.include_router(wells.router)
 app.include_router(operations.router)
-
-Base.metadata.create_all(bind=engine)
+app.include_router(risk.router)
+app.include_router(metrics.router)
+app.include_router(reports.router)
+app.include_router(search.router)
+app.include_router(timeline.router)
+app.include_router(progress.router)
 
 @app.get("/")
 def root():
     return {"message": "Backend is running"}
+
+instrument_endpoints(app)
@@ -0,0 +1,212 @@
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import os
+import pstats
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from .metrics import REQUEST_SECONDS, REQUEST_QUERIES, RequestStats, current_request
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Settings (env)
+# ---------------------------------------------------------
+# PROFILING_ENABLED=1   allow per-request profiling (off by default)
+# PROFILING_TOKEN=...   if set, X-Profile-Token must match
+# SLOW_REQUEST_SECONDS  log a warning for requests slower than this
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "2.0"))
+
+# Profiler for the current request (None when the request is not profiled)
+current_profiler: ContextVar[Optional[Any]] = ContextVar("current_profiler", default=None)
+
+
+def _header(scope: dict, name: bytes) -> Optional[str]:
+    for k, v in scope.get("headers", []):
+        if k == name:
+            return v.decode("latin-1")
+    return None
+
+
+def _wants_profile(scope: dict) -> bool:
+    if not PROFILING_ENABLED:
+        return False
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    asked = _header(scope, b"x-profile") == "1" or "1" in query.get("profile", ())
+    if not asked:
+        return False
+    return PROFILING_TOKEN is None or _header(scope, b"x-profile-token") == PROFILING_TOKEN
+
+
+class _Profiler:
+    """
+    pyinstrument if installed, otherwise cProfile. Started inside the thread
+    that runs the endpoint (sync endpoints run in the threadpool).
+    """
+
+    def __init__(self) -> None:
+        try:
+            from pyinstrument import Profiler
+            self.kind = "pyinstrument"
+            self._impl = Profiler(async_mode="disabled")
+        except ImportError:
+            self.kind = "cprofile"
+            self._impl = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.kind == "pyinstrument":
+            self._impl.start()
+        else:
+            self._impl.enable()
+
+    def stop(self) -> None:
+        if self.kind == "pyinstrument":
+            self._impl.stop()
+        else:
+            self._impl.disable()
+
+    def report(self) -> tuple:
+        if self.kind == "pyinstrument":
+            return "text/html; charset=utf-8", self._impl.output_html().encode()
+        out = io.StringIO()
+        pstats.Stats(self._impl, stream=out).sort_stats("cumulative").print_stats(60)
+        return "text/plain; charset=utf-8", out.getvalue().encode()
+
+
+def _profiled(call):
+    """
+    Wraps an endpoint so it runs under the request's profiler when one is set.
+    """
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            profiler = current_profiler.get()
+            if profiler is None:
+                return await call(*args, **kwargs)
+            profiler.start()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profiler.stop()
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        profiler = current_profiler.get()
+        if profiler is None:
+            return call(*args, **kwargs)
+        profiler.start()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profiler.stop()
+    return wrapper
+
+
+def instrument_endpoints(app: FastAPI) -> None:
+    """
+    Enables per-request profiling on every API route. Call after include_router().
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "__profiled__", False):
+            route.dependant.call = _profiled(route.dependant.call)
+            route.dependant.call.__profiled__ = True
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware: per-route latency histogram, SQL query count/time per
+    request (filled by the SQLAlchemy hooks in metrics.py) and opt-in profiling.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if _wants_profile(scope):
+            await self._profile(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = {"code": 500, "streaming": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                status["streaming"] = any(
+                    k == b"content-type" and v.startswith(b"text/event-stream") for k, v in message.get("headers", [])
+                )
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+
+            # Long-lived SSE streams would swamp the latency histogram
+            if not status["streaming"]:
+                method = scope.get("method", "")
+                REQUEST_SECONDS.observe(elapsed, method, stats.route, str(status["code"]))
+                REQUEST_QUERIES.observe(stats.queries, method, stats.route)
+
+                if elapsed >= SLOW_REQUEST_SECONDS:
+                    logger.warning(
+                        f"Slow request: {method} {scope.get('path')} took {elapsed:.3f}s "
+                        f"({stats.queries} queries, {stats.query_seconds:.3f}s in SQL)"
+                    )
+
+    async def _profile(self, scope, receive, send):
+        """
+        Runs the request under a profiler and answers with the profile report
+        instead of the endpoint's response.
+        """
+        profiler = _Profiler()
+        stats = RequestStats(scope)
+        req_token = current_request.set(stats)
+        prof_token = current_profiler.set(profiler)
+        status = {"code": 500}
+
+        async def discard(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            current_profiler.reset(prof_token)
+            current_request.reset(req_token)
+        elapsed = time.perf_counter() - start
+
+        content_type, body = profiler.report()
+        logger.info(f"Profiled {scope.get('method')} {scope.get('path')}: {elapsed:.3f}s, {stats.queries} queries")
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(status["code"]).encode()),
+                (b"x-profiled-seconds", f"{elapsed:.4f}".encode()),
+                (b"x-profiled-queries", str(stats.queries).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
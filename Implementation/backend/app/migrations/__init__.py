@@ -0,0 +1,132 @@
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from . import (
+    m0001_baseline,
+    m0002_hot_query_indexes,
+    m0003_report_originals,
+    m0004_backfill_staging,
+    m0005_fulltext_search,
+    m0006_operation_times,
+    m0007_offset_well_index,
+    m0008_archive_tiering,
+    m0009_monotonic_row_ids,
+    m0010_backfill_item_source_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# Versioned schema migrations
+# ---------------------------------------------------------
+# Each module defines VERSION, DESCRIPTION and upgrade(conn). They are applied
+# in order, each in its own transaction, and recorded in schema_migrations.
+# Migrations after the baseline must be idempotent: a fresh database gets the
+# current models from the baseline's create_all().
+#
+# Run them once per deploy, before starting the workers:
+#     python -m app.migrations
+# Runners may still overlap (several workers with RUN_MIGRATIONS_ON_STARTUP=1):
+# each migration takes the database write lock (BEGIN IMMEDIATE on SQLite) and
+# re-reads schema_migrations inside it, so a version is applied exactly once
+# and the others wait for it, then skip it.
+LOCK_WAIT_SECONDS = 600
+
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_hot_query_indexes,
+    m0003_report_originals,
+    m0004_backfill_staging,
+    m0005_fulltext_search,
+    m0006_operation_times,
+    m0007_offset_well_index,
+    m0008_archive_tiering,
+    m0009_monotonic_row_ids,
+    m0010_backfill_item_source_hash,
+]
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " description VARCHAR NOT NULL,"
+        " applied_at DATETIME NOT NULL)"
+    ))
+
+
+def current_version(engine: Engine) -> int:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+
+
+def _lock(conn: Connection) -> None:
+    """
+    Takes the write lock for the current transaction. pysqlite only opens a
+    transaction before DML, so DDL-only migrations would otherwise run unlocked
+    (and in autocommit).
+    """
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _is_applied(conn: Connection, version: int) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM schema_migrations WHERE version = :v"), {"v": version}
+    ).first() is not None
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Applies pending migrations. Returns the versions applied (by this call).
+    """
+    applied = []
+    start = current_version(engine)
+    pending = [m for m in MIGRATIONS if m.VERSION > start]
+    if not pending:
+        return applied
+
+    with engine.connect() as conn:
+        sqlite = conn.dialect.name == "sqlite"
+        if sqlite:
+            # Another runner may hold the lock for a long migration (e.g. a table rebuild)
+            busy_ms = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+            conn.exec_driver_sql(f"PRAGMA busy_timeout = {LOCK_WAIT_SECONDS * 1000}")
+            conn.commit()
+        try:
+            for m in pending:
+                with conn.begin():
+                    _lock(conn)
+                    _ensure_version_table(conn)
+                    if _is_applied(conn, m.VERSION):
+                        continue
+                    logger.info(f"Applying migration {m.VERSION:04d}: {m.DESCRIPTION}")
+                    m.upgrade(conn)
+                    conn.execute(
+                        text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                        {"v": m.VERSION, "d": m.DESCRIPTION, "t": datetime.utcnow()},
+                    )
+                applied.append(m.VERSION)
+        finally:
+            if sqlite:
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {busy_ms}")
+                conn.commit()
+
+    return applied
+
+
+# ---------------------------------------------------------
+# Helpers for migration modules
+# ---------------------------------------------------------
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def add_column_if_missing(conn: Connection, table: str, column: str, ddl: str) -> None:
+    if not has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,9 @@
+import logging
+
+from ..database import engine
+from . import run_migrations, current_version
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+applied = run_migrations(engine)
+print(f"Applied: {applied or 'nothing'} | schema version {current_version(engine)}")
@@ -0,0 +1,12 @@
+from sqlalchemy.engine import Connection
+
+from ..database import Base
+from .. import models  # noqa: F401  (registers every table on Base.metadata)
+
+VERSION = 1
+DESCRIPTION = "baseline schema (tables from the models)"
+
+
+def upgrade(conn: Connection) -> None:
+    # Creates missing tables only; databases created before migrations keep their tables
+    Base.metadata.create_all(bind=conn)
@@ -0,0 +1,43 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "composite/covering indexes for hot queries, unique (well_id, report_date)"
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_operations_well_depth ON operations (well_id, depth_from, depth_to)",
+    "CREATE INDEX IF NOT EXISTS ix_operations_well_report ON operations (well_id, report_id)",
+    "CREATE INDEX IF NOT EXISTS ix_operations_segment_cover ON operations"
+    " (well_id, operation_id, report_id, depth_from, depth_to, operation_type, npt_hours, duration_hours, description)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_daily_reports_well_date ON daily_reports (well_id, report_date)",
+]
+
+
+def _check_duplicate_reports(conn: Connection) -> None:
+    """
+    The unique index needs one report per (well_id, report_date). Duplicates
+    are not removed here: which upload is right (and the operations, events
+    and risk stats built from it) is an operator's call, so the migration
+    fails and lists them instead.
+    """
+    dupes = conn.execute(text(
+        "SELECT well_id, report_date, GROUP_CONCAT(report_id, ', ') FROM daily_reports"
+        " GROUP BY well_id, report_date HAVING COUNT(*) > 1"
+        " ORDER BY well_id, report_date"
+    )).all()
+    if not dupes:
+        return
+
+    listing = "\n".join(f"  {well_id} {report_date}: report_id {ids}" for well_id, report_date, ids in dupes)
+    raise RuntimeError(
+        f"Migration {VERSION:04d} needs one daily report per well and day; found {len(dupes)} duplicates:\n"
+        f"{listing}\n"
+        "Delete the unwanted uploads (with their operations and events), then rescore and rerun the migrations."
+    )
+
+
+def upgrade(conn: Connection) -> None:
+    _check_duplicate_reports(conn)
+    for ddl in INDEXES:
+        conn.execute(text(ddl))
+    conn.execute(text("ANALYZE"))
@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "daily_reports.original_blob / original_size (stored original PDFs)"
+
+
+def upgrade(conn: Connection) -> None:
+    from . import add_column_if_missing  # package __init__ imports this module
+
+    add_column_if_missing(conn, "daily_reports", "original_blob", "VARCHAR")
+    add_column_if_missing(conn, "daily_reports", "original_size", "INTEGER")
@@ -0,0 +1,14 @@
+from sqlalchemy.engine import Connection
+
+from ..models import BackfillJob, BackfillItem
+
+VERSION = 4
+DESCRIPTION = "daily_reports.parser_version, backfill job/staging tables"
+
+
+def upgrade(conn: Connection) -> None:
+    from . import add_column_if_missing  # package __init__ imports this module
+
+    add_column_if_missing(conn, "daily_reports", "parser_version", "INTEGER")
+    BackfillJob.__table__.create(conn, checkfirst=True)
+    BackfillItem.__table__.create(conn, checkfirst=True)
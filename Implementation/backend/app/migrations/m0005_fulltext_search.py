@@ -0,0 +1,68 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+DESCRIPTION = "FTS5 indexes over operation descriptions and event text (kept in sync by triggers)"
+
+# External-content FTS5 tables: the text lives once in operations/events, the
+# index is maintained by triggers on every write path (ingest, backfill swap,
+# bulk seeding), so search can never drift from the rows it points at.
+# well_id is indexed too so a well filter narrows the match inside FTS5.
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS operations_fts USING fts5("
+    " description, operation_type, well_id,"
+    " content='operations', content_rowid='operation_id',"
+    f" tokenize='{TOKENIZER}', prefix='2 3')",
+
+    "CREATE TRIGGER IF NOT EXISTS operations_fts_ai AFTER INSERT ON operations BEGIN"
+    " INSERT INTO operations_fts(rowid, description, operation_type, well_id)"
+    " VALUES (new.operation_id, new.description, new.operation_type, new.well_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS operations_fts_ad AFTER DELETE ON operations BEGIN"
+    " INSERT INTO operations_fts(operations_fts, rowid, description, operation_type, well_id)"
+    " VALUES ('delete', old.operation_id, old.description, old.operation_type, old.well_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS operations_fts_au AFTER UPDATE OF description, operation_type, well_id ON operations BEGIN"
+    " INSERT INTO operations_fts(operations_fts, rowid, description, operation_type, well_id)"
+    " VALUES ('delete', old.operation_id, old.description, old.operation_type, old.well_id);"
+    " INSERT INTO operations_fts(rowid, description, operation_type, well_id)"
+    " VALUES (new.operation_id, new.description, new.operation_type, new.well_id); END",
+
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    " event_description, event_type, equipment, actions_taken, well_id,"
+    " content='events', content_rowid='event_id',"
+    f" tokenize='{TOKENIZER}', prefix='2 3')",
+
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN"
+    " INSERT INTO events_fts(rowid, event_description, event_type, equipment, actions_taken, well_id)"
+    " VALUES (new.event_id, new.event_description, new.event_type, new.equipment, new.actions_taken, new.well_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN"
+    " INSERT INTO events_fts(events_fts, rowid, event_description, event_type, equipment, actions_taken, well_id)"
+    " VALUES ('delete', old.event_id, old.event_description, old.event_type, old.equipment, old.actions_taken, old.well_id); END",
+
+    "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF event_description, event_type, equipment, actions_taken, well_id"
+    " ON events BEGIN"
+    " INSERT INTO events_fts(events_fts, rowid, event_description, event_type, equipment, actions_taken, well_id)"
+    " VALUES ('delete', old.event_id, old.event_description, old.event_type, old.equipment, old.actions_taken, old.well_id);"
+    " INSERT INTO events_fts(rowid, event_description, event_type, equipment, actions_taken, well_id)"
+    " VALUES (new.event_id, new.event_description, new.event_type, new.equipment, new.actions_taken, new.well_id); END",
+
+    # Default ranking: description hits count most, well_id (filter only) not at all
+    "INSERT INTO operations_fts(operations_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 0.0)')",
+    "INSERT INTO events_fts(events_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0, 3.0, 0.0)')",
+
+    # Index rows that existed before the triggers
+    "INSERT INTO operations_fts(operations_fts) VALUES ('rebuild')",
+    "INSERT INTO events_fts(events_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        # Other backends need their own full-text setup (e.g. a Postgres tsvector column)
+        return
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
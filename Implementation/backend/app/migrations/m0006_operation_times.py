@@ -0,0 +1,15 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+DESCRIPTION = "index operations by (well_id, start_time) for time-window queries"
+
+# Rows ingested before this point have NULL start/end times (the columns were
+# never filled). PARSER_VERSION 2 marks them outdated, so the backfill job
+# (python -m app.services.backfill) re-parses them with real timestamps.
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_operations_well_start ON operations (well_id, start_time, end_time)"
+    ))
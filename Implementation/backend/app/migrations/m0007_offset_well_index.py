@@ -0,0 +1,14 @@
+from sqlalchemy.engine import Connection
+
+from ..models import DepthBucket
+
+VERSION = 7
+DESCRIPTION = "depth_buckets: per-location depth index of problem intervals (offset-well lookups)"
+
+
+def upgrade(conn: Connection) -> None:
+    # Existing rows are indexed here; ingest and backfill swaps keep it current
+    from ..services.offset_wells import rebuild_depth_index
+
+    DepthBucket.__table__.create(conn, checkfirst=True)
+    rebuild_depth_index(conn)
@@ -0,0 +1,18 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ..models import ArchivePartition, ReportRollup
+
+VERSION = 8
+DESCRIPTION = "archive_partitions, report_rollups, daily_reports.archive_partition_id (hot/cold tiering)"
+
+
+def upgrade(conn: Connection) -> None:
+    from . import add_column_if_missing  # package __init__ imports this module
+
+    ArchivePartition.__table__.create(conn, checkfirst=True)
+    ReportRollup.__table__.create(conn, checkfirst=True)
+    add_column_if_missing(conn, "daily_reports", "archive_partition_id", "INTEGER REFERENCES archive_partitions (partition_id)")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_daily_reports_archive_partition_id ON daily_reports (archive_partition_id)"
+    ))
@@ -0,0 +1,63 @@
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+
+from ..models import Event, Operation
+
+VERSION = 9
+DESCRIPTION = "operations/events ids never reused (AUTOINCREMENT): archived rows keep unique ids"
+
+# Without AUTOINCREMENT SQLite hands out max(id) + 1, so once a report's rows
+# moved to an archive partition their ids could be given to new hot rows
+# (e.g. after a backfill swap deleted the newest ones). SQLite cannot add
+# AUTOINCREMENT to an existing table: each table is rebuilt with the same
+# rows and ids, its indexes and FTS triggers are recreated, and its
+# sqlite_sequence starts above every id in the table and in the archive.
+TABLES = ((Operation.__table__, "operation_id"), (Event.__table__, "event_id"))
+
+
+def _has_autoincrement(conn: Connection, table: str) -> bool:
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :t"), {"t": table}).scalar()
+    return "AUTOINCREMENT" in (sql or "").upper()
+
+
+def _rebuild(conn: Connection, table) -> None:
+    name = table.name
+    dependents = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = :t AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        " ORDER BY type"
+    ), {"t": name}).scalars().all()
+
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.execute(text(re.sub(rf"CREATE TABLE {name}\b", f"CREATE TABLE {name}_rebuild", ddl, count=1)))
+    columns = ", ".join(c.name for c in table.columns)
+    conn.execute(text(f"INSERT INTO {name}_rebuild ({columns}) SELECT {columns} FROM {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.execute(text(f"ALTER TABLE {name}_rebuild RENAME TO {name}"))
+    # Indexes and FTS triggers went with the old table
+    for sql in dependents:
+        conn.execute(text(sql))
+
+
+def _raise_sequence(conn: Connection, table: str, high_water: int) -> None:
+    current = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = :t"), {"t": table}).scalar()
+    if current is None:
+        conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:t, :s)"), {"t": table, "s": high_water})
+    elif current < high_water:
+        conn.execute(text("UPDATE sqlite_sequence SET seq = :s WHERE name = :t"), {"t": table, "s": high_water})
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        # Sequences/identity columns elsewhere never reuse ids
+        return
+    from ..services.archive_service import archived_max_ids  # reads partition files; not needed at import
+
+    archived = archived_max_ids(conn)
+    for table, id_col in TABLES:
+        if not _has_autoincrement(conn, table.name):
+            _rebuild(conn, table)
+        hot = conn.execute(text(f"SELECT COALESCE(MAX({id_col}), 0) FROM {table.name}")).scalar()
+        _raise_sequence(conn, table.name, max(hot, archived[table.name]))
@@ -0,0 +1,15 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 10
+DESCRIPTION = "backfill_items.file_hash (report version a staged parse came from)"
+
+
+def upgrade(conn: Connection) -> None:
+    from . import add_column_if_missing  # package __init__ imports this module
+
+    add_column_if_missing(conn, "backfill_items", "file_hash", "VARCHAR")
+    # Staged before the hash was recorded: cannot tell if the report was replaced since, parse again
+    conn.execute(text(
+        "UPDATE backfill_items SET status = 'pending', payload = NULL WHERE status = 'staged' AND file_hash IS NULL"
+    ))
@@ -2,3 +2,11 @@ from .well import Well
 from .daily_report import DailyReport
 from .operation import Operation
 from .event import Event
+from .risk_daily_stat import RiskDailyStat
+from .risk_score import RiskScore
+from .risk_score_version import RiskScoreVersion
+from .backfill_job import BackfillJob
+from .backfill_item import BackfillItem
+from .depth_bucket import DepthBucket
+from .archive_partition import ArchivePartition
+from .report_rollup import ReportRollup
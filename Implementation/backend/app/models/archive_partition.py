@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+from ..database import Base
+
+class ArchivePartition(Base):
+    """
+    One compressed SQLite file holding the full-detail operations/events of a
+    well's archived reports for one month (services/archive_service.py).
+    DailyReport.archive_partition_id says which reports it currently serves.
+    """
+    __tablename__ = "archive_partitions"
+
+    partition_id = Column(Integer, primary_key=True)
+
+    well_id = Column(String, ForeignKey("wells.well_id"), nullable=False)
+    period = Column(String, nullable=False)          # report month, "YYYY-MM"
+
+    # Path under ARCHIVE_DIR, e.g. "WELL-01-3f2a9c1b/2025-09-<checksum>.sqlite.zst"; a rewrite gets a new key
+    key = Column(String, nullable=False)
+    checksum = Column(String, nullable=False)        # sha256 of the uncompressed file
+
+    report_count = Column(Integer, nullable=False, default=0)
+    operation_count = Column(Integer, nullable=False, default=0)
+    event_count = Column(Integer, nullable=False, default=0)
+    size = Column(Integer, nullable=True)            # uncompressed bytes
+    stored_size = Column(Integer, nullable=True)     # bytes on disk
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_archive_partitions_well_period", "well_id", "period", unique=True),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from datetime import datetime
+from ..database import Base
+
+class BackfillItem(Base):
+    """
+    Staging row: one report of a backfill job and its re-parsed output.
+    """
+    __tablename__ = "backfill_items"
+
+    job_id = Column(Integer, ForeignKey("backfill_jobs.job_id"), primary_key=True)
+    report_id = Column(Integer, ForeignKey("daily_reports.report_id"), primary_key=True)
+
+    # pending -> staged (payload parsed) -> swapped (live rows replaced); or failed,
+    # or skipped (the report was replaced between staging and the swap)
+    status = Column(String, nullable=False, default="pending")
+
+    payload = Column(Text, nullable=True)   # JSON {"operations": [...], "events": [...], "notes": ...}
+    file_hash = Column(String, nullable=True)  # the report's file_hash when it was staged
+    error = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_backfill_items_job_status", "job_id", "status"),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from ..database import Base
+
+class BackfillJob(Base):
+    __tablename__ = "backfill_jobs"
+
+    job_id = Column(Integer, primary_key=True)
+
+    parser_type = Column(String, nullable=False)
+    parser_version = Column(Integer, nullable=False)   # version being backfilled to
+
+    # running -> done (a crashed job stays "running" and is resumed by the next run)
+    status = Column(String, nullable=False, default="running")
+
+    report_count = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
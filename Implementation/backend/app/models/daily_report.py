@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Index
 from datetime import datetime
 from ..database import Base
 
@@ -14,9 +14,21 @@ class DailyReport(Base):
 
     source_filename = Column(String, nullable=True)
     parser_type = Column(String, nullable=True)     # e.g. "NNPC_FORMAT_A"
+    parser_version = Column(Integer, nullable=True)  # version that produced the current operations/events
     file_hash = Column(String, nullable=True, index=True)
 
+    # Original PDF in the content-addressed blob store (services/blob_store.py)
+    original_blob = Column(String, nullable=True)   # e.g. "ab/cd/<file_hash>.pdf.zst"
+    original_size = Column(Integer, nullable=True)  # uncompressed bytes
+
+    # Set while the report's operations/events live in an archive partition (services/archive_service.py)
+    archive_partition_id = Column(Integer, ForeignKey("archive_partitions.partition_id"), nullable=True, index=True)
+
     uploaded_at = Column(DateTime, default=datetime.utcnow)
 
     notes = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # One report per well per day; also covers (well_id, report_date) -> report_id joins
+        Index("ux_daily_reports_well_date", "well_id", "report_date", unique=True),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from ..database import Base
+
+class DepthBucket(Base):
+    """
+    Inverted index for offset-well lookups: one row per problem interval
+    (critical/warning operation, NPT, flagged event) per depth bucket it covers.
+    Maintained by services/offset_wells.py on every operations/events write.
+    """
+    __tablename__ = "depth_buckets"
+
+    # Primary key order is the lookup order: WHERE location = ? AND bucket BETWEEN ? AND ?
+    location = Column(String, primary_key=True)
+    bucket = Column(Integer, primary_key=True)      # floor(depth / BUCKET_FT)
+    well_id = Column(String, ForeignKey("wells.well_id"), primary_key=True)
+    source = Column(String, primary_key=True)       # operation / event
+    source_id = Column(Integer, primary_key=True)   # operation_id / event_id
+
+    report_id = Column(Integer, ForeignKey("daily_reports.report_id"), nullable=False)
+
+    # Interval (depth_from <= depth_to) and what ranking needs, so a lookup never touches operations/events
+    depth_from = Column(Float, nullable=False)
+    depth_to = Column(Float, nullable=False)
+    level = Column(String, nullable=False)          # critical / warning
+    kind = Column(String, nullable=True)            # operation_type / event_type
+    npt_hours = Column(Float, nullable=True)
+
+    __table_args__ = (
+        # Per-report replace (ingest, backfill swap)
+        Index("ix_depth_buckets_report", "report_id"),
+        {"sqlite_with_rowid": False},
+    )
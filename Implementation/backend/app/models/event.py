@@ -29,3 +29,8 @@ class Event(Base):
     equipment = Column(Text, nullable=True)   # store as comma-separated or JSON later
     actions_taken = Column(Text, nullable=True)
     recorded_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Ids are never reused (not max(id) + 1): archived rows keep theirs (services/archive_service.py)
+        {"sqlite_autoincrement": True},
+    )
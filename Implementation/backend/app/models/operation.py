@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from ..database import Base
 
 class Operation(Base):
@@ -23,3 +23,20 @@ class Operation(Base):
 
     duration_hours = Column(Float, nullable=True)
     npt_hours = Column(Float, nullable=True)
+
+    __table_args__ = (
+        # Dashboard: WHERE well_id = ? ORDER BY depth_from
+        Index("ix_operations_well_depth", "well_id", "depth_from", "depth_to"),
+        # Report-scoped lookups (per-report replace/delete, date-window joins)
+        Index("ix_operations_well_report", "well_id", "report_id"),
+        # Timeline: WHERE well_id IN (...) AND start_time BETWEEN ? AND ? (end_time checked from the index)
+        Index("ix_operations_well_start", "well_id", "start_time", "end_time"),
+        # Segments: WHERE well_id = ? ORDER BY operation_id, served from the index alone
+        Index(
+            "ix_operations_segment_cover",
+            "well_id", "operation_id", "report_id", "depth_from", "depth_to",
+            "operation_type", "npt_hours", "duration_hours", "description",
+        ),
+        # Ids are never reused (not max(id) + 1): archived rows keep theirs (services/archive_service.py)
+        {"sqlite_autoincrement": True},
+    )
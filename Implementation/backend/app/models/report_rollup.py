@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
+from ..database import Base
+
+class ReportRollup(Base):
+    """
+    Dashboard summary of an archived report: totals per (day, source, depth bin,
+    operation/event type). Written when the report's rows move to an archive
+    partition, removed when they are restored (services/archive_service.py).
+    """
+    __tablename__ = "report_rollups"
+
+    # Primary key order is the dashboard read: WHERE well_id = ? AND source = 'operation'
+    well_id = Column(String, ForeignKey("wells.well_id"), primary_key=True)
+    source = Column(String, primary_key=True)        # operation / event
+    report_date = Column(Date, primary_key=True)
+    depth_bin = Column(Integer, primary_key=True)    # floor(depth_from / ROLLUP_BIN_FT), -1 without a depth
+    kind = Column(String, primary_key=True)          # operation_type / event_type ("" when missing)
+
+    report_id = Column(Integer, ForeignKey("daily_reports.report_id"), nullable=False)
+
+    row_count = Column(Integer, nullable=False)
+    hours = Column(Float, nullable=False)            # duration_hours / event_duration_hours
+    npt_hours = Column(Float, nullable=False)
+    npt_count = Column(Integer, nullable=False)      # rows with any NPT
+    critical_count = Column(Integer, nullable=False) # NPT at the critical threshold / critical events
+    depth_from = Column(Float, nullable=True)        # shallowest depth in the group
+    depth_to = Column(Float, nullable=True)          # deepest depth in the group
+
+    __table_args__ = (
+        # Restore drops a report's rollups
+        Index("ix_report_rollups_report", "report_id"),
+        {"sqlite_with_rowid": False},
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index
+from ..database import Base
+
+class RiskDailyStat(Base):
+    __tablename__ = "risk_daily_stats"
+
+    # One row per score version + well + equipment + report day (feature store for rolling windows)
+    score_version = Column(Integer, primary_key=True)
+    well_id = Column(String, ForeignKey("wells.well_id"), primary_key=True)
+    equipment = Column(String, primary_key=True)             # e.g. "MUD PUMP", or "ALL" for the whole well
+    report_date = Column(Date, primary_key=True)
+
+    operation_count = Column(Integer, nullable=False, default=0)
+    operation_hours = Column(Float, nullable=False, default=0.0)
+    npt_hours = Column(Float, nullable=False, default=0.0)
+    incident_count = Column(Integer, nullable=False, default=0)  # operations classified "critical"
+
+    __table_args__ = (
+        Index("ix_risk_daily_stats_well_date", "score_version", "well_id", "report_date"),
+    )
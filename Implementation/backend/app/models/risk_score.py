@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey
+from datetime import datetime
+from ..database import Base
+
+class RiskScore(Base):
+    __tablename__ = "risk_scores"
+
+    # Precomputed score per well + equipment ("ALL" row = whole well), read in O(1).
+    # Readers only use the active score_version (see RiskScoreVersion).
+    score_version = Column(Integer, primary_key=True)
+    well_id = Column(String, ForeignKey("wells.well_id"), primary_key=True)
+    equipment = Column(String, primary_key=True)
+
+    as_of_date = Column(Date, nullable=True)          # latest report date seen for the well
+    window_days = Column(Integer, nullable=False)
+
+    # Rolling-window features
+    npt_window_hours = Column(Float, nullable=False, default=0.0)
+    npt_trend = Column(Float, nullable=False, default=0.0)            # hours/day, recent half minus older half
+    repeat_failures = Column(Integer, nullable=False, default=0)      # days with incidents inside the window
+    last_incident_date = Column(Date, nullable=True)
+    days_since_incident = Column(Integer, nullable=True)
+
+    score = Column(Float, nullable=False, default=0.0)                # 0 - 100
+    risk_level = Column(String, nullable=False, default="Low")        # Low / Medium / High
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
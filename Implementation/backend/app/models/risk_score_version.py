@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from ..database import Base
+
+class RiskScoreVersion(Base):
+    __tablename__ = "risk_score_versions"
+
+    score_version = Column(Integer, primary_key=True)
+
+    # building -> active -> retired (exactly one active version at a time)
+    status = Column(String, nullable=False, default="building")
+
+    rules = Column(Text, nullable=True)             # JSON snapshot of thresholds used
+    operation_count = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    activated_at = Column(DateTime, nullable=True)
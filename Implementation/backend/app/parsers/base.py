@@ -0,0 +1,59 @@
+from typing import Any, Dict, Optional
+
+# ----------------------------
+# Parsed rows
+# ----------------------------
+# Parsers return operations as ParsedOperation records: fixed slots, no
+# per-row dict, and the joined source row (raw_line) only when debugging.
+# Consumers read rows with .get(), the same call they use on the JSON dicts
+# a backfill job stages, so both forms go through the same code.
+OPERATION_FIELDS = (
+    "depth_from", "depth_to", "operation_type", "description",
+    "duration_hours", "npt_hours", "start_time_str", "end_time_str",
+)
+
+
+class ParsedOperation:
+    __slots__ = OPERATION_FIELDS + ("raw_line",)
+
+    def __init__(
+        self,
+        depth_from: Optional[float],
+        depth_to: Optional[float],
+        operation_type: Optional[str],
+        description: Optional[str],
+        duration_hours: Optional[float],
+        npt_hours: Optional[float] = None,
+        start_time_str: Optional[str] = None,
+        end_time_str: Optional[str] = None,
+        raw_line: Optional[str] = None,
+    ):
+        self.depth_from = depth_from
+        self.depth_to = depth_to
+        self.operation_type = operation_type
+        self.description = description
+        self.duration_hours = duration_hours
+        self.npt_hours = npt_hours
+        self.start_time_str = start_time_str
+        self.end_time_str = end_time_str
+        self.raw_line = raw_line
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON form (backfill staging, golden files); raw_line only when present.
+        """
+        out = {f: getattr(self, f) for f in OPERATION_FIELDS}
+        if self.raw_line is not None:
+            out["raw_line"] = self.raw_line
+        return out
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParsedOperation):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ParsedOperation({self.start_time_str}-{self.end_time_str}, {self.depth_from}-{self.depth_to} ft, {self.operation_type})"
@@ -1,13 +1,187 @@
+import os
 import re
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from io import BytesIO
 import pdfplumber
 
+from ..metrics import observe_pdf_page
+from .base import ParsedOperation
 
-def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
+PARSER_NAME = "NNPC_FORMAT_A"
+# Bump when the stored output changes; reports parsed by an older version are re-parsed by the backfill job
+# 2: operations get absolute start/end times from the From/To columns
+PARSER_VERSION = 2
+
+# Page-1 text preview and per-row raw_line are only for debugging a new layout (NNPC_DEBUG_PREVIEW=1)
+DEBUG_PREVIEW = os.getenv("NNPC_DEBUG_PREVIEW", "0") == "1"
+
+# ----------------------------
+# Layout templates
+# ----------------------------
+# Operation rows only live in the "Operation Summary" section: from its
+# top-level heading to the next top-level heading (often on the next page).
+# A layout is fingerprinted from the document itself: the section heading's
+# font size and the words and x positions of the table's column-header row,
+# plus producer/creator/page size. The first report of a layout is parsed on
+# whole pages and teaches us the table's horizontal extent; later reports with
+# the same fingerprint only run table extraction inside the cropped section
+# and stop reading pages once it has ended. A crop that would cut the header
+# row, or a report without the anchor or header, falls back to whole pages.
+#
+# Finding the section still loads each page it reads (pdfplumber parses the
+# whole content stream before any char is available; that is most of the
+# per-page cost, the "load" timing). Cropping saves table detection on the
+# skipped area and the pages after the section, not the load of the pages read.
+SECTION_ANCHOR = "OPERATIONSUMMARY"
+HEADER_PREFIX = "FROMTODUR"     # column-header row: From | To | Dur. | Phase | ...
+TABLE_SETTINGS = {"vertical_strategy": "lines", "horizontal_strategy": "lines"}
+CROP_MARGIN = 2.0
+
+# (document key, layout fingerprint) -> {"heading_size", "x0", "x1", "table_settings"}
+_TEMPLATES: Dict[tuple, dict] = {}
+
+
+def _layout_key(pdf) -> tuple:
+    # Page size comes from the page dictionary, so this does not parse any content
+    first = pdf.pages[0]
+    meta = pdf.metadata or {}
+    return (meta.get("Producer"), meta.get("Creator"), round(first.width), round(first.height))
+
+
+def _text_lines(chars) -> List[Tuple[float, str]]:
+    """(top, TEXT WITHOUT SPACES) per printed line, top to bottom."""
+    lines: Dict[int, list] = {}
+    for ch in chars:
+        lines.setdefault(round(ch["top"]), []).append(ch)
+    return [
+        (min(c["top"] for c in line), "".join(c["text"] for c in sorted(line, key=lambda c: c["x0"])).replace(" ", "").upper())
+        for _, line in sorted(lines.items())
+    ]
+
+
+def _heading_lines(page, heading_size: float) -> List[Tuple[float, str]]:
+    return _text_lines(ch for ch in page.chars if abs(ch["size"] - heading_size) < 0.05)
+
+
+def _section_start(page) -> Optional[dict]:
+    """
+    The section's anchor on this page (largest-font line reading "Operation
+    Summary") with the layout fingerprint taken from the column-header row
+    below it, or None when the page has no anchor. "fingerprint" is None when
+    no header row follows the anchor on the page.
+    """
+    lines = _text_lines(page.chars)
+    anchors = [
+        (top, max(ch["size"] for ch in page.chars if round(ch["top"]) == round(top)))
+        for top, text in lines
+        if SECTION_ANCHOR in text
+    ]
+    if not anchors:
+        return None
+    heading_size = max(size for _, size in anchors)
+    top = min(t for t, size in anchors if size == heading_size)
+
+    section = {"top": top, "heading_size": heading_size, "fingerprint": None, "header": None}
+    header_top = next((t for t, text in lines if t > top and text.startswith(HEADER_PREFIX)), None)
+    if header_top is not None:
+        band = page.crop((0, header_top - 0.5, float(page.width), min(float(page.height), header_top + 1)))
+        words = band.extract_words()
+        if words:
+            section["fingerprint"] = (round(heading_size, 2), tuple((w["text"].upper(), round(w["x0"])) for w in words))
+            section["header"] = (min(w["x0"] for w in words), max(w["x1"] for w in words))
+    return section
+
+
+def _crop_fits(template: dict, header: Tuple[float, float]) -> bool:
+    """The template's crop keeps the whole column-header row."""
+    return template["x0"] - CROP_MARGIN <= header[0] and header[1] <= template["x1"] + CROP_MARGIN
+
+
+def _learn_template(op_tables: List[tuple], section: dict) -> Optional[dict]:
+    """
+    Template from the tables of the first page holding operation rows; None
+    when their extent would not keep the header row (nothing is cached).
+    """
+    template = {
+        "heading_size": section["heading_size"],
+        "x0": min(bbox[0] for bbox in op_tables),
+        "x1": max(bbox[2] for bbox in op_tables),
+        "table_settings": TABLE_SETTINGS,
+    }
+    return template if _crop_fits(template, section["header"]) else None
+
+
+def _page_regions(pages, layout: tuple, state: dict, timings: Dict[str, float]):
+    """
+    (page, crop bbox or None for the whole page) in reading order. Pages are
+    read until the anchor is found; then the template cached for the layout's
+    fingerprint decides between the cropped section and whole pages.
+    state gets "key" and "section" (for learning a template) and "template".
+    """
+    def load(page) -> None:
+        t = time.perf_counter()
+        page.chars  # parses the page's content stream (cached on the page)
+        timings["load"] += time.perf_counter() - t
+
+    remaining = iter(pages)
+    before = []
+    for page in remaining:
+        load(page)
+        t = time.perf_counter()
+        section = _section_start(page)
+        timings["locate"] += time.perf_counter() - t
+        if section is not None:
+            break
+        before.append(page)
+    else:
+        # No anchor anywhere: whole pages
+        for page in before:
+            yield page, None
+        return
+
+    template = None
+    if section["fingerprint"] is not None:
+        state["key"], state["section"] = (layout, section["fingerprint"]), section
+        template = _TEMPLATES.get(state["key"])
+        if template is not None and not _crop_fits(template, section["header"]):
+            template = None
+    state["template"] = template
+
+    if template is None:
+        for p in before:
+            yield p, None
+        yield page, None
+        for p in remaining:
+            load(p)
+            yield p, None
+        return
+
+    # Cropped: from the anchor to the next heading of the same size
+    x0 = max(0.0, template["x0"] - CROP_MARGIN)
+    top = section["top"]
+    while page is not None:
+        t = time.perf_counter()
+        bottom, ended = float(page.height), False
+        for line_top, _ in _heading_lines(page, template["heading_size"]):
+            if line_top > top:
+                bottom, ended = line_top, True
+                break
+        timings["locate"] += time.perf_counter() - t
+        x1 = min(float(page.width), template["x1"] + CROP_MARGIN)
+        yield page, (x0, max(0.0, top - CROP_MARGIN), x1, bottom)
+        if ended:
+            return
+        page, top = next(remaining, None), 0.0
+        if page is not None:
+            load(page)
+
+
+def parse_nnpc_format_a(pdf_bytes: bytes, debug: bool = DEBUG_PREVIEW) -> Dict[str, Any]:
     """
     NNPC Format A parser (Table-based).
-    Extracts the "Operation Summary" table using pdfplumber.extract_tables().
+    Extracts the "Operation Summary" table using pdfplumber table extraction,
+    cropped to that section once the layout's template is known.
 
     Key improvement:
     - Depth (MD_from, MD_to) is read from the correct table columns instead of
@@ -15,10 +189,16 @@ def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
       other numbers (pressures, tool sizes, serial numbers, etc.).
     """
 
-    operations: List[dict] = []
+    operations: List[ParsedOperation] = []
     matched_rows_preview: List[list] = []
     debug_preview = ""
 
+    # Per-stage timings (seconds), reported with the result for benchmarking
+    timings = {"open": 0.0, "preview": 0.0, "load": 0.0, "locate": 0.0, "extract_tables": 0.0, "row_filter": 0.0}
+    page_count = 0
+    # Share of the document's page area that went through table extraction
+    extracted_area = page_area = 0.0
+
     def guess_op_type(phase: str, op_text: str) -> str:
         t = (phase + " " + op_text).upper()
         if "DRL" in t:
@@ -45,13 +225,34 @@ def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
             return None
 
     try:
+        t0 = time.perf_counter()
         with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            debug_preview = (pdf.pages[0].extract_text() or "")[:1500]
+            pages = pdf.pages
+            page_count = len(pages)
+            t1 = time.perf_counter()
+            timings["open"] += t1 - t0
+
+            if debug:
+                debug_preview = (pages[0].extract_text() or "")[:1500]
+                timings["preview"] += time.perf_counter() - t1
+
+            state: Dict[str, Any] = {}
+            learn_from = None
 
-            for page in pdf.pages:
-                tables = page.extract_tables() or []
+            mark = time.perf_counter()
+            for page, bbox in _page_regions(pages, _layout_key(pdf), state, timings):
+                page_start = time.perf_counter()
+                template = state.get("template")
+                table_settings = template["table_settings"] if template else TABLE_SETTINGS
+                region = page.crop(bbox) if bbox else page
+                extracted_area += region.width * region.height
+                found = region.find_tables(table_settings)
+                tables = [t.extract() for t in found]
+                tables_done = time.perf_counter()
+                timings["extract_tables"] += tables_done - page_start
 
-                for tbl in tables:
+                for tbl, table in zip(tables, found):
+                    rows_before = len(operations)
                     for row in tbl:
                         if not row:
                             continue
@@ -123,17 +324,35 @@ def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
                         if md_from is None or md_to is None:
                             continue
 
-                        operations.append({
-                            "depth_from": md_from,
-                            "depth_to": md_to,
-                            "operation_type": guess_op_type(phase, op_text),
-                            "description": op_text[:500],
-                            "duration_hours": dur_hours,
-                            "npt_hours": None,
-                            "start_time_str": cells[0],
-                            "end_time_str": cells[1],
-                            "raw_line": " | ".join(cells),
-                        })
+                        operations.append(ParsedOperation(
+                            depth_from=md_from,
+                            depth_to=md_to,
+                            operation_type=guess_op_type(phase, op_text),
+                            description=op_text[:500],
+                            duration_hours=dur_hours,
+                            npt_hours=None,
+                            start_time_str=cells[0],
+                            end_time_str=cells[1],
+                            # The joined source row is only kept for debugging a layout
+                            raw_line=" | ".join(cells) if debug else None,
+                        ))
+
+                    if template is None and learn_from is None and len(operations) > rows_before:
+                        learn_from = (page, [table.bbox])
+                    elif learn_from is not None and learn_from[0] is page and len(operations) > rows_before:
+                        learn_from[1].append(table.bbox)
+
+                page_done = time.perf_counter()
+                timings["row_filter"] += page_done - tables_done
+                observe_pdf_page(PARSER_NAME, page_done - mark)
+                mark = page_done
+
+            if learn_from is not None and state.get("key") is not None:
+                learned = _learn_template(learn_from[1], state["section"])
+                if learned is not None:
+                    _TEMPLATES[state["key"]] = learned
+
+            page_area = sum(page.width * page.height for page in pages)
 
     except Exception as e:
         return {
@@ -142,6 +361,9 @@ def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
             "notes": f"NNPC_FORMAT_A: table extraction failed ({e})",
             "debug_preview": debug_preview,
             "matched_rows_preview": [],
+            "page_count": page_count,
+            "extracted_area": None,
+            "timings": timings,
         }
 
     return {
@@ -150,4 +372,7 @@ def parse_nnpc_format_a(pdf_bytes: bytes) -> Dict[str, Any]:
         "notes": f"NNPC_FORMAT_A: Operation rows parsed: {len(operations)} (table-based, depth-fixed)",
         "debug_preview": debug_preview,
         "matched_rows_preview": matched_rows_preview,
+        "page_count": page_count,
+        "extracted_area": round(extracted_area / page_area, 3) if page_area else None,
+        "timings": timings,
     }
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from datetime import date
 import logging
 
+from ..cache import get_cache
 from ..database import SessionLocal
+from ..encoding import encoded_response
 from ..models.operation import Operation
+from ..models.event import Event
+from ..services.archive_service import archived_rows
+from ..services.risk_services import classify_operation
 
 # DailyReport is optional (only used for date filtering & recordedAt)
 try:
@@ -18,6 +23,18 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+# Row keys, also the column order for columnar encodings (see encoding.py)
+OPERATION_FIELDS = (
+    "operation_id", "report_id", "well_id", "depth_from", "depth_to",
+    "operation_type", "description", "duration_hours", "npt_hours",
+)
+EVENT_FIELDS = (
+    "event_id", "report_id", "operation_id", "well_id", "recorded_at", "depth_from", "depth_to",
+    "event_type", "event_description", "event_duration_hours", "npt_hours", "severity",
+)
+SEGMENT_FIELDS = ("from", "to", "level", "eventType", "operationType", "whyItMatters", "nptHours", "recordedAt")
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -28,26 +45,18 @@ def get_db():
 
 def _level_from_op(op: Operation) -> str:
     """
-    Simple rules (prototype analytics):
-    - critical if description contains strong keywords or npt_hours exists and is high
-    - warning if long duration
-    - else normal
+    Segment level for an operation (rules live in risk_services.classify_operation).
     """
-    desc = (getattr(op, "description", "") or "").upper()
-    dur = getattr(op, "duration_hours", None)
-    npt = getattr(op, "npt_hours", None)
-
-    if npt is not None and npt >= 2:
-        return "critical"
-    if "NPT" in desc or "NO SUCCESS" in desc or "STUCK" in desc:
-        return "critical"
-    if dur is not None and dur >= 4:
-        return "warning"
-    return "normal"
+    return classify_operation(
+        getattr(op, "description", None),
+        getattr(op, "duration_hours", None),
+        getattr(op, "npt_hours", None),
+    )
 
 
 @router.get("/{well_id}/operations")
 def get_operations_for_well(
+    request: Request,
     well_id: str,
     start: date | None = Query(default=None, description="YYYY-MM-DD"),
     end: date | None = Query(default=None, description="YYYY-MM-DD"),
@@ -56,13 +65,15 @@ def get_operations_for_well(
     """
     Returns operations for a well.
     If DailyReport exists, you can filter by report_date using start/end.
+    Honors Accept / Accept-Encoding (columnar and compressed encodings, see encoding.py).
     """
     # Base query
     q = db.query(Operation).filter(Operation.well_id == well_id)
 
     # Optional date filter (only works if DailyReport model exists)
     if (start or end) and DailyReport is not None:
-        q = q.join(DailyReport, DailyReport.report_id == Operation.report_id)
+        # Filtering daily_reports on well_id too lets ux_daily_reports_well_date drive the join
+        q = q.join(DailyReport, DailyReport.report_id == Operation.report_id).filter(DailyReport.well_id == well_id)
         if start:
             q = q.filter(DailyReport.report_date >= start)
         if end:
@@ -70,6 +81,13 @@ def get_operations_for_well(
 
     ops = q.order_by(Operation.operation_id.asc()).all()
 
+    # Archived reports in the window: read from their partitions (services/archive_service.py)
+    archived = archived_rows(
+        db, Operation, [getattr(Operation, name) for name in OPERATION_FIELDS], well_ids=[well_id], start=start, end=end
+    )
+    if archived:
+        ops = sorted(ops + archived, key=lambda op: op.operation_id)
+
     # Return as simple JSON dicts (no schema needed)
     results = []
     for op in ops:
@@ -85,11 +103,42 @@ def get_operations_for_well(
             "npt_hours": getattr(op, "npt_hours", None),
         })
 
-    return results
+    return encoded_response(request, results, OPERATION_FIELDS)
+
+
+@router.get("/{well_id}/operations/{operation_id}/events")
+def get_events_for_operation(
+    request: Request,
+    well_id: str,
+    operation_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Events linked to one operation (see services/event_linking.py): a single
+    lookup on the events.operation_id index.
+    """
+    # Filtering on operation_id alone keeps the planner on that index; the
+    # well check happens on the (few) rows it returns
+    rows = (
+        db.query(*[getattr(Event, name) for name in EVENT_FIELDS])
+        .filter(Event.operation_id == operation_id)
+        .order_by(Event.recorded_at.asc(), Event.event_id.asc())
+        .all()
+    )
+    if not rows:
+        # The operation may belong to an archived report
+        rows = sorted(
+            archived_rows(db, Event, [getattr(Event, name) for name in EVENT_FIELDS], well_ids=[well_id],
+                          where=[Event.operation_id == operation_id]),
+            key=lambda e: (str(e.recorded_at or ""), e.event_id),  # NULLs first, like the hot query
+        )
+    events = [dict(zip(EVENT_FIELDS, row)) for row in rows]
+    return encoded_response(request, [e for e in events if e["well_id"] == well_id], EVENT_FIELDS)
 
 
 @router.get("/{well_id}/segments")
 def get_segments_for_well(
+    request: Request,
     well_id: str,
     start: date | None = Query(default=None, description="YYYY-MM-DD"),
     end: date | None = Query(default=None, description="YYYY-MM-DD"),
@@ -97,14 +146,38 @@ def get_segments_for_well(
 ):
     """
     Converts operations into frontend-friendly segments for the Wellbore view.
+    Cached per well data version and window (see cache.py).
+    Honors Accept / Accept-Encoding (columnar and compressed encodings, see encoding.py).
     """
+    result = get_cache().get_or_compute(
+        well_id, "segments", lambda: _build_segments(db, well_id, start, end), params=(start, end)
+    )
+    return encoded_response(
+        request, result["segments"], SEGMENT_FIELDS,
+        meta={"well_id": well_id, "depthMax": result["depthMax"]}, rows_key="segments",
+    )
+
+
+def _build_segments(db: Session, well_id: str, start: date | None, end: date | None) -> dict:
     # If DailyReport exists, we’ll join it to add recordedAt and allow date filtering.
     if DailyReport is not None:
+        # Project only the segment columns so ix_operations_segment_cover can serve the scan
         q = (
-            db.query(Operation, DailyReport)
+            db.query(
+                Operation.operation_id,
+                Operation.depth_from,
+                Operation.depth_to,
+                Operation.operation_type,
+                Operation.description,
+                Operation.npt_hours,
+                Operation.duration_hours,
+                DailyReport.report_date,
+            )
             .join(DailyReport, DailyReport.report_id == Operation.report_id)
             .filter(Operation.well_id == well_id)
         )
+        if start or end:
+            q = q.filter(DailyReport.well_id == well_id)
         if start:
             q = q.filter(DailyReport.report_date >= start)
         if end:
@@ -112,10 +185,20 @@ def get_segments_for_well(
 
         rows = q.order_by(Operation.operation_id.asc()).all()
 
+        # Archived reports in the window: read from their partitions (services/archive_service.py)
+        archived = archived_rows(
+            db, Operation,
+            [Operation.operation_id, Operation.depth_from, Operation.depth_to, Operation.operation_type,
+             Operation.description, Operation.npt_hours, Operation.duration_hours, DailyReport.report_date],
+            well_ids=[well_id], start=start, end=end,
+        )
+        if archived:
+            rows = sorted(rows + archived, key=lambda op: op.operation_id)
+
         segments = []
         depth_max = 0.0
 
-        for (op, rep) in rows:
+        for op in rows:
             d_from = getattr(op, "depth_from", None)
             d_to = getattr(op, "depth_to", None)
 
@@ -135,14 +218,10 @@ def get_segments_for_well(
                 "operationType": getattr(op, "operation_type", "Other"),
                 "whyItMatters": getattr(op, "description", None),
                 "nptHours": getattr(op, "npt_hours", None),
-                "recordedAt": str(getattr(rep, "report_date", "")) if getattr(rep, "report_date", None) else None,
+                "recordedAt": str(op.report_date) if op.report_date else None,
             })
 
-        return {
-            "well_id": well_id,
-            "depthMax": depth_max,
-            "segments": segments,
-        }
+        return {"segments": segments, "depthMax": depth_max}
 
     # Fallback if DailyReport model is not available
     ops = (
@@ -176,8 +255,4 @@ def get_segments_for_well(
             "recordedAt": None,
         })
 
-    return {
-        "well_id": well_id,
-        "depthMax": depth_max,
-        "segments": segments,
-    }
+    return {"segments": segments, "depthMax": depth_max}
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+
+router = APIRouter(prefix="/progress", tags=["Progress"])
+
+# Mirrors services/progress_service.py, which is not imported at startup (NumPy)
+DEFAULT_POINTS = 500
+MAX_POINTS = 5000
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/")
+def get_progress(
+    well_id: list[str] = Query(..., description="repeat for several wells: ?well_id=A&well_id=B"),
+    points: int = Query(default=DEFAULT_POINTS, ge=10, le=MAX_POINTS, description="max points per series"),
+    db: Session = Depends(get_db),
+):
+    """
+    Depth vs elapsed time, binned ROP and flat-time spans per well, for
+    comparing drilling progress across wells. Cached per well data version.
+    """
+    from ..services.progress_service import fleet_progress  # NumPy: loaded on first request, not at startup
+
+    try:
+        return fleet_progress(db, well_id, points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
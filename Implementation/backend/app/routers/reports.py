@@ -0,0 +1,147 @@
+import logging
+import re
+import threading
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.daily_report import DailyReport
+from ..models.backfill_job import BackfillJob
+from ..services.blob_store import blob_path, iter_range
+from ..services.backfill import create_or_resume_job, run_backfill, job_progress
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+logger = logging.getLogger(__name__)
+
+# One backfill at a time per process
+_backfill_lock = threading.Lock()
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Single "bytes=a-b" / "bytes=a-" / "bytes=-n" range -> inclusive (start, end).
+    None means serve the whole file; multi-range requests are served whole too.
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def content_disposition(filename: str) -> str:
+    """
+    inline; with an ASCII filename= fallback (quotes, backslashes and control
+    or non-ASCII characters replaced) and the exact name as RFC 5987 filename*=.
+    """
+    fallback = re.sub(r'[^\x20-\x7e]|["\\]', "_", filename)
+    return f"inline; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+@router.get("/{report_id}/original")
+def download_original_report(
+    report_id: int,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    db: Session = Depends(get_db),
+):
+    """
+    Streams the originally uploaded PDF from the blob store (supports Range requests).
+    """
+    report = db.query(DailyReport).filter(DailyReport.report_id == report_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+    if not report.original_blob or not blob_path(report.original_blob).exists():
+        raise HTTPException(status_code=404, detail=f"Original PDF for report {report_id} is not stored")
+
+    size = report.original_size
+    byte_range = parse_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": content_disposition(report.source_filename or f"report_{report_id}.pdf"),
+        "ETag": f'"{report.file_hash}"',
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        iter_range(report.original_blob, start, end),
+        status_code=206 if byte_range else 200,
+        media_type="application/pdf",
+        headers=headers,
+    )
+
+
+def _run_backfill_in_background(job_id: int, workers: int) -> None:
+    db = SessionLocal()
+    try:
+        run_backfill(db, db.get(BackfillJob, job_id), workers=workers)
+    except Exception:
+        logger.exception(f"Backfill job {job_id} failed")
+    finally:
+        db.close()
+        _backfill_lock.release()
+
+
+@router.post("/backfill")
+def start_backfill(
+    background_tasks: BackgroundTasks,
+    parser_type: str = "NNPC_FORMAT_A",
+    workers: int = 2,
+    force: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Starts (or resumes) re-parsing of reports produced by an older parser version.
+    Poll GET /reports/backfill/{job_id} for progress.
+    """
+    if not _backfill_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A backfill is already running")
+    try:
+        job = create_or_resume_job(db, parser_type, force=force)
+    except ValueError as e:
+        _backfill_lock.release()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        _backfill_lock.release()
+        raise
+
+    background_tasks.add_task(_run_backfill_in_background, job.job_id, workers)
+    return {"status": "started", **job_progress(db, job.job_id)}
+
+
+@router.get("/backfill/{job_id}")
+def get_backfill_progress(job_id: int, db: Session = Depends(get_db)):
+    progress = job_progress(db, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Backfill job {job_id} not found")
+    return progress
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.risk_score import RiskScore
+from ..services.risk_services import WELL_SCOPE, get_active_version, get_well_risk, risk_score_to_dict
+
+router = APIRouter(prefix="/risk", tags=["Risk"])
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/wells")
+def list_well_risk(db: Session = Depends(get_db)):
+    """
+    Precomputed well-level risk for every well (highest score first).
+    """
+    version = get_active_version(db, create=False)
+    if version is None:
+        return []
+
+    scores = (
+        db.query(RiskScore)
+        .filter(RiskScore.score_version == version, RiskScore.equipment == WELL_SCOPE)
+        .order_by(RiskScore.score.desc())
+        .all()
+    )
+    return [risk_score_to_dict(s) for s in scores]
+
+
+@router.get("/wells/{well_id}")
+def get_well_risk_detail(well_id: str, include_equipment: bool = True, db: Session = Depends(get_db)):
+    """
+    Reads the precomputed score for one well (primary-key lookup),
+    optionally with the per-equipment breakdown.
+    """
+    version = get_active_version(db, create=False)
+    well_score = get_well_risk(db, well_id, version) if version is not None else None
+    if well_score is None:
+        raise HTTPException(status_code=404, detail=f"No risk score for well '{well_id}' yet")
+
+    result = risk_score_to_dict(well_score)
+
+    if include_equipment:
+        equipment = (
+            db.query(RiskScore)
+            .filter(RiskScore.score_version == version, RiskScore.well_id == well_id,
+                    RiskScore.equipment != WELL_SCOPE)
+            .order_by(RiskScore.score.desc())
+            .all()
+        )
+        result["byEquipment"] = [risk_score_to_dict(s) for s in equipment]
+
+    return result
+
+
+@router.post("/rescore")
+def rescore_all_wells(db: Session = Depends(get_db)):
+    """
+    Rebuilds every well's risk features and scores under a new score version
+    (vectorized batch job), then switches readers to it in one transaction.
+    """
+    from ..services.risk_batch import rescore_fleet  # NumPy: loaded on first rescore, not at startup
+    return rescore_fleet(db)
@@ -0,0 +1,47 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..services.search_service import is_query_error, search_fleet
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/")
+def search(
+    q: str = Query(..., description='e.g. STUCK, "NO SUCCESS", MUD PUMP, STUCK*'),
+    kind: str = Query(default="all", pattern="^(all|operations|events)$"),
+    well_id: str | None = None,
+    start: date | None = Query(default=None, description="YYYY-MM-DD"),
+    end: date | None = Query(default=None, description="YYYY-MM-DD"),
+    depth_min: float | None = None,
+    depth_max: float | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over operation descriptions and event text across the fleet,
+    ranked by relevance, with <mark>-highlighted snippets (report text HTML-escaped).
+    Archived reports are not searched: "partial" / "archivedReports" say when the
+    scope includes some.
+    """
+    try:
+        return search_fleet(db, q, kind, well_id, start, end, depth_min, depth_max, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OperationalError as e:
+        # Only FTS syntax errors are the caller's; "database is locked" and the like are not
+        if not is_query_error(e):
+            raise
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {e.orig}")
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..encoding import encoded_response
+from ..services.timeline_service import TIMELINE_FIELDS, MAX_TIMELINE_ROWS, fleet_timeline
+
+router = APIRouter(prefix="/timeline", tags=["Timeline"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/")
+def get_timeline(
+    request: Request,
+    well_id: list[str] = Query(..., description="repeat for several wells: ?well_id=A&well_id=B"),
+    start: datetime = Query(..., description="YYYY-MM-DDTHH:MM"),
+    end: datetime = Query(..., description="YYYY-MM-DDTHH:MM"),
+    limit: int = Query(default=10000, ge=1, le=MAX_TIMELINE_ROWS),
+    db: Session = Depends(get_db),
+):
+    """
+    Operations overlapping a time window, across one or many wells, in time order.
+    Honors Accept / Accept-Encoding (columnar and compressed encodings, see encoding.py).
+    """
+    try:
+        result = fleet_timeline(db, well_id, start, end, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = result.pop("operations")
+    return encoded_response(request, rows, TIMELINE_FIELDS, meta=result, rows_key="operations")
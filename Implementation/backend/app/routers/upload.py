@@ -26,6 +26,7 @@ async def upload_daily_report(
     well_id: str,
     report_date: str,  # YYYY-MM-DD
     parser_type: str = "TBD",
+    replace: bool = False,  # corrected report for an existing day: apply only the changes
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
@@ -51,7 +52,8 @@ async def upload_daily_report(
             report_date_obj=report_date_obj,
             filename=file.filename,
             pdf_bytes=pdf_bytes,
-            parser_type=parser_type
+            parser_type=parser_type,
+            replace=replace,
         )
         return {"status": "success", **result}
 
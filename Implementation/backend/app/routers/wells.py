@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from ..cache import get_cache
 from ..database import SessionLocal
 from ..models.well import Well
 from ..models.operation import Operation
+from ..models.report_rollup import ReportRollup
+from ..services.kpi_services import dashboard_segment, cached_well_kpis, rollup_segment
+from ..services.live_updates import event_stream
+from ..services.offset_wells import MAX_OFFSET_INTERVALS, offset_intervals
 
 router = APIRouter(prefix="/wells", tags=["Wells"])
 
@@ -51,6 +60,13 @@ def create_well(
 
 @router.get("/{well_id}/dashboard")
 def get_well_dashboard(well_id: str, db: Session = Depends(get_db)):
+    """
+    Well header, KPIs and depth segments; cached per well data version (see cache.py).
+    """
+    return get_cache().get_or_compute(well_id, "dashboard", lambda: _build_dashboard(db, well_id))
+
+
+def _build_dashboard(db: Session, well_id: str) -> dict:
     well = db.query(Well).filter(Well.well_id == well_id).first()
     if not well:
         raise HTTPException(status_code=404, detail=f"Well '{well_id}' not found")
@@ -62,31 +78,22 @@ def get_well_dashboard(well_id: str, db: Session = Depends(get_db)):
         .all()
     )
 
-    # Build "segments" from operations (simple MVP)
-    segments = []
-    for o in ops:
-        level = "normal"
-        if o.npt_hours and o.npt_hours >= 2:
-            level = "critical"
-        elif o.npt_hours and o.npt_hours > 0:
-            level = "warning"
-
-        segments.append(
-            {
-                "from": o.depth_from,
-                "to": o.depth_to,
-                "level": level,
-                "eventType": o.operation_type,
-                "operationType": o.operation_type,
-                "whyItMatters": o.description,
-                "nptHours": o.npt_hours,
-                "recordedAt": None,
-            }
-        )
-
-    # KPIs (simple MVP)
-    total_npt = sum([o.npt_hours or 0 for o in ops])
-    depth_max = max([o.depth_to or 0 for o in ops], default=0)
+    segments = [dashboard_segment(o) for o in ops]
+
+    # Archived days come from their rollups (one segment per day, type and depth bin)
+    rollups = (
+        db.query(ReportRollup)
+        .filter(ReportRollup.well_id == well_id, ReportRollup.source == "operation")
+        .all()
+    )
+    if rollups:
+        segments += [rollup_segment(r) for r in rollups]
+        segments.sort(key=lambda s: (s["from"] is not None, s["from"] or 0))
+
+    kpis = cached_well_kpis(db, well_id)
+
+    # Live deltas ("report" events) of reports already in here are not applied again
+    report_ids = {o.report_id for o in ops} | {r.report_id for r in rollups}
 
     return {
         "well": {
@@ -94,13 +101,58 @@ def get_well_dashboard(well_id: str, db: Session = Depends(get_db)):
             "well_name": well.well_name,
             "location": well.location,
         },
-        "kpis": {
-            "depthMax": depth_max,
-            "nptHours": round(total_npt, 2),
-            "eventCount": len(ops),
-            "criticalEvents": sum(1 for o in ops if (o.npt_hours or 0) >= 2),
-            "highRiskZones": sum(1 for o in ops if (o.npt_hours or 0) > 0),
-            "maintenanceRisk": "Low" if total_npt == 0 else "Medium" if total_npt < 5 else "High",
-        },
+        "kpis": kpis,
         "segments": segments,
+        "reportIds": sorted(report_ids),
     }
+
+
+@router.get("/{well_id}/offset-wells")
+def get_offset_wells(
+    well_id: str,
+    depth_from: float = Query(..., ge=0, description="Top of the depth window (ft)"),
+    depth_to: float = Query(..., ge=0, description="Bottom of the depth window (ft)"),
+    limit: int = Query(default=100, ge=1, le=MAX_OFFSET_INTERVALS),
+    db: Session = Depends(get_db),
+):
+    """
+    Problem intervals (critical/warning, NPT, flagged events) recorded on the
+    other wells of this well's location inside the depth window, ranked by overlap.
+    """
+    try:
+        result = offset_intervals(db, well_id, depth_from, depth_to, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Well '{well_id}' not found")
+    return result
+
+
+def _well_exists(well_id: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Well.well_id).filter(Well.well_id == well_id).first() is not None
+    finally:
+        db.close()
+
+
+@router.get("/{well_id}/stream")
+async def stream_well_updates(well_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events: one "report" event per ingested report with the new
+    segments and the updated KPIs ("resync" means re-fetch the dashboard).
+    """
+    # Short-lived session: the stream itself holds no DB connection
+    if not await run_in_threadpool(_well_exists, well_id):
+        raise HTTPException(status_code=404, detail=f"Well '{well_id}' not found")
+
+    try:
+        last_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_id = None
+
+    return StreamingResponse(
+        event_stream(well_id, last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
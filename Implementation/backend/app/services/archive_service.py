@@ -0,0 +1,674 @@
+import atexit
+import gzip
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import create_engine, delete, func, insert, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateTable
+
+from ..cache import get_cache
+from ..database import STORAGE_DIR
+from ..models.archive_partition import ArchivePartition
+from ..models.daily_report import DailyReport
+from ..models.event import Event
+from ..models.operation import Operation
+from ..models.report_rollup import ReportRollup
+from ..models.well import Well
+from .blob_store import CHUNK_BYTES, CODEC_SUFFIX, ZSTD_LEVEL, default_codec, open_blob, zstandard
+from .kpi_services import NPT_CRITICAL_HOURS
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Hot/cold tiering
+# ----------------------------
+# Reports of completed wells, and reports older than ARCHIVE_AFTER_MONTHS
+# (whole months), leave the hot operations/events tables:
+#   - their rows move to an archive partition: one SQLite file per (well,
+#     report month), compressed like the blob store (zstd, gzip without it),
+#     with the same columns and ids as the hot tables plus their daily_reports rows
+#     (ids are AUTOINCREMENT, migration 0009, so they are never handed out again)
+#   - per (day, depth bin, type) totals go to report_rollups, which is what
+#     dashboards and KPIs read for archived days
+# daily_reports rows stay hot and daily_reports.archive_partition_id says
+# where a report's detail lives. Readers that need detail (operations list,
+# segments, timeline, progress, rescoring) add archived_rows() to their hot
+# query, bounded by the catalog to the wells and report dates asked for;
+# partitions are decompressed on first use into ARCHIVE_CACHE_DIR and kept
+# (read-only) while they fit in ARCHIVE_CACHE_MB.
+#
+# The catalog in the hot database is the source of truth: a partition file is
+# written (under a new key) before the transaction that points reports at it,
+# and rows of reports it no longer serves are ignored, then dropped on its
+# next rewrite. Superseded and emptied files are only deleted by
+# prune_archive_files, PRUNE_GRACE_SECONDS after they left the catalog.
+# depth_buckets entries and risk_daily_stats of archived reports stay hot, so
+# offset-well lookups and risk scores are unaffected. Full-text search covers
+# hot rows only and flags results whose scope includes archived reports.
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", str(STORAGE_DIR / "archive"))
+ARCHIVE_CACHE_DIR = os.getenv("ARCHIVE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "drilling-archive"))
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "12"))
+
+# Well.well_status values (case-insensitive) whose reports are archived regardless of age
+COMPLETED_STATUSES = ("completed", "abandoned")
+
+ROLLUP_BIN_FT = 100.0
+# Uncompressed partitions kept per process; size it to the archive a worker reads
+ARCHIVE_CACHE_MB = int(os.getenv("ARCHIVE_CACHE_MB", "1024"))
+# Unreferenced files younger than this may belong to a write still in progress, or be
+# read by a worker that looked up the catalog just before a rewrite
+PRUNE_GRACE_SECONDS = 3600
+
+ARCHIVED_TABLES = (DailyReport.__table__, Operation.__table__, Event.__table__)
+PARTITION_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_operations_report ON operations (report_id)",
+    "CREATE INDEX IF NOT EXISTS ix_events_report ON events (report_id)",
+    "CREATE INDEX IF NOT EXISTS ix_events_operation ON events (operation_id)",
+)
+
+
+def period_of(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def months_before(day: date, months: int) -> date:
+    """
+    First day of the month `months` months before day's month.
+    """
+    y, m = divmod(day.year * 12 + day.month - 1 - months, 12)
+    return date(y, m + 1, 1)
+
+
+def _well_dir(well_id: str) -> str:
+    # Readable and filesystem-safe; the hash keeps "A/B" and "A_B" apart
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", well_id).strip("._") or "well"
+    return f"{safe}-{hashlib.sha1(well_id.encode()).hexdigest()[:8]}"
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ----------------------------
+# Partition files
+# ----------------------------
+def _partition_engine(path: Path, readonly: bool = False) -> Engine:
+    if readonly:
+        # No pooled connections: thousands of cached partitions hold no file handles
+        return create_engine(f"sqlite:///file:{path}?mode=ro&uri=true", poolclass=NullPool)
+    return create_engine(f"sqlite:///{path}")
+
+
+def _create_schema(conn) -> None:
+    for table in ARCHIVED_TABLES:
+        conn.execute(CreateTable(table, if_not_exists=True))
+    for ddl in PARTITION_INDEXES:
+        conn.execute(text(ddl))
+
+
+def _decompress(key: str, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-")
+    try:
+        with open_blob(key, ARCHIVE_DIR) as src, os.fdopen(fd, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_BYTES)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _store(work: Path, well_id: str, period: str) -> Dict[str, Any]:
+    """
+    Compresses a finished partition file into ARCHIVE_DIR under a key derived
+    from its content (temp file + rename, like the blob store).
+    """
+    checksum = _sha256_file(work)
+    codec = default_codec()
+    key = f"{_well_dir(well_id)}/{period}-{checksum[:16]}.sqlite{CODEC_SUFFIX[codec]}"
+    path = Path(ARCHIVE_DIR) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with open(work, "rb") as src, os.fdopen(fd, "wb") as dst:
+            if codec == "zstd":
+                zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(src, dst)
+            else:
+                with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6) as gz:
+                    shutil.copyfileobj(src, gz, CHUNK_BYTES)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    return {"key": key, "checksum": checksum, "size": work.stat().st_size, "stored_size": path.stat().st_size}
+
+
+def _delete_file(key: str) -> None:
+    try:
+        (Path(ARCHIVE_DIR) / key).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _retire_file(key: str) -> None:
+    """
+    A file the catalog no longer points at stays for readers that resolved the
+    old catalog row; prune_archive_files' grace period starts now.
+    """
+    try:
+        os.utime(Path(ARCHIVE_DIR) / key)
+    except FileNotFoundError:
+        pass
+
+
+class _OpenPartitions:
+    """
+    Per-process LRU of decompressed partitions (read-only engines), keyed by
+    content checksum, so a rewritten partition is never served stale. Bounded
+    by the uncompressed bytes it keeps (ARCHIVE_CACHE_MB), not a file count:
+    whole-well and fleet reads touch every partition of their scope, and each
+    such read would decompress them all again if they did not fit. Files live
+    in a directory of this process only and are never evicted while a read
+    uses them.
+    """
+
+    def __init__(self, max_bytes: int = ARCHIVE_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._engines: "OrderedDict[str, Engine]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._in_use: Counter = Counter()
+        self._dir: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        with self._lock:
+            if self._dir is None or not self._dir.exists():
+                Path(ARCHIVE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+                self._dir = Path(tempfile.mkdtemp(prefix=f"open-{os.getpid()}-", dir=ARCHIVE_CACHE_DIR))
+                atexit.register(shutil.rmtree, self._dir, True)
+            return self._dir / name
+
+    @contextmanager
+    def use(self, partition) -> Iterator[Engine]:
+        name = f"{partition.checksum}.sqlite"
+        path = self._path(name)
+        with self._lock:
+            self._in_use[name] += 1
+            engine = self._engines.get(name)
+            if engine is not None:
+                self._engines.move_to_end(name)
+        try:
+            if engine is None or not path.exists():
+                if not path.exists():
+                    _decompress(partition.key, path)
+                engine = _partition_engine(path, readonly=True)
+                with self._lock:
+                    self._engines[name] = engine
+                    self._sizes[name] = path.stat().st_size
+            yield engine
+        finally:
+            with self._lock:
+                self._in_use[name] -= 1
+                if not self._in_use[name]:
+                    del self._in_use[name]
+            self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = sum(self._sizes.values())
+            evicted = []
+            for name in list(self._engines):
+                if total <= self.max_bytes:
+                    break
+                if name in self._in_use:
+                    continue
+                evicted.append((name, self._engines.pop(name)))
+                total -= self._sizes.pop(name)
+            directory = self._dir
+        for name, engine in evicted:
+            engine.dispose()
+            (directory / name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            engines, self._engines, self._sizes = list(self._engines.values()), OrderedDict(), {}
+            directory, self._dir = self._dir, None
+        for engine in engines:
+            engine.dispose()
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+_open_partitions = _OpenPartitions()
+
+
+def open_partition(partition: ArchivePartition):
+    """
+    Context manager: read-only engine of a partition, kept decompressed while in use.
+    """
+    return _open_partitions.use(partition)
+
+
+# ----------------------------
+# Reading archived rows
+# ----------------------------
+def catalog_query(
+    db: Session,
+    well_ids: Optional[Sequence[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """
+    (partition_id, report_id) of archived reports; per well it is a range scan
+    of ux_daily_reports_well_date, which every hot read pays once.
+    """
+    q = db.query(DailyReport.archive_partition_id, DailyReport.report_id).filter(
+        DailyReport.archive_partition_id.isnot(None)
+    )
+    if well_ids is not None:
+        q = q.filter(DailyReport.well_id.in_(list(well_ids)))
+    if start is not None:
+        q = q.filter(DailyReport.report_date >= start)
+    if end is not None:
+        q = q.filter(DailyReport.report_date <= end)
+    return q
+
+
+def archived_rows(
+    db: Session,
+    model,
+    columns: Sequence[Any],
+    well_ids: Optional[Sequence[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Sequence[Any] = (),
+) -> List[Any]:
+    """
+    Rows of archived reports (optionally by well and report_date range), read
+    from their partitions: `columns` and `where` are expressions on `model`
+    (Operation or Event) and DailyReport, like the hot query they extend.
+    Unordered; empty without a catalog lookup beyond daily_reports.
+    """
+    by_partition: Dict[int, List[int]] = defaultdict(list)
+    for partition_id, report_id in catalog_query(db, well_ids, start, end):
+        by_partition[partition_id].append(report_id)
+    if not by_partition:
+        return []
+
+    partitions = db.query(ArchivePartition).filter(ArchivePartition.partition_id.in_(list(by_partition))).all()
+    rows: List[Any] = []
+    for partition in partitions:
+        stmt = (
+            select(*columns)
+            .select_from(model)
+            .join(DailyReport, DailyReport.report_id == model.report_id)
+            .where(model.report_id.in_(by_partition[partition.partition_id]), *where)
+        )
+        with open_partition(partition) as engine, engine.connect() as conn:
+            rows.extend(conn.execute(stmt).all())
+    return rows
+
+
+# ----------------------------
+# Rollups
+# ----------------------------
+def rollup_rows(well_id: str, report_dates: Dict[int, date], ops: Iterable[Dict], events: Iterable[Dict]) -> List[dict]:
+    """
+    report_rollups rows for a set of reports' operations and events.
+    """
+    groups: Dict[tuple, dict] = {}
+    sources = (
+        ("operation", ops, "operation_type", "duration_hours",
+         lambda r: (r["npt_hours"] or 0) >= NPT_CRITICAL_HOURS),
+        ("event", events, "event_type", "event_duration_hours",
+         lambda r: (r["severity"] or "").lower() == "critical"),
+    )
+    for source, rows, kind_col, hours_col, is_critical in sources:
+        for r in rows:
+            depths = [v for v in (r["depth_from"], r["depth_to"]) if v is not None]
+            depth_bin = int(depths[0] // ROLLUP_BIN_FT) if depths else -1
+            day = report_dates[r["report_id"]]
+            key = (source, day, depth_bin, r[kind_col] or "")
+            g = groups.get(key)
+            if g is None:
+                g = groups[key] = {
+                    "well_id": well_id, "source": source, "report_date": day, "depth_bin": depth_bin,
+                    "kind": key[3], "report_id": r["report_id"], "row_count": 0, "hours": 0.0,
+                    "npt_hours": 0.0, "npt_count": 0, "critical_count": 0, "depth_from": None, "depth_to": None,
+                }
+            g["row_count"] += 1
+            g["hours"] += r[hours_col] or 0.0
+            g["npt_hours"] += r["npt_hours"] or 0.0
+            g["npt_count"] += (r["npt_hours"] or 0) > 0
+            g["critical_count"] += is_critical(r)
+            if depths:
+                g["depth_from"] = min(depths) if g["depth_from"] is None else min(g["depth_from"], *depths)
+                g["depth_to"] = max(depths) if g["depth_to"] is None else max(g["depth_to"], *depths)
+    return list(groups.values())
+
+
+# ----------------------------
+# Archiving
+# ----------------------------
+def archive_candidates(
+    db: Session,
+    months: int = ARCHIVE_AFTER_MONTHS,
+    well_ids: Optional[Sequence[str]] = None,
+    today: Optional[date] = None,
+) -> List[DailyReport]:
+    """
+    Hot reports of completed wells, and reports from before the month that
+    began `months` months ago.
+    """
+    cutoff = months_before(today or date.today(), months)
+    completed = select(Well.well_id).where(func.lower(Well.well_status).in_(COMPLETED_STATUSES))
+    q = (
+        db.query(DailyReport)
+        .filter(DailyReport.archive_partition_id.is_(None))
+        .filter(or_(DailyReport.report_date < cutoff, DailyReport.well_id.in_(completed)))
+    )
+    if well_ids:
+        q = q.filter(DailyReport.well_id.in_(list(well_ids)))
+    return q.order_by(DailyReport.well_id, DailyReport.report_date).all()
+
+
+def _table_rows(db: Session, model, report_ids: Sequence[int]) -> List[dict]:
+    table = model.__table__
+    return [dict(r) for r in db.execute(select(table).where(table.c.report_id.in_(list(report_ids)))).mappings()]
+
+
+def _archive_partition(db: Session, well_id: str, period: str, reports: List[DailyReport]) -> Counter:
+    """
+    Moves one (well, month) group of reports into its partition; one
+    transaction on the hot side. Archived ids are never handed out again:
+    operations/events ids are AUTOINCREMENT (migration 0009).
+    """
+    counts: Counter = Counter()
+    ops = _table_rows(db, Operation, [r.report_id for r in reports])
+    events = _table_rows(db, Event, [r.report_id for r in reports])
+
+    report_ids = [r.report_id for r in reports]
+    partition = db.query(ArchivePartition).filter(
+        ArchivePartition.well_id == well_id, ArchivePartition.period == period
+    ).first()
+    keep = [] if partition is None else [
+        rid for (rid,) in db.query(DailyReport.report_id).filter(DailyReport.archive_partition_id == partition.partition_id)
+    ]
+
+    # Work on a private copy: the current file keeps serving readers until the catalog moves on
+    Path(ARCHIVE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=ARCHIVE_CACHE_DIR, prefix=".work-", suffix=".sqlite")
+    os.close(fd)
+    work = Path(tmp)
+    try:
+        if partition is not None:
+            _decompress(partition.key, work)
+        engine = _partition_engine(work)
+        try:
+            with engine.begin() as conn:
+                _create_schema(conn)
+                for table in ARCHIVED_TABLES:
+                    # Rows of reports restored since the last write
+                    conn.execute(delete(table).where(table.c.report_id.not_in(keep)))
+                conn.execute(insert(DailyReport.__table__), [
+                    {c.name: getattr(r, c.name) for c in DailyReport.__table__.columns} for r in reports
+                ])
+                if ops:
+                    conn.execute(insert(Operation.__table__), ops)
+                if events:
+                    conn.execute(insert(Event.__table__), events)
+                totals = {
+                    name: conn.execute(select(func.count()).select_from(table)).scalar()
+                    for name, table in (("reports", DailyReport.__table__), ("operations", Operation.__table__),
+                                        ("events", Event.__table__))
+                }
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("VACUUM"))
+        finally:
+            engine.dispose()
+        stored = _store(work, well_id, period)
+    finally:
+        work.unlink(missing_ok=True)
+
+    old_key = partition.key if partition is not None else None
+    try:
+        if partition is None:
+            partition = ArchivePartition(well_id=well_id, period=period)
+            db.add(partition)
+        partition.key = stored["key"]
+        partition.checksum = stored["checksum"]
+        partition.size = stored["size"]
+        partition.stored_size = stored["stored_size"]
+        partition.report_count = totals["reports"]
+        partition.operation_count = totals["operations"]
+        partition.event_count = totals["events"]
+        partition.updated_at = datetime.utcnow()
+        db.flush()
+
+        for r in reports:
+            r.archive_partition_id = partition.partition_id
+        rollups = rollup_rows(well_id, {r.report_id: r.report_date for r in reports}, ops, events)
+        if rollups:
+            db.execute(insert(ReportRollup.__table__), rollups)
+        db.execute(delete(Event).where(Event.report_id.in_(report_ids)))
+        db.execute(delete(Operation).where(Operation.report_id.in_(report_ids)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        if stored["key"] != old_key:
+            _delete_file(stored["key"])
+        raise
+
+    if old_key and old_key != stored["key"]:
+        _retire_file(old_key)
+
+    counts.update({"reports": len(reports), "operations": len(ops), "events": len(events),
+                   "rollups": len(rollups), "partitions": 1})
+    return counts
+
+
+def archive_reports(db: Session, reports: Sequence[DailyReport]) -> Dict[str, int]:
+    """
+    Archives the given hot reports, one partition (and transaction) per
+    (well, month). Returns counts.
+    """
+    groups: Dict[tuple, List[DailyReport]] = defaultdict(list)
+    for r in reports:
+        if r.archive_partition_id is None:
+            groups[(r.well_id, period_of(r.report_date))].append(r)
+
+    totals: Counter = Counter()
+    touched = set()
+    for (well_id, period), group in sorted(groups.items()):
+        counts = _archive_partition(db, well_id, period, group)
+        if counts["reports"]:
+            touched.add(well_id)
+            logger.info(f"Archived {counts['reports']} reports of {well_id} ({period}): "
+                        f"{counts['operations']} operations, {counts['events']} events")
+        totals.update(counts)
+
+    # Dashboards now read rollups for these days
+    for well_id in sorted(touched):
+        get_cache().invalidate_well(well_id)
+
+    result = {k: totals[k] for k in ("reports", "operations", "events", "rollups", "partitions")}
+    result["wells"] = len(touched)
+    return result
+
+
+def archived_max_ids(db) -> Dict[str, int]:
+    """
+    Highest operations/events id in any catalogued partition (0 without an
+    archive); migration 0009 starts the hot id sequences above them.
+    """
+    result = {"operations": 0, "events": 0}
+    partitions = db.execute(select(ArchivePartition.partition_id, ArchivePartition.key, ArchivePartition.checksum)).all()
+    for partition in partitions:
+        with open_partition(partition) as engine, engine.connect() as conn:
+            for name, column in (("operations", Operation.operation_id), ("events", Event.event_id)):
+                result[name] = max(result[name], conn.execute(select(func.coalesce(func.max(column), 0))).scalar())
+    return result
+
+
+def restore_reports(db: Session, reports: Sequence[DailyReport], commit: bool = True) -> Dict[str, int]:
+    """
+    Moves archived reports back into the hot tables with their original ids
+    (event links and depth-index entries stay valid) and drops their rollups.
+    Partition files are not touched: rows of restored reports are ignored by
+    readers and dropped when the partition is next rewritten; emptied
+    partitions leave the catalog and their files go on the next prune.
+    """
+    by_partition: Dict[int, List[DailyReport]] = defaultdict(list)
+    for r in reports:
+        if r.archive_partition_id is not None:
+            by_partition[r.archive_partition_id].append(r)
+
+    counts: Counter = Counter()
+    emptied: List[str] = []
+    for partition_id, group in by_partition.items():
+        partition = db.get(ArchivePartition, partition_id)
+        report_ids = [r.report_id for r in group]
+        with open_partition(partition) as engine, engine.connect() as conn:
+            tables = {
+                model: [dict(r) for r in conn.execute(
+                    select(model.__table__).where(model.__table__.c.report_id.in_(report_ids))
+                ).mappings()]
+                for model in (Operation, Event)
+            }
+
+        # Operations first: events reference them
+        for model in (Operation, Event):
+            if tables[model]:
+                db.execute(insert(model.__table__), tables[model])
+        db.execute(delete(ReportRollup).where(ReportRollup.report_id.in_(report_ids)))
+        for r in group:
+            r.archive_partition_id = None
+
+        partition.report_count -= len(group)
+        partition.operation_count -= len(tables[Operation])
+        partition.event_count -= len(tables[Event])
+        partition.updated_at = datetime.utcnow()
+        if partition.report_count <= 0:
+            emptied.append(partition.key)
+            db.delete(partition)
+            counts["partitions_emptied"] += 1
+        counts.update({"reports": len(group), "operations": len(tables[Operation]), "events": len(tables[Event])})
+    db.flush()
+
+    for key in emptied:
+        _retire_file(key)
+    if commit and by_partition:
+        db.commit()
+        for well_id in sorted({r.well_id for r in reports}):
+            get_cache().invalidate_well(well_id)
+    return {k: counts[k] for k in ("reports", "operations", "events", "partitions_emptied")}
+
+
+def prune_archive_files(db: Session, grace_seconds: float = PRUNE_GRACE_SECONDS) -> int:
+    """
+    Deletes partition files no catalog row points at (superseded or emptied
+    partitions, writes whose transaction failed), once older than the grace period.
+    """
+    root = Path(ARCHIVE_DIR)
+    if not root.exists():
+        return 0
+    referenced = {k for (k,) in db.query(ArchivePartition.key)}
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    for path in root.glob("*/*.sqlite*"):
+        key = path.relative_to(root).as_posix()
+        if key not in referenced and path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def hot_size_bytes(db: Session) -> int:
+    page_count = db.execute(text("PRAGMA page_count")).scalar()
+    page_size = db.execute(text("PRAGMA page_size")).scalar()
+    return page_count * page_size
+
+
+def vacuum_hot(db: Session) -> None:
+    """
+    Returns the pages freed by archiving to the filesystem (rewrites the database).
+    """
+    db.commit()
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+
+
+def run_archival(
+    db: Session,
+    months: int = ARCHIVE_AFTER_MONTHS,
+    well_ids: Optional[Sequence[str]] = None,
+    today: Optional[date] = None,
+    vacuum: bool = False,
+) -> Dict[str, Any]:
+    """
+    Archives every candidate report, prunes unreferenced partition files and
+    optionally vacuums the hot database.
+    """
+    size_before = hot_size_bytes(db)
+    reports = archive_candidates(db, months, well_ids, today)
+    result: Dict[str, Any] = {"candidates": len(reports), **archive_reports(db, reports)}
+    result["pruned_files"] = prune_archive_files(db)
+    if vacuum:
+        vacuum_hot(db)
+    result["hot_bytes_before"] = size_before
+    result["hot_bytes_after"] = hot_size_bytes(db)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from ..database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Archive old reports and completed wells into compressed partitions")
+    ap.add_argument("--months", type=int, default=ARCHIVE_AFTER_MONTHS,
+                    help="archive reports before the month that began this many months ago")
+    ap.add_argument("--well", action="append", help="only these wells (repeatable)")
+    ap.add_argument("--vacuum", action="store_true", help="shrink the hot database file afterwards")
+    ap.add_argument("--restore-well", action="append", help="move these wells' archived reports back to the hot tables")
+    args = ap.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.restore_well:
+            archived = (
+                session.query(DailyReport)
+                .filter(DailyReport.well_id.in_(args.restore_well), DailyReport.archive_partition_id.isnot(None))
+                .all()
+            )
+            result = restore_reports(session, archived)
+        else:
+            result = run_archival(session, args.months, args.well, vacuum=args.vacuum)
+        print(json.dumps(result, indent=2))
+    finally:
+        session.close()
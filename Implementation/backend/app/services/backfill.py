@@ -0,0 +1,350 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..cache import get_cache
+from ..models.daily_report import DailyReport
+from ..models.operation import Operation
+from ..models.event import Event
+from ..models.backfill_job import BackfillJob
+from ..models.backfill_item import BackfillItem
+from . import blob_store
+from .archive_service import restore_reports
+from .event_linking import link_report_events
+from .ingestion_service import PARSERS, get_parser, parser_version, insert_operations_events
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Re-parse / backfill after a parser version bump
+# ----------------------------
+# 1. select reports whose parser_version is behind the parser's PARSER_VERSION (one job row,
+#    one backfill_items staging row per report)
+# 2. parse the stored originals (or the data directory) in a process pool and
+#    stage the output as JSON on the item
+# 3. swap each well's staged reports into operations/events in one transaction,
+#    stamping parser_version, then rescore risk from the new rows; a report
+#    replaced since it was staged (file_hash changed) is skipped, it already
+#    has rows from the current parser
+# Every step is recorded on the items, so a crashed job resumes where it stopped.
+DATA_DIR = Path(os.getenv("BACKFILL_DATA_DIR", str(Path(__file__).resolve().parents[3] / "data")))
+STAGE_COMMIT_EVERY = 20
+
+
+def _parse_one(report_id: int, parser_type: str, blob_key: Optional[str], fallback_path: Optional[str],
+               blob_root: str) -> Dict[str, Any]:
+    """
+    Worker (runs in a child process): loads the original, parses it and stores
+    the original in the blob store if it only existed in the data directory.
+    """
+    try:
+        if blob_key and blob_store.blob_path(blob_key, blob_root).exists():
+            pdf_bytes = blob_store.read_blob(blob_key, blob_root)
+            stored = None
+        elif fallback_path:
+            pdf_bytes = Path(fallback_path).read_bytes()
+            stored = blob_store.put_blob(pdf_bytes, root=blob_root)
+        else:
+            return {"report_id": report_id, "error": "original PDF not found"}
+
+        parsed = get_parser(parser_type)(pdf_bytes)
+        payload = {
+            "operations": [o.to_dict() if hasattr(o, "to_dict") else o for o in parsed.get("operations", [])],
+            "events": parsed.get("events", []),
+            "notes": parsed.get("notes"),
+        }
+        return {"report_id": report_id, "payload": json.dumps(payload, default=str), "stored": stored}
+    except Exception as e:
+        return {"report_id": report_id, "error": f"{type(e).__name__}: {e}"}
+
+
+def _data_dir_index(data_dir: Path) -> Dict[str, str]:
+    """
+    source_filename -> path for every PDF under the data directory.
+    """
+    if not data_dir.exists():
+        return {}
+    return {p.name: str(p) for p in sorted(data_dir.rglob("*.pdf"))}
+
+
+def create_or_resume_job(db: Session, parser_type: str = "NNPC_FORMAT_A", force: bool = False) -> BackfillJob:
+    """
+    Returns the unfinished job for this parser version, or a new job covering
+    every report parsed by an older version (all reports of the type with force=True).
+    """
+    if parser_type not in PARSERS:
+        raise ValueError(f"Unknown parser_type '{parser_type}'")
+    version = parser_version(parser_type)
+
+    job = (
+        db.query(BackfillJob)
+        .filter(BackfillJob.parser_type == parser_type, BackfillJob.parser_version == version,
+                BackfillJob.status == "running")
+        .order_by(BackfillJob.job_id.desc())
+        .first()
+    )
+    if job is not None:
+        # Failed items get another attempt on resume
+        db.query(BackfillItem).filter(BackfillItem.job_id == job.job_id, BackfillItem.status == "failed").update(
+            {"status": "pending", "error": None}
+        )
+        db.commit()
+        return job
+
+    q = db.query(DailyReport.report_id).filter(DailyReport.parser_type == parser_type)
+    if not force:
+        q = q.filter((DailyReport.parser_version.is_(None)) | (DailyReport.parser_version < version))
+    report_ids = [r for (r,) in q.order_by(DailyReport.report_id).all()]
+
+    job = BackfillJob(parser_type=parser_type, parser_version=version, status="running", report_count=len(report_ids))
+    if not report_ids:
+        job.status, job.finished_at = "done", datetime.utcnow()
+    db.add(job)
+    db.flush()
+    db.bulk_insert_mappings(BackfillItem, [{"job_id": job.job_id, "report_id": r, "status": "pending"} for r in report_ids])
+    db.commit()
+    return job
+
+
+def stage_job(db: Session, job: BackfillJob, workers: int = 0, data_dir: Path = DATA_DIR) -> Dict[str, int]:
+    """
+    Parses the job's pending reports into their staging rows.
+    workers <= 1 parses in-process; otherwise a process pool of that size.
+    """
+    pending = (
+        db.query(BackfillItem.report_id, DailyReport.original_blob, DailyReport.source_filename, DailyReport.file_hash)
+        .join(DailyReport, DailyReport.report_id == BackfillItem.report_id)
+        .filter(BackfillItem.job_id == job.job_id, BackfillItem.status == "pending")
+        .order_by(BackfillItem.report_id)
+        .all()
+    )
+    if not pending:
+        return {"staged": 0, "failed": 0}
+
+    index = _data_dir_index(data_dir)
+    tasks = [
+        (report_id, job.parser_type, blob_key, index.get(filename or ""), blob_store.BLOB_STORE_DIR)
+        for report_id, blob_key, filename, _ in pending
+    ]
+    # Version of each report the parse comes from; the swap skips reports replaced since
+    source_hashes = {report_id: file_hash for report_id, _, _, file_hash in pending}
+
+    counts = {"staged": 0, "failed": 0}
+
+    def record(result: Dict[str, Any]) -> None:
+        item = db.get(BackfillItem, (job.job_id, result["report_id"]))
+        if "error" in result:
+            item.status, item.error = "failed", result["error"]
+            counts["failed"] += 1
+            logger.warning(f"Backfill job {job.job_id}: report {result['report_id']} failed: {result['error']}")
+            return
+        item.status, item.payload, item.error = "staged", result["payload"], None
+        item.file_hash = source_hashes[result["report_id"]]
+        if result.get("stored"):
+            db.query(DailyReport).filter(DailyReport.report_id == result["report_id"]).update({
+                "original_blob": result["stored"]["key"], "original_size": result["stored"]["size"],
+            })
+        counts["staged"] += 1
+        if (counts["staged"] + counts["failed"]) % STAGE_COMMIT_EVERY == 0:
+            db.commit()
+
+    if workers <= 1:
+        for task in tasks:
+            record(_parse_one(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_one, *task) for task in tasks]
+            for future in as_completed(futures):
+                record(future.result())
+    db.commit()
+    return counts
+
+
+def _load_payload(raw: str) -> Dict[str, Any]:
+    """
+    Staged JSON back to insert_operations_events input: json.dumps(default=str)
+    turned event timestamps into strings.
+    """
+    payload = json.loads(raw)
+    for e in payload.get("events", []):
+        if isinstance(e.get("recorded_at"), str):
+            e["recorded_at"] = datetime.fromisoformat(e["recorded_at"])
+    return payload
+
+
+def _replace_rows(db: Session, report: DailyReport, payload: Dict[str, Any]) -> None:
+    """
+    Swaps one report's operations/events for the staged ones. Events of other
+    reports linked to the deleted operations are unlinked, then linked again
+    against the new rows (like a corrected report, see report_diff.py).
+    """
+    report_id, well_id = report.report_id, report.well_id
+    old_ops = select(Operation.operation_id).where(Operation.report_id == report_id)
+    relink = [
+        r for (r,) in db.query(Event.report_id)
+        .filter(Event.operation_id.in_(old_ops), Event.report_id != report_id)
+        .distinct()
+    ]
+    if relink:
+        db.query(Event).filter(Event.operation_id.in_(old_ops), Event.report_id != report_id).update(
+            {Event.operation_id: None}, synchronize_session=False
+        )
+    db.query(Event).filter(Event.report_id == report_id).delete(synchronize_session=False)
+    db.query(Operation).filter(Operation.report_id == report_id).delete(synchronize_session=False)
+    insert_operations_events(db, report_id, well_id, payload, report.report_date, commit=False)
+    for r in sorted(relink):
+        link_report_events(db, well_id, r, commit=False)
+
+
+def swap_job(db: Session, job: BackfillJob) -> Dict[str, int]:
+    """
+    Replaces live operations/events with the staged output, one transaction per
+    well: readers see a well either entirely on the old parse or entirely on the new one.
+    """
+    rows = (
+        db.query(BackfillItem, DailyReport)
+        .join(DailyReport, DailyReport.report_id == BackfillItem.report_id)
+        .filter(BackfillItem.job_id == job.job_id, BackfillItem.status == "staged")
+        .order_by(DailyReport.well_id, DailyReport.report_id)
+        .all()
+    )
+
+    by_well: Dict[str, List] = {}
+    for item, report in rows:
+        by_well.setdefault(report.well_id, []).append((item, report))
+
+    swapped = skipped = 0
+    for well_id, items in by_well.items():
+        try:
+            current, stale = [], 0
+            for item, report in items:
+                # Stamped only if the report is still the version that was staged (conditional
+                # UPDATE: a replace cannot commit in between). Replaced after staging: its rows
+                # are newer than the staged parse.
+                claimed = db.query(DailyReport).filter(
+                    DailyReport.report_id == report.report_id,
+                    DailyReport.file_hash == item.file_hash,
+                    DailyReport.parser_type == job.parser_type,
+                ).update({DailyReport.parser_version: job.parser_version}, synchronize_session="fetch")
+                if claimed:
+                    current.append((item, report))
+                else:
+                    item.status, item.payload = "skipped", None
+                    item.error = "report replaced after staging"
+                    stale += 1
+
+            # Re-parsed archived reports come back hot; the next archival run moves them out again
+            restore_reports(db, [report for _, report in current if report.archive_partition_id is not None],
+                            commit=False)
+            for item, report in current:
+                payload = _load_payload(item.payload)
+                _replace_rows(db, report, payload)
+                if payload.get("notes"):
+                    report.notes = payload["notes"]
+                item.status, item.payload = "swapped", None
+            db.commit()
+            get_cache().invalidate_well(well_id)
+            swapped += len(current)
+            skipped += stale
+        except Exception:
+            db.rollback()
+            logger.exception(f"Backfill job {job.job_id}: swap failed for well {well_id}")
+    return {"swapped": swapped, "skipped": skipped, "wells": len(by_well)}
+
+
+def job_progress(db: Session, job_id: int) -> Optional[Dict[str, Any]]:
+    job = db.get(BackfillJob, job_id)
+    if job is None:
+        return None
+    counts = dict(
+        db.query(BackfillItem.status, func.count())
+        .filter(BackfillItem.job_id == job_id)
+        .group_by(BackfillItem.status)
+        .all()
+    )
+    return {
+        "job_id": job.job_id,
+        "parser_type": job.parser_type,
+        "parser_version": job.parser_version,
+        "status": job.status,
+        "report_count": job.report_count,
+        "items": counts,
+        "error": job.error,
+        "created_at": str(job.created_at) if job.created_at else None,
+        "finished_at": str(job.finished_at) if job.finished_at else None,
+    }
+
+
+def run_backfill(db: Session, job: BackfillJob, workers: int = 0, data_dir: Path = DATA_DIR,
+                 rescore: bool = True) -> Dict[str, Any]:
+    """
+    Stage -> swap -> rescore for a job from create_or_resume_job(). Safe to re-run.
+    """
+    t0 = time.perf_counter()
+    try:
+        staged = stage_job(db, job, workers=workers, data_dir=data_dir)
+        t_stage = time.perf_counter()
+        swapped = swap_job(db, job)
+        t_swap = time.perf_counter()
+
+        risk = None
+        if rescore and swapped["swapped"]:
+            from .risk_batch import rescore_fleet  # NumPy, only needed here
+            risk = rescore_fleet(db)
+
+        remaining = (
+            db.query(func.count())
+            .select_from(BackfillItem)
+            .filter(BackfillItem.job_id == job.job_id, BackfillItem.status.notin_(("swapped", "skipped")))
+            .scalar()
+        )
+        if remaining == 0:
+            job.status, job.finished_at = "done", datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        job.error = f"{type(e).__name__}: {e}"
+        db.commit()
+        raise
+
+    return {
+        **job_progress(db, job.job_id),
+        "staged": staged,
+        "swapped": swapped,
+        "risk_score_version": risk["score_version"] if risk else None,
+        "timings_s": {
+            "stage": round(t_stage - t0, 3),
+            "swap": round(t_swap - t_stage, 3),
+            "total": round(time.perf_counter() - t0, 3),
+        },
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from ..database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Re-parse reports produced by an older parser version.")
+    ap.add_argument("--parser", default="NNPC_FORMAT_A")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--force", action="store_true", help="re-parse every report, not only outdated ones")
+    ap.add_argument("--no-rescore", action="store_true")
+    args = ap.parse_args()
+
+    session = SessionLocal()
+    try:
+        backfill_job = create_or_resume_job(session, args.parser, force=args.force)
+        print(json.dumps(run_backfill(session, backfill_job, args.workers, args.data_dir, not args.no_rescore),
+                         indent=2, default=str))
+    finally:
+        session.close()
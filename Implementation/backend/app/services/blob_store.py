@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from ..database import STORAGE_DIR
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ----------------------------
+# Content-addressed store for original report PDFs
+# ----------------------------
+# Blobs are keyed by the upload's sha256 (DailyReport.file_hash) and sharded
+# two levels deep: <root>/ab/cd/abcd....pdf.zst. Identical uploads share one
+# blob. zstd when the zstandard package is installed, gzip otherwise; the
+# codec is part of the key so both can coexist in one store.
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", str(STORAGE_DIR / "blob_store"))
+ZSTD_LEVEL = 10
+CHUNK_BYTES = 64 * 1024
+
+CODEC_SUFFIX = {"zstd": ".zst", "gzip": ".gz", "raw": ""}
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def blob_key(file_hash: str, codec: str) -> str:
+    """
+    Relative storage key for a hash, e.g. "ab/cd/abcd...ef.pdf.zst".
+    """
+    return f"{file_hash[:2]}/{file_hash[2:4]}/{file_hash}.pdf{CODEC_SUFFIX[codec]}"
+
+
+def codec_for_key(key: str) -> str:
+    for codec, suffix in CODEC_SUFFIX.items():
+        if suffix and key.endswith(suffix):
+            return codec
+    return "raw"
+
+
+def blob_path(key: str, root: Optional[str] = None) -> Path:
+    return Path(root or BLOB_STORE_DIR) / key
+
+
+def find_blob(file_hash: str, root: Optional[str] = None) -> Optional[str]:
+    """
+    Key of an existing blob for this hash (any codec), or None.
+    """
+    for codec in CODEC_SUFFIX:
+        key = blob_key(file_hash, codec)
+        if blob_path(key, root).exists():
+            return key
+    return None
+
+
+def _compress(content: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content)
+    if codec == "gzip":
+        return gzip.compress(content, compresslevel=6)
+    return content
+
+
+def put_blob(content: bytes, file_hash: Optional[str] = None, root: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Stores content once per hash. Returns {key, size, stored_size, created}.
+    The write goes to a temp file in the shard directory and is renamed into
+    place, so concurrent uploads of the same file never see a partial blob.
+    """
+    file_hash = file_hash or hashlib.sha256(content).hexdigest()
+
+    existing = find_blob(file_hash, root)
+    if existing is not None:
+        return {
+            "key": existing,
+            "size": len(content),
+            "stored_size": blob_path(existing, root).stat().st_size,
+            "created": False,
+        }
+
+    codec = default_codec()
+    key = blob_key(file_hash, codec)
+    path = blob_path(key, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = _compress(content, codec)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    return {"key": key, "size": len(content), "stored_size": len(data), "created": True}
+
+
+def open_blob(key: str, root: Optional[str] = None) -> BinaryIO:
+    """
+    Readable, forward-seekable stream of the original (decompressed) bytes.
+    """
+    path = blob_path(key, root)
+    codec = codec_for_key(key)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst blobs")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_blob(key: str, root: Optional[str] = None) -> bytes:
+    with open_blob(key, root) as f:
+        return f.read()
+
+
+def iter_range(key: str, start: int = 0, end: Optional[int] = None, root: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Yields the original bytes [start, end] (inclusive, like HTTP ranges) in chunks.
+    Compressed blobs are decoded as a stream up to `end`; nothing is held in memory.
+    """
+    with open_blob(key, root) as f:
+        if start:
+            f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = f.read(CHUNK_BYTES if remaining is None else min(CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def delete_blob(key: str, root: Optional[str] = None) -> None:
+    path = blob_path(key, root)
+    if path.exists():
+        path.unlink()
+
@@ -0,0 +1,239 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.event import Event
+from ..models.operation import Operation
+from .timeline_service import MAX_OPERATION_HOURS
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Event -> operation linking
+# ----------------------------
+# An event belongs to the operation that was running when it was recorded
+# (time windows overlap) and covers its depth (depth intervals overlap, with
+# a small tolerance for rounding in the reports). Events without a time are
+# matched on depth among the operations of their own report.
+#
+# Candidates come from a sort + sweep over interval end points instead of a
+# nested loop: O((n + m) log(n + m)) plus the (few) overlapping pairs.
+DEPTH_TOLERANCE_FT = 1.0
+
+_OPERATION_COLUMNS = (
+    Operation.operation_id, Operation.report_id, Operation.start_time,
+    Operation.end_time, Operation.depth_from, Operation.depth_to,
+)
+_EVENT_COLUMNS = (
+    Event.event_id, Event.report_id, Event.recorded_at, Event.event_duration_hours,
+    Event.depth_from, Event.depth_to,
+)
+
+
+def overlap_pairs(left: Iterable[tuple], right: Iterable[tuple]) -> Iterator[Tuple[Any, Any]]:
+    """
+    left/right: (lo, hi, key) closed intervals on one axis. Yields
+    (left_key, right_key) for every overlapping pair. Starts sort before ends
+    at the same coordinate, so touching intervals count as overlapping.
+    """
+    points = []
+    for side, items in ((0, left), (1, right)):
+        for lo, hi, key in items:
+            points.append((lo, 0, side, key))
+            points.append((hi, 1, side, key))
+    points.sort(key=lambda p: (p[0], p[1]))
+
+    active = ({}, {})
+    for _, is_end, side, key in points:
+        if is_end:
+            active[side].pop(key, None)
+            continue
+        for other in active[1 - side]:
+            yield (key, other) if side == 0 else (other, key)
+        active[side][key] = None
+
+
+def _depth_span(row) -> Optional[Tuple[float, float]]:
+    values = [v for v in (row.depth_from, row.depth_to) if v is not None]
+    return (min(values), max(values)) if values else None
+
+
+def _event_window(row) -> Optional[Tuple[datetime, datetime]]:
+    if row.recorded_at is None:
+        return None
+    return row.recorded_at, row.recorded_at + timedelta(hours=row.event_duration_hours or 0)
+
+
+def _operation_window(row) -> Optional[Tuple[datetime, datetime]]:
+    if row.start_time is None:
+        return None
+    return row.start_time, row.end_time or row.start_time
+
+
+def _overlap(a: Optional[tuple], b: Optional[tuple], tolerance=0) -> Optional[float]:
+    """
+    Length of the overlap (seconds for time windows), None when disjoint or unknown.
+    """
+    if a is None or b is None:
+        return None
+    lo, hi = max(a[0], b[0]), min(a[1], b[1])
+    if isinstance(lo, datetime):
+        return (hi - lo).total_seconds() if hi >= lo else None
+    return hi - lo if hi >= lo - tolerance else None
+
+
+def best_operation(event, operations: Sequence) -> Optional[int]:
+    """
+    Among candidate operations: depth must overlap when both sides have a
+    depth; then the longest time overlap, the longest depth overlap and the
+    latest start win (an event on a boundary goes to the operation starting there).
+    """
+    window, span = _event_window(event), _depth_span(event)
+    best_key, best_id = None, None
+    for op in operations:
+        op_span = _depth_span(op)
+        depth = _overlap(span, op_span, DEPTH_TOLERANCE_FT)
+        if span is not None and op_span is not None and depth is None:
+            continue
+        time_overlap = _overlap(window, _operation_window(op))
+        key = (time_overlap or 0.0, depth or 0.0, op.start_time or datetime.min, op.operation_id)
+        if best_key is None or key > best_key:
+            best_key, best_id = key, op.operation_id
+    return best_id
+
+
+def match_events(operations: Sequence, events: Sequence) -> Dict[int, Optional[int]]:
+    """
+    event_id -> operation_id (or None) for one well's rows.
+    """
+    ops_by_id = {op.operation_id: op for op in operations}
+    candidates: Dict[int, List[int]] = defaultdict(list)
+
+    timed = [(w[0], w[1], e.event_id) for e in events if (w := _event_window(e)) is not None]
+    op_windows = [(w[0], w[1], op.operation_id) for op in operations if (w := _operation_window(op)) is not None]
+    for event_id, operation_id in overlap_pairs(timed, op_windows):
+        candidates[event_id].append(operation_id)
+
+    # No time on the event: depth overlap among its own report's operations
+    untimed = [e for e in events if e.recorded_at is None]
+    if untimed:
+        ops_by_report: Dict[int, List] = defaultdict(list)
+        for op in operations:
+            ops_by_report[op.report_id].append(op)
+        events_by_report: Dict[int, List] = defaultdict(list)
+        for e in untimed:
+            events_by_report[e.report_id].append(e)
+        for report_id, report_events in events_by_report.items():
+            spans = [(s[0] - DEPTH_TOLERANCE_FT, s[1] + DEPTH_TOLERANCE_FT, e.event_id)
+                     for e in report_events if (s := _depth_span(e)) is not None]
+            op_spans = [(s[0], s[1], op.operation_id)
+                        for op in ops_by_report.get(report_id, []) if (s := _depth_span(op)) is not None]
+            for event_id, operation_id in overlap_pairs(spans, op_spans):
+                candidates[event_id].append(operation_id)
+
+    return {
+        e.event_id: best_operation(e, [ops_by_id[i] for i in candidates.get(e.event_id, ())])
+        for e in events
+    }
+
+
+def _apply(db: Session, links: Dict[int, Optional[int]]) -> int:
+    db.bulk_update_mappings(Event, [{"event_id": e, "operation_id": o} for e, o in links.items()])
+    return sum(1 for o in links.values() if o is not None)
+
+
+# ----------------------------
+# Incremental (ingest) and bulk (backfill) entry points
+# ----------------------------
+def link_report_events(db: Session, well_id: str, report_id: int, commit: bool = True) -> int:
+    """
+    Links a freshly inserted report's unlinked events. Candidate operations
+    are the report's own plus any of the well's operations overlapping the
+    events' time range (one indexed range scan on ix_operations_well_start).
+    Returns the number of events linked.
+    """
+    events = (
+        db.query(*_EVENT_COLUMNS)
+        .filter(Event.report_id == report_id, Event.operation_id.is_(None))
+        .all()
+    )
+    if not events:
+        return 0
+
+    q = db.query(*_OPERATION_COLUMNS).filter(Operation.well_id == well_id)
+    windows = [w for e in events if (w := _event_window(e)) is not None]
+    if windows:
+        lo, hi = min(w[0] for w in windows), max(w[1] for w in windows)
+        q = q.filter(
+            (Operation.report_id == report_id)
+            | (
+                (Operation.start_time >= lo - timedelta(hours=MAX_OPERATION_HOURS))
+                & (Operation.start_time <= hi)
+            )
+        )
+    else:
+        q = q.filter(Operation.report_id == report_id)
+
+    linked = _apply(db, match_events(q.all(), events))
+    if commit:
+        db.commit()
+    return linked
+
+
+def link_well_events(db: Session, well_id: str, relink: bool = False) -> Dict[str, int]:
+    """
+    Links every (unlinked, or all with relink=True) event of a well in one pass.
+    """
+    eq = db.query(*_EVENT_COLUMNS).filter(Event.well_id == well_id)
+    if not relink:
+        eq = eq.filter(Event.operation_id.is_(None))
+    events = eq.all()
+    if not events:
+        return {"events": 0, "linked": 0}
+
+    operations = db.query(*_OPERATION_COLUMNS).filter(Operation.well_id == well_id).all()
+    linked = _apply(db, match_events(operations, events))
+    db.commit()
+    return {"events": len(events), "linked": linked}
+
+
+def link_fleet(db: Session, relink: bool = False, well_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Historical backfill: every well with events, one transaction per well.
+    """
+    q = db.query(Event.well_id).distinct()
+    if not relink:
+        q = q.filter(Event.operation_id.is_(None))
+    if well_ids:
+        q = q.filter(Event.well_id.in_(list(well_ids)))
+
+    totals = {"wells": 0, "events": 0, "linked": 0}
+    for (well_id,) in q.all():
+        result = link_well_events(db, well_id, relink=relink)
+        totals["wells"] += 1
+        totals["events"] += result["events"]
+        totals["linked"] += result["linked"]
+    totals["unlinked_total"] = db.query(func.count(Event.event_id)).filter(Event.operation_id.is_(None)).scalar()
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from ..database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Link events to the operations they happened in")
+    ap.add_argument("--relink", action="store_true", help="recompute links that already exist")
+    ap.add_argument("--well", action="append", help="only these wells (repeatable)")
+    args = ap.parse_args()
+
+    session = SessionLocal()
+    try:
+        print(json.dumps(link_fleet(session, relink=args.relink, well_ids=args.well), indent=2))
+    finally:
+        session.close()
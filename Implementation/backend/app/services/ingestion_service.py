@@ -1,16 +1,29 @@
 import hashlib
+import importlib
+import logging
 from datetime import date
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from ..cache import get_cache
 from ..models.well import Well
 from ..models.daily_report import DailyReport
 from ..models.operation import Operation
 from ..models.event import Event
 
-# ✅ NEW: import parser(s)
-from ..parsers.nnpc_format_a import parse_nnpc_format_a
+from .risk_services import update_risk_for_report
+from .live_updates import publish_report_delta, publish_report_replaced
+from .blob_store import put_blob
+from .timeline_service import operation_times
+from .event_linking import link_report_events
+from .offset_wells import index_report
+from .report_diff import apply_report_diff
+from .archive_service import restore_reports
+
+logger = logging.getLogger(__name__)
 
 
 def sha256_bytes(content: bytes) -> str:
@@ -24,6 +37,24 @@ def ensure_well_exists(db: Session, well_id: str) -> Well:
     return well
 
 
+def find_daily_report(db: Session, well_id: str, report_date_obj: date) -> Optional[DailyReport]:
+    return (
+        db.query(DailyReport)
+        .filter(DailyReport.well_id == well_id, DailyReport.report_date == report_date_obj)
+        .first()
+    )
+
+
+def check_no_report(db: Session, well_id: str, report_date_obj: date) -> None:
+    existing = find_daily_report(db, well_id, report_date_obj)
+    if existing:
+        raise ValueError(
+            f"A report for well '{well_id}' on {report_date_obj} already exists "
+            f"(report_id={existing.report_id}, file={existing.source_filename}). "
+            f"Upload with replace=true to apply a corrected report."
+        )
+
+
 def create_daily_report(
     db: Session,
     well_id: str,
@@ -31,12 +62,17 @@ def create_daily_report(
     filename: str,
     parser_type: str,
     file_hash: str,
+    original_blob: str = None,
+    original_size: int = None,
+    parser_version: int = None,
+    commit: bool = True,
 ) -> DailyReport:
     """
-    Creates a DailyReport row. Prevents duplicates by (well_id + report_date) OR file_hash.
-    For safety, we enforce BOTH.
+    Creates a DailyReport row. Prevents duplicates by (well_id + report_date)
+    (also enforced by the unique index ux_daily_reports_well_date).
+    commit=False only flushes (ingest commits the report with its rows).
     """
-    
+    check_no_report(db, well_id, report_date_obj)
 
     report = DailyReport(
         well_id=well_id,
@@ -44,8 +80,14 @@ def create_daily_report(
         source_filename=filename,
         parser_type=parser_type,
         file_hash=file_hash,
+        original_blob=original_blob,
+        original_size=original_size,
+        parser_version=parser_version,
     )
     db.add(report)
+    if not commit:
+        db.flush()
+        return report
     db.commit()
     db.refresh(report)
     return report
@@ -54,13 +96,43 @@ def create_daily_report(
 # ----------------------------
 # Parser Router (MVP)
 # ----------------------------
+# parser_type -> "module:function" under app.parsers (also used by benchmarks/bench_parsers.py).
+# Parser modules pull in pdfplumber/pdfminer, so they are imported on first use
+# only: API workers that never ingest never load the PDF stack.
+PARSERS = {
+    "NNPC_FORMAT_A": "nnpc_format_a:parse_nnpc_format_a",
+}
+
+
+@lru_cache(maxsize=None)
+def _parser_module(parser_type: str):
+    spec = PARSERS.get(parser_type)
+    if spec is None:
+        return None
+    return importlib.import_module(f"..parsers.{spec.split(':')[0]}", __package__)
+
+
+def get_parser(parser_type: str) -> Optional[Callable[[bytes], Dict[str, Any]]]:
+    module = _parser_module(parser_type)
+    return getattr(module, PARSERS[parser_type].split(":")[1]) if module is not None else None
+
+
+def parser_version(parser_type: str) -> Optional[int]:
+    """
+    Current version of a parser (stamped on DailyReport, drives the backfill job).
+    """
+    module = _parser_module(parser_type)
+    return getattr(module, "PARSER_VERSION", None) if module is not None else None
+
+
 def parse_pdf_report(pdf_bytes: bytes, parser_type: str) -> Dict[str, Any]:
     """
     Routes a PDF to the correct parser based on parser_type.
     """
 
-    if parser_type == "NNPC_FORMAT_A":
-        return parse_nnpc_format_a(pdf_bytes)
+    parser = get_parser(parser_type)
+    if parser is not None:
+        return parser(pdf_bytes)
 
     # Default: no parser matched yet
     return {
@@ -74,33 +146,42 @@ def insert_operations_events(
     db: Session,
     report_id: int,
     well_id: str,
-    parsed: Dict[str, Any]
+    parsed: Dict[str, Any],
+    report_date: Optional[date] = None,
+    commit: bool = True,
 ) -> Tuple[int, int]:
     """
-    Inserts Operation and Event records linked to a DailyReport.
+    Inserts Operation and Event records linked to a DailyReport. Operation
+    rows may be ParsedOperation records or dicts (staged backfill payloads).
+    report_date turns the rows' HH:MM From/To into absolute start/end times.
+    commit=False leaves the transaction open (backfill swaps rows in one transaction).
     Returns: (operations_inserted, events_inserted)
     """
     ops = parsed.get("operations", [])
     evs = parsed.get("events", [])
 
-    ops_inserted = 0
     evs_inserted = 0
 
-    # Insert operations
-    for o in ops:
-        db.add(Operation(
-            report_id=report_id,
-            well_id=well_id,
-            depth_from=o.get("depth_from"),
-            depth_to=o.get("depth_to"),
-            operation_type=o.get("operation_type"),
-            description=o.get("description"),
-            start_time=o.get("start_time"),
-            end_time=o.get("end_time"),
-            duration_hours=o.get("duration_hours"),
-            npt_hours=o.get("npt_hours"),
-        ))
-        ops_inserted += 1
+    times = operation_times(report_date, ops) if report_date else [(None, None)] * len(ops)
+
+    # Insert operations: one executemany on the table, no ORM object per row
+    if ops:
+        db.execute(insert(Operation.__table__), [
+            {
+                "report_id": report_id,
+                "well_id": well_id,
+                "depth_from": o.get("depth_from"),
+                "depth_to": o.get("depth_to"),
+                "operation_type": o.get("operation_type"),
+                "description": o.get("description"),
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration_hours": o.get("duration_hours"),
+                "npt_hours": o.get("npt_hours"),
+            }
+            for o, (start_time, end_time) in zip(ops, times)
+        ])
+    ops_inserted = len(ops)
 
     # Insert events
     for e in evs:
@@ -121,7 +202,17 @@ def insert_operations_events(
         ))
         evs_inserted += 1
 
-    db.commit()
+    db.flush()
+
+    # Events the parser could not attach get their operation by time/depth overlap
+    if evs_inserted:
+        link_report_events(db, well_id, report_id, commit=False)
+
+    # Problem intervals for offset-well lookups (replaces the report's old entries)
+    index_report(db, well_id, report_id)
+
+    if commit:
+        db.commit()
     return ops_inserted, evs_inserted
 
 
@@ -131,41 +222,88 @@ def ingest_daily_report_pdf(
     report_date_obj: date,
     filename: str,
     pdf_bytes: bytes,
-    parser_type: str = "TBD"
+    parser_type: str = "TBD",
+    replace: bool = False,
 ) -> Dict[str, Any]:
     """
     Full flow:
     - validate well exists
-    - create DailyReport (duplicate-safe)
+    - keep the original PDF in the blob store (deduplicated by hash)
     - parse (real parser routing)
+    - create DailyReport (duplicate-safe; replace=True applies a corrected
+      report for an existing day instead, see replace_daily_report)
     - insert operations/events
+    - fold the report into the precomputed risk scores
+      (report, rows and risk stats in one transaction: a failed ingest leaves
+      no report behind, so re-sending the file is never a no-op)
+    - invalidate the well's cached results
+    - push the delta to live dashboard subscribers
     """
     ensure_well_exists(db, well_id)
 
     file_hash = sha256_bytes(pdf_bytes)
 
-    report = create_daily_report(
-        db=db,
-        well_id=well_id,
-        report_date_obj=report_date_obj,
-        filename=filename,
-        parser_type=parser_type,
-        file_hash=file_hash,
-    )
+    if replace:
+        existing = find_daily_report(db, well_id, report_date_obj)
+        if existing is not None:
+            return replace_daily_report(db, existing, filename, pdf_bytes, parser_type, file_hash)
+    else:
+        # Before the blob is stored, so a rejected duplicate leaves no orphan blob
+        check_no_report(db, well_id, report_date_obj)
 
+    # Parsed before anything is stored: a file the parser rejects leaves no blob behind
     parsed = parse_pdf_report(pdf_bytes, parser_type=parser_type)
 
-    # optional: store notes on the DailyReport
-    if parsed.get("notes"):
-        report.notes = parsed["notes"]
+    # Stored before the report row so a committed report always has its original
+    blob = put_blob(pdf_bytes, file_hash=file_hash)
+
+    try:
+        report = create_daily_report(
+            db=db,
+            well_id=well_id,
+            report_date_obj=report_date_obj,
+            filename=filename,
+            parser_type=parser_type,
+            file_hash=file_hash,
+            original_blob=blob["key"],
+            original_size=blob["size"],
+            parser_version=parser_version(parser_type),
+            commit=False,
+        )
+
+        # optional: store notes on the DailyReport
+        if parsed.get("notes"):
+            report.notes = parsed["notes"]
+
+        ops_inserted, evs_inserted = insert_operations_events(
+            db=db,
+            report_id=report.report_id,
+            well_id=well_id,
+            parsed=parsed,
+            report_date=report_date_obj,
+            commit=False,
+        )
+
+        update_risk_for_report(
+            db=db,
+            well_id=well_id,
+            report_date=report_date_obj,
+            operations=parsed.get("operations", []),
+            commit=False,
+        )
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-    ops_inserted, evs_inserted = insert_operations_events(
-        db=db,
-        report_id=report.report_id,
-        well_id=well_id,
-        parsed=parsed,
-    )
+    # Cached dashboards/segments/KPIs of this well are stale now (every worker, see cache.py)
+    get_cache().invalidate_well(well_id)
+
+    # Live dashboards: push only this report's segments + refreshed KPIs
+    try:
+        publish_report_delta(db, well_id, report.report_id, report_date_obj)
+    except Exception:
+        logger.exception(f"Live update failed for well {well_id}")
 
     return {
         "report_id": report.report_id,
@@ -177,5 +315,89 @@ def ingest_daily_report_pdf(
         "events_inserted": evs_inserted,
         # helpful for debugging early
         "notes": parsed.get("notes"),
-        "debug_preview": parsed.get("raw_text_preview"),
+        # page-1 text, only when the parser's preview is enabled (NNPC_DEBUG_PREVIEW=1)
+        "debug_preview": parsed.get("debug_preview") or None,
+    }
+
+
+def replace_daily_report(
+    db: Session,
+    report: DailyReport,
+    filename: str,
+    pdf_bytes: bytes,
+    parser_type: str,
+    file_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Corrected report for an existing (well_id, report_date): the new parse is
+    diffed against the stored rows (services/report_diff.py) and only the
+    changed rows, the risk-stat delta and the report's depth-index entries are
+    written, in one transaction. Re-sending the same file is a no-op: ingest
+    commits a report together with its rows, so a stored report is complete.
+    """
+    well_id, report_date_obj = report.well_id, report.report_date
+    file_hash = file_hash or sha256_bytes(pdf_bytes)
+    version = parser_version(parser_type)
+
+    result = {
+        "report_id": report.report_id,
+        "well_id": well_id,
+        "report_date": str(report_date_obj),
+        "filename": filename,
+        "parser_type": parser_type,
+        "replaced": False,
+    }
+    if file_hash == report.file_hash and parser_type == report.parser_type and version == report.parser_version:
+        return {**result, "notes": "Identical to the stored report; nothing changed."}
+
+    blob = put_blob(pdf_bytes, file_hash=file_hash)
+    parsed = parse_pdf_report(pdf_bytes, parser_type=parser_type)
+
+    try:
+        # A correction to an archived day is diffed against its rows back in the hot tables
+        if report.archive_partition_id is not None:
+            restore_reports(db, [report], commit=False)
+        changes = apply_report_diff(db, report, parsed)
+        report.source_filename = filename
+        report.parser_type = parser_type
+        report.parser_version = version
+        report.file_hash = file_hash
+        report.original_blob = blob["key"]
+        report.original_size = blob["size"]
+        if parsed.get("notes"):
+            report.notes = parsed["notes"]
+        update_risk_for_report(
+            db=db,
+            well_id=well_id,
+            report_date=report_date_obj,
+            operations=changes["added"],
+            removed=changes["removed"],
+            commit=False,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    get_cache().invalidate_well(well_id)
+
+    # Rows clients already hold changed: live dashboards re-fetch
+    try:
+        publish_report_replaced(well_id, report.report_id)
+    except Exception:
+        logger.exception(f"Live update failed for well {well_id}")
+
+    ops, evs = changes["operations"], changes["events"]
+    return {
+        **result,
+        "replaced": True,
+        "operations_inserted": ops["insert"],
+        "operations_updated": ops["update"],
+        "operations_deleted": ops["delete"],
+        "operations_unchanged": ops["unchanged"],
+        "events_inserted": evs["insert"],
+        "events_updated": evs["update"],
+        "events_deleted": evs["delete"],
+        "events_unchanged": evs["unchanged"],
+        "notes": parsed.get("notes"),
     }
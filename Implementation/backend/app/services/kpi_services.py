@@ -0,0 +1,113 @@
+from typing import Dict, Any
+
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+
+from ..cache import get_cache
+from ..models.operation import Operation
+from ..models.report_rollup import ReportRollup
+from .risk_services import get_well_risk
+
+# ----------------------------
+# Dashboard segments + KPIs (shared by /wells/{id}/dashboard and the live stream)
+# ----------------------------
+NPT_CRITICAL_HOURS = 2
+
+
+def dashboard_level(npt_hours) -> str:
+    if npt_hours and npt_hours >= NPT_CRITICAL_HOURS:
+        return "critical"
+    if npt_hours and npt_hours > 0:
+        return "warning"
+    return "normal"
+
+
+def dashboard_segment(o: Operation) -> Dict[str, Any]:
+    return {
+        "from": o.depth_from,
+        "to": o.depth_to,
+        "level": dashboard_level(o.npt_hours),
+        "eventType": o.operation_type,
+        "operationType": o.operation_type,
+        "whyItMatters": o.description,
+        "nptHours": o.npt_hours,
+        "recordedAt": None,
+    }
+
+
+def rollup_segment(r: ReportRollup) -> Dict[str, Any]:
+    """
+    Dashboard segment for one rollup row (an archived day's operations of one
+    type in one depth bin); level as for its worst operation.
+    """
+    level = "critical" if r.critical_count else "warning" if r.npt_count else "normal"
+    kind = r.kind or None
+    return {
+        "from": r.depth_from,
+        "to": r.depth_to,
+        "level": level,
+        "eventType": kind,
+        "operationType": kind,
+        "whyItMatters": f"{r.row_count} archived operation{'s' if r.row_count != 1 else ''}, {round(r.hours, 2)} h",
+        "nptHours": round(r.npt_hours, 2),
+        "recordedAt": str(r.report_date),
+    }
+
+
+def compute_well_kpis(db: Session, well_id: str) -> Dict[str, Any]:
+    """
+    KPI block for a well in one aggregate query (served by ix_operations_segment_cover),
+    plus one over the rollups of its archived reports.
+    """
+    total_npt, depth_max, count, critical, high_risk = (
+        db.query(
+            func.coalesce(func.sum(Operation.npt_hours), 0),
+            func.coalesce(func.max(Operation.depth_to), 0),
+            func.count(),
+            func.coalesce(func.sum(case((Operation.npt_hours >= NPT_CRITICAL_HOURS, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Operation.npt_hours > 0, 1), else_=0)), 0),
+        )
+        .filter(Operation.well_id == well_id)
+        .one()
+    )
+
+    archived = (
+        db.query(
+            func.coalesce(func.sum(ReportRollup.npt_hours), 0),
+            func.coalesce(func.max(ReportRollup.depth_to), 0),
+            func.coalesce(func.sum(ReportRollup.row_count), 0),
+            func.coalesce(func.sum(ReportRollup.critical_count), 0),
+            func.coalesce(func.sum(ReportRollup.npt_count), 0),
+        )
+        .filter(ReportRollup.well_id == well_id, ReportRollup.source == "operation")
+        .one()
+    )
+    if archived[2]:
+        total_npt += archived[0]
+        depth_max = max(depth_max, archived[1])
+        count += archived[2]
+        critical += archived[3]
+        high_risk += archived[4]
+
+    # Maintenance risk: precomputed at ingest (falls back to the NPT rule for wells not scored yet)
+    risk = get_well_risk(db, well_id)
+    if risk is not None:
+        maintenance_risk = risk.risk_level
+    else:
+        maintenance_risk = "Low" if total_npt == 0 else "Medium" if total_npt < 5 else "High"
+
+    return {
+        "depthMax": depth_max,
+        "nptHours": round(total_npt, 2),
+        "eventCount": count,
+        "criticalEvents": critical,
+        "highRiskZones": high_risk,
+        "maintenanceRisk": maintenance_risk,
+    }
+
+
+def cached_well_kpis(db: Session, well_id: str) -> Dict[str, Any]:
+    """
+    compute_well_kpis() through the result cache (invalidated on ingest).
+    """
+    return get_cache().get_or_compute(well_id, "kpis", lambda: compute_well_kpis(db, well_id))
@@ -0,0 +1,302 @@
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..cache import get_cache
+from ..models.operation import Operation
+from .kpi_services import dashboard_segment, cached_well_kpis
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Live dashboard fan-out (Server-Sent Events)
+# ----------------------------
+# One asyncio.Queue per connected client, grouped by well. Idle subscribers
+# cost a queue and a suspended coroutine (no thread), so a single worker can
+# hold hundreds of open streams. Ingestion publishes once per committed
+# report; the payload is serialized once and shared by every subscriber.
+#
+# With several workers a report is ingested on one of them and its clients
+# may be connected to any other: when the cache has a shared tier (CACHE_URL,
+# see cache.py) events go through its Redis pub/sub on LIVE_CHANNEL with ids
+# from a per-well counter on the server, and each worker fans out what it
+# receives to its own clients. Without one the hub is process-local.
+SUBSCRIBER_QUEUE_SIZE = 32     # a client further behind than this gets a "resync"
+REPLAY_BUFFER_SIZE = 50        # events kept per well for Last-Event-ID reconnects
+HEARTBEAT_SECONDS = 15         # comment line that keeps proxies from closing idle streams
+RETRY_MILLISECONDS = 3000      # EventSource reconnect delay
+WATCH_TTL_SECONDS = 3600       # a well stays "watched" (deltas published) this long after its last client
+
+LIVE_PREFIX = "drilling:live:"
+LIVE_CHANNEL = "drilling:live:events"
+
+
+def format_sse(event: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    for line in data.splitlines() or [""]:
+        lines.append(f"data: {line}")
+    return "\n".join(lines) + "\n\n"
+
+
+RESYNC = format_sse("resync", "{}")
+
+
+class LiveHub:
+    """
+    Per-well pub/sub. Subscribing/reading happens on the event loop;
+    publish() may be called from any thread (sync endpoints run in the threadpool).
+    """
+
+    def __init__(self, shared: Optional[Callable[[], Any]] = None) -> None:
+        """
+        shared: returns the redis-py compatible client events go through (None:
+        this process only); by default the shared tier of the result cache.
+        """
+        self._shared = shared or (lambda: get_cache().shared)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._history: Dict[str, Deque[Tuple[int, str]]] = {}
+        self._next_id: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()  # local ids: assign and deliver in order
+        self._listener = None
+        self._listener_client = None
+
+    def subscriber_count(self, well_id: Optional[str] = None) -> int:
+        if well_id is not None:
+            return len(self._subscribers.get(well_id, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    def has_subscribers(self, well_id: str) -> bool:
+        return bool(self._subscribers.get(well_id))
+
+    def is_watched(self, well_id: str) -> bool:
+        """
+        True once a client has subscribed to the well, in this process or (with
+        a shared tier) in any worker within WATCH_TTL_SECONDS: its events are
+        buffered even while every client is between reconnects.
+        """
+        if well_id in self._history or self.has_subscribers(well_id):
+            return True
+        shared = self._shared()
+        if shared is None:
+            return False
+        try:
+            return bool(shared.exists(f"{LIVE_PREFIX}watched:{well_id}"))
+        except Exception as e:
+            logger.warning(f"Shared live state unavailable ({e}); publishing anyway")
+            return True
+
+    # ----------------------------
+    # Cross-worker delivery
+    # ----------------------------
+    def watch(self, well_id: str) -> None:
+        """
+        Blocking (run it off the event loop): starts this worker's listener and
+        marks the well watched for every worker. Refreshed on each heartbeat.
+        """
+        shared = self._shared()
+        if shared is None:
+            return
+        try:
+            self._listen(shared)
+            shared.set(f"{LIVE_PREFIX}watched:{well_id}", 1, ex=WATCH_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Shared live state unavailable for {well_id}: {e}")
+
+    def _listen(self, shared) -> None:
+        with self._lock:
+            if self._listener_client is shared:
+                return
+            if self._listener is not None:
+                self._listener.stop()
+            pubsub = shared.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{LIVE_CHANNEL: self._on_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_listener_error
+            )
+            self._listener_client = shared
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        item = json.loads(message["data"])
+        self._deliver(item["wellId"], item["id"], format_sse(item["event"], item["data"], item["id"]))
+
+    def _on_listener_error(self, exc, pubsub, thread) -> None:
+        # Events may have been missed: the next one of each well is seen as a gap (resync)
+        logger.warning(f"Live update subscriber error: {exc}")
+        time.sleep(1.0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+            self._listener = self._listener_client = None
+
+    # ----------------------------
+    # Subscribers
+    # ----------------------------
+    def subscribe(self, well_id: str, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """
+        Registers a client queue. Events after last_event_id still in the replay
+        buffer are queued first; if the gap is too old (or the id is from before
+        a restart) a "resync" is queued instead.
+        """
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+        with self._lock:
+            history = list(self._history.setdefault(well_id, deque(maxlen=REPLAY_BUFFER_SIZE)))
+            latest = self._next_id.get(well_id, 0)
+        if last_event_id is not None:
+            missed = [item for item in history if item[0] > last_event_id]
+            oldest = history[0][0] if history else latest + 1
+            if last_event_id > latest or last_event_id < oldest - 1:
+                queue.put_nowait(RESYNC)
+            else:
+                for _, message in missed[-SUBSCRIBER_QUEUE_SIZE:]:
+                    queue.put_nowait(message)
+
+        self._subscribers.setdefault(well_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, well_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(well_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[well_id]
+
+    # ----------------------------
+    # Publishing
+    # ----------------------------
+    def publish(self, well_id: str, event: str, payload: Dict[str, Any]) -> int:
+        """
+        Assigns the next event id for the well and sends the event to every
+        worker (just this one without a shared tier), which stores it for
+        replay and fans it out. Returns the event id.
+        """
+        data = json.dumps(payload, default=str, separators=(",", ":"))
+        shared = self._shared()
+        if shared is not None:
+            try:
+                event_id = int(shared.incr(f"{LIVE_PREFIX}seq:{well_id}"))
+                item = {"wellId": well_id, "id": event_id, "event": event, "data": data}
+                shared.publish(LIVE_CHANNEL, json.dumps(item, separators=(",", ":")))
+                return event_id
+            except Exception as e:
+                logger.warning(f"Shared live publish failed for {well_id} ({e}); local clients only")
+
+        with self._publish_lock:
+            event_id = self._next_id.get(well_id, 0) + 1
+            self._deliver(well_id, event_id, format_sse(event, data, event_id))
+        return event_id
+
+    def _deliver(self, well_id: str, event_id: int, message: str) -> None:
+        """
+        Stores an event for replay and fans it out. An id that does not follow
+        the last one (missed or reordered messages) drops the replay buffer and
+        sends "resync" first, so no client silently skips an event.
+        """
+        with self._lock:
+            latest = self._next_id.get(well_id)
+            history = self._history.setdefault(well_id, deque(maxlen=REPLAY_BUFFER_SIZE))
+            gap = latest is not None and event_id != latest + 1
+            if gap:
+                history.clear()
+            history.append((event_id, message))
+            self._next_id[well_id] = max(event_id, latest or 0)
+
+        messages = [RESYNC, message] if gap else [message]
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(well_id, messages)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, well_id, messages)
+
+    def _fan_out(self, well_id: str, messages) -> None:
+        for queue in list(self._subscribers.get(well_id, ())):
+            try:
+                for message in messages:
+                    queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and tell it to re-fetch the dashboard
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+
+hub = LiveHub()
+
+
+async def event_stream(well_id: str, last_event_id: Optional[int] = None):
+    """
+    Async generator for a StreamingResponse: replayed/new events plus heartbeats.
+    """
+    queue = hub.subscribe(well_id, last_event_id)
+    loop = asyncio.get_running_loop()
+    watch = functools.partial(hub.watch, well_id)
+    try:
+        await loop.run_in_executor(None, watch)
+        yield f"retry: {RETRY_MILLISECONDS}\n: connected to {well_id}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(None, watch)
+                yield ": keep-alive\n\n"
+                continue
+            yield message
+    finally:
+        hub.unsubscribe(well_id, queue)
+
+
+def publish_report_delta(db: Session, well_id: str, report_id: int, report_date) -> Optional[int]:
+    """
+    Pushes the segments of a newly committed report plus the well's updated
+    KPIs. Published (and buffered for Last-Event-ID replay) whenever a client
+    has watched the well on any worker, connected or not; no queries are run
+    for wells nobody has subscribed to.
+    """
+    if not hub.is_watched(well_id):
+        return None
+
+    ops = (
+        db.query(Operation)
+        .filter(Operation.well_id == well_id, Operation.report_id == report_id)
+        .order_by(Operation.depth_from.asc())
+        .all()
+    )
+    payload = {
+        "wellId": well_id,
+        "reportId": report_id,
+        "reportDate": str(report_date),
+        "segments": [dashboard_segment(o) for o in ops],
+        "kpis": cached_well_kpis(db, well_id),
+    }
+    return hub.publish(well_id, "report", payload)
+
+
+def publish_report_replaced(well_id: str, report_id: int) -> int:
+    """
+    A corrected report changed segments clients already hold: they re-fetch
+    the dashboard ("resync") instead of appending a delta. Always published,
+    so a client reconnecting after the correction replays it.
+    """
+    return hub.publish(well_id, "resync", {"wellId": well_id, "reportId": report_id})
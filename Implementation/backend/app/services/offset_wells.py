@@ -0,0 +1,294 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.depth_bucket import DepthBucket
+from ..models.event import Event
+from ..models.operation import Operation
+from ..models.well import Well
+from .archive_service import archived_rows
+from .risk_services import classify_operation
+
+# ----------------------------
+# Offset-well depth index
+# ----------------------------
+# "What went wrong on the neighbouring wells around this depth?" Problem
+# intervals (critical/warning operations, any NPT, flagged events) are
+# posted into fixed-size depth buckets per location, so a lookup is one
+# primary-key range scan (location, bucket BETWEEN ...) over the buckets the
+# window covers, instead of reading every operation of every nearby well.
+# An interval is listed in every bucket it touches; lookups de-duplicate.
+BUCKET_FT = 100.0
+# Longer intervals are depth typos (or a whole-section summary row), not a problem zone
+MAX_BUCKETS_PER_INTERVAL = 200
+
+MAX_OFFSET_INTERVALS = 1000
+LEVEL_ORDER = {"critical": 0, "warning": 1}
+
+INSERT_CHUNK_ROWS = 10_000
+
+
+def bucket_of(depth: float) -> int:
+    return int(depth // BUCKET_FT)
+
+
+def _span(depth_from: Optional[float], depth_to: Optional[float]):
+    values = [v for v in (depth_from, depth_to) if v is not None]
+    return (min(values), max(values)) if values else None
+
+
+def operation_level(description, duration_hours, npt_hours) -> Optional[str]:
+    level = classify_operation(description, duration_hours, npt_hours)
+    if level == "normal" and (npt_hours or 0) > 0:
+        return "warning"
+    return level if level in LEVEL_ORDER else None
+
+
+def event_level(severity: Optional[str], npt_hours: Optional[float]) -> Optional[str]:
+    level = (severity or "").lower()
+    if level in LEVEL_ORDER:
+        return level
+    return "warning" if (npt_hours or 0) > 0 else None
+
+
+def _entries(location: str, well_id: str, source: str, source_id: int, report_id: int,
+             span, level: str, kind: Optional[str], npt_hours: Optional[float]) -> Iterable[dict]:
+    first, last = bucket_of(span[0]), bucket_of(span[1])
+    if last - first >= MAX_BUCKETS_PER_INTERVAL:
+        return ()
+    return (
+        {
+            "location": location, "bucket": b, "well_id": well_id, "source": source,
+            "source_id": source_id, "report_id": report_id, "depth_from": span[0],
+            "depth_to": span[1], "level": level, "kind": kind, "npt_hours": npt_hours,
+        }
+        for b in range(first, last + 1)
+    )
+
+
+def index_rows(db, well_id: str, location: str, report_id: Optional[int] = None) -> List[dict]:
+    """
+    Index rows for a well's problem intervals (one report's, with report_id).
+    Uses Core selects so it runs on a Session or a bare Connection (migrations).
+    """
+    ops = select(
+        Operation.operation_id, Operation.report_id, Operation.depth_from, Operation.depth_to,
+        Operation.operation_type, Operation.description, Operation.duration_hours, Operation.npt_hours,
+    ).where(Operation.well_id == well_id)
+    evs = select(
+        Event.event_id, Event.report_id, Event.depth_from, Event.depth_to,
+        Event.event_type, Event.severity, Event.npt_hours,
+    ).where(Event.well_id == well_id)
+    if report_id is not None:
+        ops = ops.where(Operation.report_id == report_id)
+        evs = evs.where(Event.report_id == report_id)
+
+    rows: List[dict] = []
+    for o in db.execute(ops):
+        span = _span(o.depth_from, o.depth_to)
+        level = operation_level(o.description, o.duration_hours, o.npt_hours)
+        if span and level:
+            rows.extend(_entries(location, well_id, "operation", o.operation_id, o.report_id,
+                                 span, level, o.operation_type, o.npt_hours))
+    for e in db.execute(evs):
+        span = _span(e.depth_from, e.depth_to)
+        level = event_level(e.severity, e.npt_hours)
+        if span and level:
+            rows.extend(_entries(location, well_id, "event", e.event_id, e.report_id,
+                                 span, level, e.event_type, e.npt_hours))
+    return rows
+
+
+def _insert(db, rows: List[dict]) -> None:
+    # Core insert on the table: one executemany, not ORM batches split on NULL columns
+    for i in range(0, len(rows), INSERT_CHUNK_ROWS):
+        db.execute(insert(DepthBucket.__table__), rows[i:i + INSERT_CHUNK_ROWS])
+
+
+def index_report(db: Session, well_id: str, report_id: int) -> int:
+    """
+    Replaces one report's index rows (ingest, backfill swap). Call after the
+    report's operations/events are flushed; the caller commits.
+    Wells without a location have no offset wells and are not indexed.
+    """
+    db.execute(delete(DepthBucket).where(DepthBucket.report_id == report_id))
+    location = db.execute(select(Well.location).where(Well.well_id == well_id)).scalar()
+    if not location:
+        return 0
+    rows = index_rows(db, well_id, location, report_id)
+    _insert(db, rows)
+    return len(rows)
+
+
+def rebuild_depth_index(db, well_ids: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """
+    Rebuilds the index for every well (or the given ones). The caller commits.
+    """
+    q = select(Well.well_id, Well.location)
+    if well_ids:
+        q = q.where(Well.well_id.in_(list(well_ids)))
+    wells = db.execute(q).all()
+
+    totals = {"wells": 0, "entries": 0}
+    for well_id, location in wells:
+        # Reports with rows in the hot tables are re-indexed; archived ones (no hot rows) keep their entries
+        hot_reports = select(Operation.report_id).where(Operation.well_id == well_id).union(
+            select(Event.report_id).where(Event.well_id == well_id)
+        )
+        db.execute(delete(DepthBucket).where(DepthBucket.well_id == well_id, DepthBucket.report_id.in_(hot_reports)))
+        if not location:
+            continue
+        rows = index_rows(db, well_id, location)
+        _insert(db, rows)
+        totals["wells"] += 1
+        totals["entries"] += len(rows)
+    return totals
+
+
+# ----------------------------
+# Lookup
+# ----------------------------
+def offset_query(db: Session, location: str, well_id: str, depth_from: float, depth_to: float):
+    """
+    Index entries of the location's other wells in the buckets the window
+    covers: a primary-key range scan, no operations/events rows read.
+    """
+    return (
+        db.query(
+            DepthBucket.well_id, DepthBucket.source, DepthBucket.source_id, DepthBucket.report_id,
+            DepthBucket.depth_from, DepthBucket.depth_to, DepthBucket.level, DepthBucket.kind,
+            DepthBucket.npt_hours,
+        )
+        .filter(DepthBucket.location == location)
+        .filter(DepthBucket.bucket.between(bucket_of(depth_from), bucket_of(depth_to)))
+        .filter(DepthBucket.well_id != well_id)
+    )
+
+
+def offset_intervals(
+    db: Session,
+    well_id: str,
+    depth_from: float,
+    depth_to: float,
+    limit: int = 100,
+) -> Optional[Dict[str, Any]]:
+    """
+    Problem intervals of the other wells in the same location that overlap
+    [depth_from, depth_to], ranked by overlap (then severity, then NPT), with
+    a per-well summary. None when the well does not exist; ValueError for an
+    inverted window or a well without a location.
+    """
+    well = db.query(Well.well_id, Well.location).filter(Well.well_id == well_id).first()
+    if well is None:
+        return None
+    if depth_to < depth_from:
+        raise ValueError("depth_to must not be shallower than depth_from")
+    if not well.location:
+        raise ValueError(f"Well '{well_id}' has no location; offset wells are matched by location")
+
+    limit = max(1, min(limit, MAX_OFFSET_INTERVALS))
+    rows = offset_query(db, well.location, well_id, depth_from, depth_to).all()
+
+    intervals: Dict[tuple, dict] = {}
+    for r in rows:
+        key = (r.source, r.source_id)
+        if key in intervals:
+            continue
+        overlap = min(r.depth_to, depth_to) - max(r.depth_from, depth_from)
+        if overlap < 0:
+            continue  # same bucket, outside the window
+        intervals[key] = {
+            "wellId": r.well_id,
+            "source": r.source,
+            "id": r.source_id,
+            "reportId": r.report_id,
+            "depthFrom": r.depth_from,
+            "depthTo": r.depth_to,
+            "overlapFt": round(overlap, 1),
+            "level": r.level,
+            "type": r.kind,
+            "nptHours": r.npt_hours,
+        }
+
+    wells: Dict[str, dict] = defaultdict(lambda: {"intervals": 0, "overlapFt": 0.0, "nptHours": 0.0,
+                                                  "critical": 0, "warning": 0})
+    for item in intervals.values():
+        w = wells[item["wellId"]]
+        w["intervals"] += 1
+        w["overlapFt"] += item["overlapFt"]
+        w["nptHours"] += item["nptHours"] or 0.0
+        w[item["level"]] += 1
+
+    ranked = sorted(
+        intervals.values(),
+        key=lambda i: (-i["overlapFt"], LEVEL_ORDER[i["level"]], -(i["nptHours"] or 0.0), i["wellId"], i["id"]),
+    )[:limit]
+    _attach_descriptions(db, ranked)
+
+    return {
+        "wellId": well_id,
+        "location": well.location,
+        "depthFrom": depth_from,
+        "depthTo": depth_to,
+        "bucketFt": BUCKET_FT,
+        "wells": sorted(
+            ({"wellId": w, **s, "overlapFt": round(s["overlapFt"], 1), "nptHours": round(s["nptHours"], 2)}
+             for w, s in wells.items()),
+            key=lambda s: (-s["overlapFt"], -s["critical"], -s["nptHours"], s["wellId"]),
+        ),
+        "count": len(intervals),
+        "truncated": len(intervals) > limit,
+        "intervals": ranked,
+    }
+
+
+def _attach_descriptions(db: Session, items: List[dict]) -> None:
+    """
+    Text for the returned intervals only: primary-key lookups, not part of the index.
+    """
+    op_ids = [i["id"] for i in items if i["source"] == "operation"]
+    ev_ids = [i["id"] for i in items if i["source"] == "event"]
+    text: Dict[tuple, Optional[str]] = {}
+    if op_ids:
+        for oid, desc in db.query(Operation.operation_id, Operation.description).filter(Operation.operation_id.in_(op_ids)):
+            text[("operation", oid)] = desc
+    if ev_ids:
+        for eid, desc in db.query(Event.event_id, Event.event_description).filter(Event.event_id.in_(ev_ids)):
+            text[("event", eid)] = desc
+
+    # Intervals of archived reports: their partitions, read on demand
+    missing = [i for i in items if (i["source"], i["id"]) not in text]
+    if missing:
+        wells = sorted({i["wellId"] for i in missing})
+        for source, model, id_column, column in (
+            ("operation", Operation, Operation.operation_id, Operation.description),
+            ("event", Event, Event.event_id, Event.event_description),
+        ):
+            ids = [i["id"] for i in missing if i["source"] == source]
+            if ids:
+                for rid, desc in archived_rows(db, model, [id_column, column], well_ids=wells, where=[id_column.in_(ids)]):
+                    text[(source, rid)] = desc
+
+    for item in items:
+        item["description"] = text.get((item["source"], item["id"]))
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from ..database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Rebuild the offset-well depth index")
+    ap.add_argument("--well", action="append", help="only these wells (repeatable)")
+    args = ap.parse_args()
+
+    session = SessionLocal()
+    try:
+        result = rebuild_depth_index(session, well_ids=args.well)
+        session.commit()
+        print(json.dumps(result, indent=2))
+    finally:
+        session.close()
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..cache import get_cache
+from ..models.daily_report import DailyReport
+from ..models.operation import Operation
+from ..models.well import Well
+from .archive_service import archived_rows
+
+# ----------------------------
+# Drilling progress (depth vs time) and ROP curves
+# ----------------------------
+# Computed per well over columnar arrays of its operations, in time order:
+#   - elapsed time: start_time when the row has one, otherwise the report day
+#     plus the durations of the report's earlier rows (rows parsed before
+#     absolute times existed)
+#   - bit depth: running maximum of depth_to (re-logged or reamed intervals
+#     do not move it back up)
+#   - footage: how much an operation deepened the hole; ROP is footage over
+#     the hours that made footage (on-bottom ROP, flat time excluded)
+#   - flat time: consecutive operations that made no footage
+# Results are cached per well data version and point count (see cache.py).
+DEFAULT_POINTS = 500
+MIN_POINTS = 10
+MAX_POINTS = 5000
+MAX_PROGRESS_WELLS = 100
+
+# Shorter non-progress spans (connections, surveys) count in the totals but are not listed
+FLAT_MIN_HOURS = 1.0
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def progress_query(well_id: str):
+    return (
+        select(
+            Operation.operation_id, DailyReport.report_date, Operation.start_time,
+            Operation.duration_hours, Operation.depth_from, Operation.depth_to, Operation.npt_hours,
+        )
+        .join(DailyReport, DailyReport.report_id == Operation.report_id)
+        .where(Operation.well_id == well_id)
+    )
+
+
+def load_well_columns(db: Session, well_id: str) -> Dict[str, np.ndarray]:
+    """
+    A well's operations as arrays, sorted by (report day, start time, operation_id).
+    """
+    query = progress_query(well_id)
+    rows = db.execute(query).all()
+    # Archived reports: the same columns, from their partitions (the sort below interleaves them)
+    rows += archived_rows(db, Operation, query.selected_columns, well_ids=[well_id])
+    if not rows:
+        return {}
+
+    op_id, day, start, dur, d_from, d_to, npt = zip(*rows)
+    cols = {
+        "operation_id": np.array(op_id, dtype=np.int64),
+        "day": np.array([d.toordinal() for d in day], dtype=np.int64),
+        # hours since the epoch, nan when the row has no absolute time
+        "start": np.array([(s - _EPOCH) / timedelta(hours=1) if s else np.nan for s in start], dtype=np.float64),
+        "duration": np.array(dur, dtype=np.float64),   # None -> nan
+        "depth_from": np.array(d_from, dtype=np.float64),
+        "depth_to": np.array(d_to, dtype=np.float64),
+        "npt": np.array(npt, dtype=np.float64),
+    }
+    order = np.lexsort((cols["operation_id"], np.nan_to_num(cols["start"]), cols["day"]))
+    return {k: v[order] for k, v in cols.items()}
+
+
+def _start_hours(day: np.ndarray, start: np.ndarray, duration: np.ndarray) -> np.ndarray:
+    """
+    Absolute start (hours since the epoch) per row; rows without a start_time
+    are laid end to end from midnight of their report day.
+    """
+    day_hours = (day - _EPOCH.toordinal()) * 24.0
+    ends = np.cumsum(duration)
+    first_of_day = np.r_[True, day[1:] != day[:-1]]
+    # cumulative duration before each row, restarted at every new report day
+    before_day = np.maximum.accumulate(np.where(first_of_day, ends - duration, 0.0))
+    fallback = day_hours + (ends - duration - before_day)
+    return np.where(np.isnan(start), fallback, start)
+
+
+def _runs(mask: np.ndarray):
+    """
+    (first, last) index of each run of True values.
+    """
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+
+def _values(a: np.ndarray, decimals: int = 2) -> List[Optional[float]]:
+    # JSON has no NaN
+    return [None if v != v else v for v in np.round(a, decimals).tolist()]
+
+
+def _sample_indices(n: int, points: int) -> np.ndarray:
+    if n <= points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, points).round().astype(np.int64))
+
+
+def compute_progress(cols: Dict[str, np.ndarray], points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+    """
+    Progress curve, binned ROP, flat-time spans and totals for one well's
+    columns (load_well_columns), downsampled to at most `points` points per series.
+    """
+    if not cols:
+        return {
+            "operations": 0, "startTime": None,
+            "summary": {"elapsedHours": 0.0, "footage": 0.0, "drillingHours": 0.0, "avgRop": None,
+                        "flatHours": 0.0, "flatShare": None, "nptHours": 0.0, "depthStart": None, "depthEnd": None},
+            "curve": {"elapsedHours": [], "depth": []},
+            "rop": {"elapsedHours": [], "depth": [], "ftPerHour": []},
+            "flatTime": [],
+        }
+
+    duration = np.clip(np.nan_to_num(cols["duration"]), 0.0, None)
+    start = _start_hours(cols["day"], cols["start"], duration)
+    t0 = start[0]
+    elapsed_end = start + duration - t0
+
+    # Bit depth: running max of depth_to (fmax skips nan), starting at the first depth seen
+    first_depth = np.fmin(cols["depth_from"], cols["depth_to"])
+    valid = ~np.isnan(first_depth)
+    depth_start = float(first_depth[valid][0]) if valid.any() else np.nan
+    bit_depth = np.fmax.accumulate(np.fmax(cols["depth_to"], cols["depth_from"]))
+    bit_depth = np.fmax(bit_depth, depth_start)
+    footage = np.nan_to_num(np.diff(bit_depth, prepend=depth_start))
+
+    drilling = footage > 0
+    drilling_hours = np.where(drilling, duration, 0.0)
+    flat = ~drilling & (duration > 0)
+
+    # Curve: (0, start depth) then the bit depth at the end of each operation
+    curve_t = np.r_[0.0, elapsed_end]
+    curve_d = np.r_[depth_start, bit_depth]
+    keep = _sample_indices(len(curve_t), points)
+
+    # ROP per bin of consecutive operations: footage / on-bottom hours (nan when no drilling)
+    bins = np.array_split(np.arange(len(duration)), min(points, len(duration)))
+    bin_starts = np.array([b[0] for b in bins], dtype=np.int64)
+    bin_ends = np.array([b[-1] for b in bins], dtype=np.int64)
+    bin_footage = np.add.reduceat(footage, bin_starts)
+    bin_hours = np.add.reduceat(drilling_hours, bin_starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bin_rop = np.where(bin_hours > 0, bin_footage / bin_hours, np.nan)
+
+    # Flat-time spans from runs of non-progress operations
+    npt = np.nan_to_num(cols["npt"])
+    flat_spans = []
+    firsts, lasts = _runs(flat)
+    if len(firsts):
+        ends = np.cumsum(duration)
+        hours = ends[lasts] - ends[firsts] + duration[firsts]
+        npt_ends = np.cumsum(npt)
+        span_npt = npt_ends[lasts] - npt_ends[firsts] + npt[firsts]
+        listed = hours >= FLAT_MIN_HOURS
+        for f, l, h, n in zip(firsts[listed], lasts[listed], hours[listed], span_npt[listed]):
+            flat_spans.append({
+                "startHours": round(float(start[f] - t0), 2),
+                "endHours": round(float(elapsed_end[l]), 2),
+                "hours": round(float(h), 2),
+                "depth": None if np.isnan(bit_depth[l]) else round(float(bit_depth[l]), 1),
+                "nptHours": round(float(n), 2),
+                "operations": int(l - f + 1),
+            })
+
+    total_footage = float(footage.sum())
+    total_drilling = float(drilling_hours.sum())
+    flat_hours = float(duration[flat].sum())
+    total_hours = float(duration.sum())
+    return {
+        "operations": int(len(duration)),
+        "startTime": (_EPOCH + timedelta(hours=float(t0))).isoformat(),
+        "summary": {
+            "elapsedHours": round(float(elapsed_end.max()), 2),
+            "footage": round(total_footage, 1),
+            "drillingHours": round(total_drilling, 2),
+            "avgRop": round(total_footage / total_drilling, 2) if total_drilling else None,
+            "flatHours": round(flat_hours, 2),
+            "flatShare": round(flat_hours / total_hours, 3) if total_hours else None,
+            "nptHours": round(float(npt.sum()), 2),
+            "depthStart": None if np.isnan(depth_start) else round(depth_start, 1),
+            "depthEnd": None if np.isnan(bit_depth[-1]) else round(float(bit_depth[-1]), 1),
+        },
+        "curve": {"elapsedHours": _values(curve_t[keep]), "depth": _values(curve_d[keep], 1)},
+        "rop": {
+            "elapsedHours": _values(elapsed_end[bin_ends]),
+            "depth": _values(bit_depth[bin_ends], 1),
+            "ftPerHour": _values(bin_rop),
+        },
+        "flatTime": flat_spans,
+    }
+
+
+def well_progress(db: Session, well_id: str, points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+    """
+    compute_progress() for one well through the result cache (invalidated on ingest).
+    """
+    return get_cache().get_or_compute(
+        well_id, "progress", lambda: compute_progress(load_well_columns(db, well_id), points), params=(points,)
+    )
+
+
+def fleet_progress(db: Session, well_ids: Sequence[str], points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+    """
+    Progress curves of several wells for side-by-side comparison. Unknown
+    wells are listed under "missing". Raises ValueError for an empty or
+    oversized well list.
+    """
+    well_ids = list(dict.fromkeys(well_ids))
+    if not well_ids:
+        raise ValueError("At least one well_id is required")
+    if len(well_ids) > MAX_PROGRESS_WELLS:
+        raise ValueError(f"At most {MAX_PROGRESS_WELLS} wells per request")
+    points = max(MIN_POINTS, min(points, MAX_POINTS))
+
+    known = {w for (w,) in db.query(Well.well_id).filter(Well.well_id.in_(well_ids))}
+    return {
+        "points": points,
+        "wells": [{"wellId": w, **well_progress(db, w, points)} for w in well_ids if w in known],
+        "missing": [w for w in well_ids if w not in known],
+    }
@@ -0,0 +1,148 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy.orm import Session
+
+from ..models.daily_report import DailyReport
+from ..models.event import Event
+from ..models.operation import Operation
+from .event_linking import link_report_events
+from .offset_wells import index_report
+from .timeline_service import operation_times
+
+# ----------------------------
+# Corrected reports: row-level diff
+# ----------------------------
+# A corrected DDR for the same (well, day) mostly repeats the original, so
+# its parse is matched against the stored rows instead of replacing them.
+# Rows are keyed by the time slot they occupy (an operation's From/To, an
+# event's time and type); rows without times are keyed by their position
+# among the untimed rows, and repeated keys are numbered in report order.
+# Matched rows whose fields differ are updated in place (ids, event links and
+# FTS entries survive), unmatched stored rows are deleted and unmatched new
+# rows inserted.
+OPERATION_FIELDS = (
+    "depth_from", "depth_to", "operation_type", "description",
+    "start_time", "end_time", "duration_hours", "npt_hours",
+)
+EVENT_FIELDS = (
+    "depth_from", "depth_to", "event_type", "event_description", "event_duration_hours",
+    "npt_hours", "severity", "equipment", "actions_taken", "recorded_at",
+)
+# Moving an operation in time or depth can change which events belong to it
+_LINK_FIELDS = ("start_time", "end_time", "depth_from", "depth_to")
+
+
+def operation_key(row: Dict[str, Any]) -> tuple:
+    return (row["start_time"], row["end_time"])
+
+
+def event_key(row: Dict[str, Any]) -> tuple:
+    return (row["recorded_at"], row["event_type"])
+
+
+def _keyed(rows: Sequence[Dict[str, Any]], key: Callable[[Dict[str, Any]], tuple]) -> Dict[tuple, int]:
+    """
+    (key, occurrence) -> index into rows.
+    """
+    seen: Counter = Counter()
+    out = {}
+    for i, row in enumerate(rows):
+        k = key(row)
+        out[(k, seen[k])] = i
+        seen[k] += 1
+    return out
+
+
+def diff_rows(
+    old: Sequence[Dict[str, Any]],
+    new: Sequence[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], tuple],
+    fields: Sequence[str],
+) -> Dict[str, List]:
+    """
+    Minimal changes turning old into new: {"insert": [new index], "update":
+    [(old index, new index)], "delete": [old index], "unchanged": [(old, new)]}.
+    """
+    old_keys, new_keys = _keyed(old, key), _keyed(new, key)
+    plan: Dict[str, List] = {"insert": [], "update": [], "delete": [], "unchanged": []}
+    for k, j in new_keys.items():
+        i = old_keys.get(k)
+        if i is None:
+            plan["insert"].append(j)
+        elif any(old[i][f] != new[j][f] for f in fields):
+            plan["update"].append((i, j))
+        else:
+            plan["unchanged"].append((i, j))
+    plan["delete"] = sorted(i for k, i in old_keys.items() if k not in new_keys)
+    return plan
+
+
+def _as_dict(obj, fields: Sequence[str]) -> Dict[str, Any]:
+    return {f: getattr(obj, f) for f in fields}
+
+
+def apply_report_diff(db: Session, report: DailyReport, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Applies a corrected parse of `report` as inserts/updates/deletes, relinks
+    the events the changes affect and re-indexes the report's depth buckets.
+    Flushes but does not commit. Returns counts plus the operations removed
+    and added (old and new values of updated rows), for the risk-stat delta.
+    """
+    report_id, well_id = report.report_id, report.well_id
+    ops = parsed.get("operations", [])
+    times = operation_times(report.report_date, ops)
+    new_ops = [
+        {**{f: o.get(f) for f in OPERATION_FIELDS}, "start_time": start, "end_time": end}
+        for o, (start, end) in zip(ops, times)
+    ]
+    new_events = [{f: e.get(f) for f in EVENT_FIELDS} for e in parsed.get("events", [])]
+
+    old_op_rows = db.query(Operation).filter(Operation.report_id == report_id).order_by(Operation.operation_id).all()
+    old_event_rows = db.query(Event).filter(Event.report_id == report_id).order_by(Event.event_id).all()
+    old_ops = [_as_dict(o, OPERATION_FIELDS) for o in old_op_rows]
+    old_events = [_as_dict(e, EVENT_FIELDS) for e in old_event_rows]
+
+    op_plan = diff_rows(old_ops, new_ops, operation_key, OPERATION_FIELDS)
+    event_plan = diff_rows(old_events, new_events, event_key, EVENT_FIELDS)
+
+    # Events (of any report) linked to operations that go away or move are relinked below
+    moved = [old_op_rows[i].operation_id for i in op_plan["delete"]] + [
+        old_op_rows[i].operation_id for i, j in op_plan["update"]
+        if any(old_ops[i][f] != new_ops[j][f] for f in _LINK_FIELDS)
+    ]
+    relink_reports = {report_id}
+    if moved:
+        relink_reports.update(r for (r,) in db.query(Event.report_id).filter(Event.operation_id.in_(moved)).distinct())
+        db.query(Event).filter(Event.operation_id.in_(moved)).update(
+            {Event.operation_id: None}, synchronize_session=False
+        )
+
+    for i in event_plan["delete"]:
+        db.delete(old_event_rows[i])
+    for i, j in event_plan["update"]:
+        for f in EVENT_FIELDS:
+            setattr(old_event_rows[i], f, new_events[j][f])
+        old_event_rows[i].operation_id = None
+    for j in event_plan["insert"]:
+        db.add(Event(report_id=report_id, well_id=well_id, **new_events[j]))
+
+    for i in op_plan["delete"]:
+        db.delete(old_op_rows[i])
+    for i, j in op_plan["update"]:
+        for f in OPERATION_FIELDS:
+            setattr(old_op_rows[i], f, new_ops[j][f])
+    for j in op_plan["insert"]:
+        db.add(Operation(report_id=report_id, well_id=well_id, **new_ops[j]))
+    db.flush()
+
+    for r in sorted(relink_reports):
+        link_report_events(db, well_id, r, commit=False)
+    index_report(db, well_id, report_id)
+
+    return {
+        "operations": {k: len(v) for k, v in op_plan.items()},
+        "events": {k: len(v) for k, v in event_plan.items()},
+        "removed": [old_ops[i] for i in op_plan["delete"]] + [old_ops[i] for i, _ in op_plan["update"]],
+        "added": [new_ops[j] for j in op_plan["insert"]] + [new_ops[j] for _, j in op_plan["update"]],
+    }
@@ -0,0 +1,380 @@
+import json
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import chain
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.orm import Session
+
+from ..cache import get_cache
+from ..models.daily_report import DailyReport
+from ..models.operation import Operation
+from ..models.risk_daily_stat import RiskDailyStat
+from ..models.risk_score import RiskScore
+from ..models.risk_score_version import RiskScoreVersion
+from .archive_service import archived_rows
+from .risk_services import (
+    NPT_CRITICAL_HOURS,
+    DURATION_WARNING_HOURS,
+    CRITICAL_KEYWORDS,
+    EQUIPMENT_KEYWORDS,
+    RISK_WINDOW_DAYS,
+    WELL_SCOPE,
+    GENERAL_EQUIPMENT,
+    NPT_SATURATION_HOURS,
+    TREND_SATURATION,
+    REPEAT_SATURATION,
+    HIGH_RISK_SCORE,
+    MEDIUM_RISK_SCORE,
+    get_active_version,
+    accumulate_daily_stats,
+    refresh_well_risk,
+)
+
+# ----------------------------
+# Batch rescoring (vectorized)
+# ----------------------------
+# Used when rules/thresholds change: the whole history is rescored under a new
+# score version while readers keep using the active one, then the active
+# version is switched in a single transaction.
+
+LEVEL_NORMAL, LEVEL_WARNING, LEVEL_CRITICAL = 0, 1, 2
+
+# Keyword flag bits: bit 0 = critical keyword, bit i+1 = EQUIPMENT_KEYWORDS[i]
+CRITICAL_FLAG = np.uint32(1)
+EQUIPMENT_NAMES = list(EQUIPMENT_KEYWORDS)
+EQUIPMENT_MASK = np.uint32(((1 << len(EQUIPMENT_NAMES)) - 1) << 1)
+
+# Scopes rows are grouped into: whole well, each equipment group, then "no equipment"
+SCOPES = [WELL_SCOPE] + EQUIPMENT_NAMES + [GENERAL_EQUIPMENT]
+
+FETCH_CHUNK_ROWS = 20_000
+INSERT_CHUNK_ROWS = 5_000
+
+# Retired versions kept for readers that resolved the old version mid-switch
+KEEP_RETIRED_VERSIONS = 1
+
+
+def current_rules() -> Dict[str, Any]:
+    return {
+        "npt_critical_hours": NPT_CRITICAL_HOURS,
+        "duration_warning_hours": DURATION_WARNING_HOURS,
+        "critical_keywords": list(CRITICAL_KEYWORDS),
+        "equipment_keywords": {k: list(v) for k, v in EQUIPMENT_KEYWORDS.items()},
+        "window_days": RISK_WINDOW_DAYS,
+    }
+
+
+def keyword_flags(descriptions: np.ndarray) -> np.ndarray:
+    """
+    Precomputes keyword flags for a chunk of descriptions (one bitmask per row),
+    so the rule evaluation below never touches the text again.
+    """
+    upper = np.char.upper(descriptions.astype(str))
+    flags = np.zeros(len(descriptions), dtype=np.uint32)
+
+    critical = np.zeros(len(descriptions), dtype=bool)
+    for kw in CRITICAL_KEYWORDS:
+        critical |= np.char.find(upper, kw) >= 0
+    flags |= critical.astype(np.uint32) * CRITICAL_FLAG
+
+    for i, name in enumerate(EQUIPMENT_NAMES):
+        hit = np.zeros(len(descriptions), dtype=bool)
+        for kw in EQUIPMENT_KEYWORDS[name]:
+            hit |= np.char.find(upper, kw) >= 0
+        flags |= hit.astype(np.uint32) << np.uint32(i + 1)
+
+    return flags
+
+
+def load_operation_columns(db: Session, max_report_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Loads operations as columnar arrays: well index, report day (ordinal),
+    duration, npt and keyword flags. Descriptions are reduced to flags chunk by
+    chunk and not kept.
+    """
+    # Report dates are resolved per report (few rows), then mapped onto operations
+    reports = db.execute(select(DailyReport.report_id, DailyReport.report_date).order_by(DailyReport.report_id)).all()
+    report_ids = np.array([r[0] for r in reports], dtype=np.int64)
+    report_days = np.array([r[1].toordinal() for r in reports], dtype=np.int64)
+
+    columns = [Operation.report_id, Operation.well_id, Operation.description, Operation.duration_hours,
+               Operation.npt_hours]
+    where = [Operation.report_id <= max_report_id] if max_report_id is not None else []
+    stmt = select(*columns).where(*where)
+
+    # Archived reports come from their partitions, as one more chunk
+    archived = archived_rows(db, Operation, columns, where=where)
+
+    parts = defaultdict(list)
+    result = db.execute(stmt.execution_options(yield_per=FETCH_CHUNK_ROWS))
+    for chunk in chain(result.partitions(), [archived] if archived else []):
+        rid, well, desc, dur, npt = zip(*chunk)
+        parts["report_id"].append(np.array(rid, dtype=np.int64))
+        parts["well_id"].append(np.array(well, dtype=object))
+        parts["duration_hours"].append(np.array(dur, dtype=np.float64))   # None -> nan
+        parts["npt_hours"].append(np.array(npt, dtype=np.float64))
+        parts["flags"].append(keyword_flags(np.array([d or "" for d in desc], dtype=object)))
+
+    if not parts:
+        return {}
+
+    cols = {k: np.concatenate(v) for k, v in parts.items()}
+    cols["day"] = report_days[np.searchsorted(report_ids, cols["report_id"])]
+    cols["well_names"], cols["well"] = np.unique(cols.pop("well_id").astype(str), return_inverse=True)
+    return cols
+
+
+def evaluate_levels(npt: np.ndarray, duration: np.ndarray, flags: np.ndarray) -> np.ndarray:
+    """
+    Vectorized risk_services.classify_operation (nan compares False, like None).
+    """
+    critical = (npt >= NPT_CRITICAL_HOURS) | ((flags & CRITICAL_FLAG) != 0)
+    warning = ~critical & (duration >= DURATION_WARNING_HOURS)
+    return np.where(critical, LEVEL_CRITICAL, np.where(warning, LEVEL_WARNING, LEVEL_NORMAL)).astype(np.int8)
+
+
+def build_daily_stats(cols: Dict[str, np.ndarray], levels: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Group-by (scope, well, day) with bincount, one pass per scope.
+    """
+    day0 = cols["day"].min()
+    n_days = int(cols["day"].max() - day0 + 1)
+    flags = cols["flags"]
+    incident = (levels == LEVEL_CRITICAL).astype(np.float64)
+    duration = np.nan_to_num(cols["duration_hours"])
+    npt = np.nan_to_num(cols["npt_hours"])
+
+    out = defaultdict(list)
+    for scope_idx, scope in enumerate(SCOPES):
+        if scope == WELL_SCOPE:
+            mask = np.ones(len(flags), dtype=bool)
+        elif scope == GENERAL_EQUIPMENT:
+            mask = (flags & EQUIPMENT_MASK) == 0
+        else:
+            mask = (flags & (np.uint32(1) << np.uint32(scope_idx))) != 0
+        if not mask.any():
+            continue
+
+        key = cols["well"][mask] * n_days + (cols["day"][mask] - day0)
+        uniq, inv = np.unique(key, return_inverse=True)
+
+        out["scope"].append(np.full(len(uniq), scope_idx, dtype=np.int64))
+        out["well"].append(uniq // n_days)
+        out["day"].append(uniq % n_days + day0)
+        out["operation_count"].append(np.bincount(inv).astype(np.int64))
+        out["operation_hours"].append(np.bincount(inv, weights=duration[mask]))
+        out["npt_hours"].append(np.bincount(inv, weights=npt[mask]))
+        out["incident_count"].append(np.bincount(inv, weights=incident[mask]).astype(np.int64))
+
+    return {k: np.concatenate(v) for k, v in out.items()}
+
+
+def build_scores(stats: Dict[str, np.ndarray], n_wells: int) -> Dict[str, np.ndarray]:
+    """
+    Rolling-window features and scores for every (scope, well) at once.
+    Mirrors risk_services.refresh_well_risk / compute_risk_score.
+    """
+    as_of = np.full(n_wells, -1, dtype=np.int64)
+    well_rows = stats["scope"] == 0
+    np.maximum.at(as_of, stats["well"][well_rows], stats["day"][well_rows])
+
+    row_as_of = as_of[stats["well"]]
+    in_window = stats["day"] >= row_as_of - (RISK_WINDOW_DAYS - 1)
+    recent = stats["day"] >= row_as_of - (RISK_WINDOW_DAYS // 2 - 1)
+    had_incident = stats["incident_count"] > 0
+
+    group = stats["scope"] * n_wells + stats["well"]
+    uniq, inv = np.unique(group, return_inverse=True)
+
+    npt_window = np.bincount(inv, weights=stats["npt_hours"] * in_window)
+    npt_recent = np.bincount(inv, weights=stats["npt_hours"] * recent)
+    npt_trend = (npt_recent - (npt_window - npt_recent)) / (RISK_WINDOW_DAYS / 2)
+    repeat = np.bincount(inv, weights=(had_incident & in_window).astype(np.float64)).astype(np.int64)
+
+    last_incident = np.full(len(uniq), -1, dtype=np.int64)
+    np.maximum.at(last_incident, inv[had_incident], stats["day"][had_incident])
+
+    group_well = uniq % n_wells
+    group_as_of = as_of[group_well]
+    days_since = np.where(last_incident >= 0, group_as_of - last_incident, -1)
+
+    npt_part = np.minimum(npt_window / NPT_SATURATION_HOURS, 1.0)
+    trend_part = np.minimum(np.maximum(npt_trend, 0.0) / TREND_SATURATION, 1.0)
+    repeat_part = np.minimum(repeat / REPEAT_SATURATION, 1.0)
+    recency_part = np.where(days_since >= 0, np.maximum(0.0, 1.0 - days_since / RISK_WINDOW_DAYS), 0.0)
+    score = np.round(100 * (0.4 * npt_part + 0.3 * trend_part + 0.2 * repeat_part + 0.1 * recency_part), 2)
+
+    level = np.where(score >= HIGH_RISK_SCORE, "High", np.where(score >= MEDIUM_RISK_SCORE, "Medium", "Low"))
+
+    return {
+        "scope": uniq // n_wells,
+        "well": group_well,
+        "as_of": group_as_of,
+        "npt_window_hours": np.round(npt_window, 2),
+        "npt_trend": np.round(npt_trend, 3),
+        "repeat_failures": repeat,
+        "last_incident": last_incident,
+        "days_since_incident": days_since,
+        "score": score,
+        "risk_level": level,
+    }
+
+
+def _bulk_insert(db: Session, model, rows: List[Dict[str, Any]]) -> None:
+    for i in range(0, len(rows), INSERT_CHUNK_ROWS):
+        db.execute(insert(model), rows[i:i + INSERT_CHUNK_ROWS])
+
+
+def _day(ordinal: int) -> Optional[date]:
+    return date.fromordinal(int(ordinal)) if ordinal >= 0 else None
+
+
+def write_version(db: Session, version: int, cols: Dict[str, np.ndarray],
+                  stats: Dict[str, np.ndarray], scores: Dict[str, np.ndarray]) -> None:
+    wells = cols["well_names"]
+    now = datetime.utcnow()
+
+    _bulk_insert(db, RiskDailyStat, [
+        {
+            "score_version": version,
+            "well_id": str(wells[w]),
+            "equipment": SCOPES[s],
+            "report_date": date.fromordinal(int(d)),
+            "operation_count": int(c),
+            "operation_hours": float(h),
+            "npt_hours": float(n),
+            "incident_count": int(i),
+        }
+        for s, w, d, c, h, n, i in zip(
+            stats["scope"], stats["well"], stats["day"], stats["operation_count"],
+            stats["operation_hours"], stats["npt_hours"], stats["incident_count"],
+        )
+    ])
+
+    _bulk_insert(db, RiskScore, [
+        {
+            "score_version": version,
+            "well_id": str(wells[w]),
+            "equipment": SCOPES[s],
+            "as_of_date": _day(a),
+            "window_days": RISK_WINDOW_DAYS,
+            "npt_window_hours": float(nw),
+            "npt_trend": float(t),
+            "repeat_failures": int(r),
+            "last_incident_date": _day(li),
+            "days_since_incident": int(ds) if ds >= 0 else None,
+            "score": float(sc),
+            "risk_level": str(lv),
+            "updated_at": now,
+        }
+        for s, w, a, nw, t, r, li, ds, sc, lv in zip(
+            scores["scope"], scores["well"], scores["as_of"], scores["npt_window_hours"],
+            scores["npt_trend"], scores["repeat_failures"], scores["last_incident"],
+            scores["days_since_incident"], scores["score"], scores["risk_level"],
+        )
+    ])
+
+
+def _replay_reports(db: Session, version: int, after_report_id: int) -> int:
+    """
+    Folds reports ingested while the batch was running into the new version
+    (same incremental path ingest uses).
+    """
+    reports = db.query(DailyReport).filter(DailyReport.report_id > after_report_id).order_by(DailyReport.report_id).all()
+    touched = set()
+    for rep in reports:
+        ops = db.query(Operation).filter(Operation.report_id == rep.report_id).all()
+        accumulate_daily_stats(db, version, rep.well_id, rep.report_date, [
+            {"description": o.description, "duration_hours": o.duration_hours, "npt_hours": o.npt_hours}
+            for o in ops
+        ])
+        touched.add(rep.well_id)
+    for well_id in touched:
+        refresh_well_risk(db, version, well_id)
+    return len(reports)
+
+
+def rescore_fleet(db: Session) -> Dict[str, Any]:
+    """
+    Full history rescoring:
+    - reserve a new score version (status "building", invisible to readers)
+    - load operations as NumPy columns, evaluate levels and features vectorially
+    - bulk insert the new version's daily stats + scores
+    - replay reports ingested meanwhile, then switch active version in one transaction
+    - drop the rows of retired versions beyond the newest KEEP_RETIRED_VERSIONS
+    """
+    t0 = time.perf_counter()
+
+    previous = get_active_version(db, create=False)
+    new_version = (db.query(func.max(RiskScoreVersion.score_version)).scalar() or 0) + 1
+    db.add(RiskScoreVersion(score_version=new_version, status="building", rules=json.dumps(current_rules())))
+    db.commit()
+
+    snapshot_report_id = db.query(func.max(DailyReport.report_id)).scalar() or 0
+
+    cols = load_operation_columns(db, max_report_id=snapshot_report_id)
+    t_load = time.perf_counter()
+
+    n_ops = len(cols.get("day", []))
+    if n_ops:
+        levels = evaluate_levels(cols["npt_hours"], cols["duration_hours"], cols["flags"])
+        stats = build_daily_stats(cols, levels)
+        scores = build_scores(stats, len(cols["well_names"]))
+        t_eval = time.perf_counter()
+        write_version(db, new_version, cols, stats, scores)
+        n_scores = len(scores["score"])
+    else:
+        t_eval = time.perf_counter()
+        n_scores = 0
+    db.commit()
+    t_write = time.perf_counter()
+
+    # Switch: replay + status flip are committed together, so readers see
+    # either the old version or the complete new one.
+    replayed = _replay_reports(db, new_version, snapshot_report_id)
+    db.query(RiskScoreVersion).filter(RiskScoreVersion.status == "active").update({"status": "retired"})
+    db.query(RiskScoreVersion).filter(RiskScoreVersion.score_version == new_version).update(
+        {"status": "active", "activated_at": datetime.utcnow(), "operation_count": n_ops}
+    )
+    db.commit()
+    # KPIs show the risk level: every cached well result is stale now
+    get_cache().invalidate_all()
+
+    # By status, not version arithmetic: an aborted "building" version may sit
+    # between the previous active version and this one
+    retired = [v for (v,) in db.query(RiskScoreVersion.score_version)
+               .filter(RiskScoreVersion.status == "retired")
+               .order_by(RiskScoreVersion.score_version.desc())]
+    stale = retired[KEEP_RETIRED_VERSIONS:]
+    if stale:
+        db.execute(delete(RiskScore).where(RiskScore.score_version.in_(stale)))
+        db.execute(delete(RiskDailyStat).where(RiskDailyStat.score_version.in_(stale)))
+        db.commit()
+
+    return {
+        "score_version": new_version,
+        "previous_version": previous,
+        "operations_scored": n_ops,
+        "scores_written": n_scores,
+        "reports_replayed": replayed,
+        "timings_s": {
+            "load": round(t_load - t0, 3),
+            "evaluate": round(t_eval - t_load, 3),
+            "write": round(t_write - t_eval, 3),
+            "total": round(time.perf_counter() - t0, 3),
+        },
+    }
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(json.dumps(rescore_fleet(session), indent=2))
+    finally:
+        session.close()
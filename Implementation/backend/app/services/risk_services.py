@@ -0,0 +1,324 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.risk_daily_stat import RiskDailyStat
+from ..models.risk_score import RiskScore
+from ..models.risk_score_version import RiskScoreVersion
+
+
+# ----------------------------
+# Rules / thresholds (prototype analytics)
+# ----------------------------
+NPT_CRITICAL_HOURS = 2.0
+DURATION_WARNING_HOURS = 4.0
+CRITICAL_KEYWORDS = ("NPT", "NO SUCCESS", "STUCK")
+
+# Rolling window used for the risk features
+RISK_WINDOW_DAYS = 14
+
+# Well-level aggregate row in risk_daily_stats / risk_scores
+WELL_SCOPE = "ALL"
+GENERAL_EQUIPMENT = "GENERAL"
+
+# Equipment groups and the keywords that identify them in operation descriptions
+EQUIPMENT_KEYWORDS = {
+    "MUD PUMP": ("MUD PUMP", "PUMP #", "PUMP NO"),
+    "TOP DRIVE": ("TOP DRIVE", "TDS"),
+    "DRAWWORKS": ("DRAWWORKS", "DRAW WORKS"),
+    "BOP": ("BOP", "ANNULAR", "PIPE RAM"),
+    "MWD/LWD": ("MWD", "LWD"),
+    "RSS/MOTOR": ("RSS", "MUD MOTOR", "PDM"),
+    "BIT": ("BIT",),
+    "BHA": ("BHA",),
+    "CASING": ("CASING", "CSG"),
+    "SHAKER": ("SHAKER",),
+    "GENERATOR": ("GENERATOR", "POWER FAILURE"),
+}
+
+# Score weights (sum to 1.0) and saturation points
+NPT_SATURATION_HOURS = 24.0
+TREND_SATURATION = 2.0        # hours/day increase
+REPEAT_SATURATION = 4         # incident days inside the window
+
+HIGH_RISK_SCORE = 60.0
+MEDIUM_RISK_SCORE = 25.0
+
+
+def classify_operation(description: Optional[str], duration_hours: Optional[float], npt_hours: Optional[float]) -> str:
+    """
+    Simple rules (prototype analytics):
+    - critical if description contains strong keywords or npt_hours exists and is high
+    - warning if long duration
+    - else normal
+    """
+    desc = (description or "").upper()
+
+    if npt_hours is not None and npt_hours >= NPT_CRITICAL_HOURS:
+        return "critical"
+    if any(k in desc for k in CRITICAL_KEYWORDS):
+        return "critical"
+    if duration_hours is not None and duration_hours >= DURATION_WARNING_HOURS:
+        return "warning"
+    return "normal"
+
+
+def equipment_for_description(description: Optional[str]) -> List[str]:
+    """
+    Returns the equipment groups mentioned in an operation description.
+    Operations that mention no known equipment are grouped as GENERAL.
+    """
+    desc = (description or "").upper()
+    found = [name for name, keys in EQUIPMENT_KEYWORDS.items() if any(k in desc for k in keys)]
+    return found or [GENERAL_EQUIPMENT]
+
+
+def risk_level_from_score(score: float) -> str:
+    if score >= HIGH_RISK_SCORE:
+        return "High"
+    if score >= MEDIUM_RISK_SCORE:
+        return "Medium"
+    return "Low"
+
+
+def compute_risk_score(npt_window_hours: float, npt_trend: float, repeat_failures: int,
+                       days_since_incident: Optional[int]) -> float:
+    """
+    Weighted 0-100 score from the rolling-window features.
+    """
+    npt_part = min(npt_window_hours / NPT_SATURATION_HOURS, 1.0)
+    trend_part = min(max(npt_trend, 0.0) / TREND_SATURATION, 1.0)
+    repeat_part = min(repeat_failures / REPEAT_SATURATION, 1.0)
+    recency_part = 0.0
+    if days_since_incident is not None:
+        recency_part = max(0.0, 1.0 - days_since_incident / RISK_WINDOW_DAYS)
+
+    return round(100 * (0.4 * npt_part + 0.3 * trend_part + 0.2 * repeat_part + 0.1 * recency_part), 2)
+
+
+def get_active_version(db: Session, create: bool = True) -> Optional[int]:
+    """
+    Score version readers and the incremental ingest path work against.
+    On an empty database the ingest path (create=True) starts version 1;
+    readers pass create=False and get None.
+    """
+    active = (
+        db.query(RiskScoreVersion.score_version)
+        .filter(RiskScoreVersion.status == "active")
+        .order_by(RiskScoreVersion.score_version.desc())
+        .first()
+    )
+    if active is not None:
+        return active[0]
+    if not create:
+        return None
+
+    db.add(RiskScoreVersion(score_version=1, status="active", activated_at=datetime.utcnow()))
+    db.flush()
+    return 1
+
+
+# ----------------------------
+# Incremental maintenance (called at ingest)
+# ----------------------------
+def summarize_operations(operations: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Groups one report's parsed operations into per-equipment daily stats.
+    The WELL_SCOPE entry always exists so the well gets a row for the day.
+    """
+    stats: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: {"operation_count": 0, "operation_hours": 0.0, "npt_hours": 0.0, "incident_count": 0}
+    )
+    stats[WELL_SCOPE]  # touch so the well-level row always exists
+
+    for o in operations:
+        desc = o.get("description")
+        dur = o.get("duration_hours")
+        npt = o.get("npt_hours")
+        critical = classify_operation(desc, dur, npt) == "critical"
+
+        for key in [WELL_SCOPE] + equipment_for_description(desc):
+            s = stats[key]
+            s["operation_count"] += 1
+            s["operation_hours"] += dur or 0.0
+            s["npt_hours"] += npt or 0.0
+            s["incident_count"] += 1 if critical else 0
+
+    return stats
+
+
+def accumulate_daily_stats(db: Session, version: int, well_id: str, report_date: date,
+                           operations: Iterable[Dict[str, Any]],
+                           removed: Iterable[Dict[str, Any]] = ()) -> None:
+    """
+    Adds one report's contribution to risk_daily_stats (several reports on the
+    same day accumulate into the same row). A corrected report passes the rows
+    it no longer has (and the old values of changed rows) as removed; their
+    contribution is taken back out, so the day is adjusted, not rebuilt.
+    """
+    added = summarize_operations(operations)
+    taken = summarize_operations(removed)
+    for equipment in list(added) + [e for e in taken if e not in added]:
+        a, t = added.get(equipment), taken.get(equipment)
+        row = db.get(RiskDailyStat, (version, well_id, equipment, report_date))
+        if row is None:
+            row = RiskDailyStat(
+                score_version=version, well_id=well_id, equipment=equipment, report_date=report_date,
+                operation_count=0, operation_hours=0.0, npt_hours=0.0, incident_count=0,
+            )
+            db.add(row)
+        for s, sign in ((a, 1), (t, -1)):
+            if s is None:
+                continue
+            row.operation_count += sign * s["operation_count"]
+            row.operation_hours += sign * s["operation_hours"]
+            row.npt_hours += sign * s["npt_hours"]
+            row.incident_count += sign * s["incident_count"]
+        emptied = row.operation_count <= 0
+        if emptied:
+            # Nothing left for the day (float sums would leave rounding residue)
+            row.operation_count, row.operation_hours, row.npt_hours, row.incident_count = 0, 0.0, 0.0, 0
+            if equipment != WELL_SCOPE:
+                db.delete(row)
+
+        score = db.get(RiskScore, (version, well_id, equipment))
+        if score is None:
+            continue
+        if a is not None and a["incident_count"]:
+            if score.last_incident_date is None or report_date > score.last_incident_date:
+                score.last_incident_date = report_date
+        elif t is not None and t["incident_count"] and row.incident_count <= 0 and score.last_incident_date == report_date:
+            # The correction removed the latest incident: fall back to the previous incident day
+            db.flush()
+            score.last_incident_date = (
+                db.query(func.max(RiskDailyStat.report_date))
+                .filter(RiskDailyStat.score_version == version, RiskDailyStat.well_id == well_id,
+                        RiskDailyStat.equipment == equipment, RiskDailyStat.incident_count > 0)
+                .scalar()
+            )
+        if emptied and equipment != WELL_SCOPE:
+            db.flush()
+            remaining = (
+                db.query(RiskDailyStat.report_date)
+                .filter(RiskDailyStat.score_version == version, RiskDailyStat.well_id == well_id,
+                        RiskDailyStat.equipment == equipment)
+                .first()
+            )
+            if remaining is None:
+                # The well no longer mentions this equipment at all
+                db.delete(score)
+
+    db.flush()
+
+
+def refresh_well_risk(db: Session, version: int, well_id: str) -> List[RiskScore]:
+    """
+    Recomputes the well's risk_scores rows from the rolling window only
+    (bounded by RISK_WINDOW_DAYS x equipment groups, not the well's history).
+    """
+    latest = (
+        db.query(RiskDailyStat.report_date)
+        .filter(RiskDailyStat.score_version == version, RiskDailyStat.well_id == well_id,
+                RiskDailyStat.equipment == WELL_SCOPE)
+        .order_by(RiskDailyStat.report_date.desc())
+        .first()
+    )
+    if latest is None:
+        return []
+
+    as_of = latest[0]
+    window_start = as_of - timedelta(days=RISK_WINDOW_DAYS - 1)
+    split = as_of - timedelta(days=RISK_WINDOW_DAYS // 2 - 1)
+
+    rows = (
+        db.query(RiskDailyStat)
+        .filter(RiskDailyStat.score_version == version, RiskDailyStat.well_id == well_id,
+                RiskDailyStat.report_date >= window_start, RiskDailyStat.report_date <= as_of)
+        .all()
+    )
+
+    by_equipment: Dict[str, List[RiskDailyStat]] = defaultdict(list)
+    for r in rows:
+        by_equipment[r.equipment].append(r)
+
+    existing = {
+        s.equipment: s
+        for s in db.query(RiskScore).filter(RiskScore.score_version == version, RiskScore.well_id == well_id).all()
+    }
+    half = RISK_WINDOW_DAYS / 2
+
+    scores = []
+    for equipment in set(by_equipment) | set(existing):
+        window = by_equipment.get(equipment, [])
+        npt_window = sum(r.npt_hours for r in window)
+        npt_recent = sum(r.npt_hours for r in window if r.report_date >= split)
+        npt_trend = (npt_recent - (npt_window - npt_recent)) / half
+        incident_days = [r.report_date for r in window if r.incident_count > 0]
+
+        score_row = existing.get(equipment)
+        if score_row is None:
+            score_row = RiskScore(score_version=version, well_id=well_id, equipment=equipment)
+            db.add(score_row)
+
+        last_incident = max(incident_days, default=None)
+        if score_row.last_incident_date is not None and (last_incident is None or score_row.last_incident_date > last_incident):
+            last_incident = score_row.last_incident_date
+        days_since = (as_of - last_incident).days if last_incident is not None else None
+
+        score_row.as_of_date = as_of
+        score_row.window_days = RISK_WINDOW_DAYS
+        score_row.npt_window_hours = round(npt_window, 2)
+        score_row.npt_trend = round(npt_trend, 3)
+        score_row.repeat_failures = len(incident_days)
+        score_row.last_incident_date = last_incident
+        score_row.days_since_incident = days_since
+        score_row.score = compute_risk_score(npt_window, npt_trend, len(incident_days), days_since)
+        score_row.risk_level = risk_level_from_score(score_row.score)
+        scores.append(score_row)
+
+    return scores
+
+
+def update_risk_for_report(db: Session, well_id: str, report_date: date,
+                           operations: List[Dict[str, Any]],
+                           removed: Iterable[Dict[str, Any]] = (), commit: bool = True) -> None:
+    """
+    Ingest hook: fold a new (or corrected, see accumulate_daily_stats) report
+    into the feature store and refresh the well's scores.
+    """
+    version = get_active_version(db)
+    accumulate_daily_stats(db, version, well_id, report_date, operations, removed)
+    refresh_well_risk(db, version, well_id)
+    if commit:
+        db.commit()
+
+
+# ----------------------------
+# Read side (O(1) per well)
+# ----------------------------
+def risk_score_to_dict(s: RiskScore) -> Dict[str, Any]:
+    return {
+        "well_id": s.well_id,
+        "equipment": s.equipment,
+        "scoreVersion": s.score_version,
+        "asOf": str(s.as_of_date) if s.as_of_date else None,
+        "windowDays": s.window_days,
+        "nptWindowHours": s.npt_window_hours,
+        "nptTrend": s.npt_trend,
+        "repeatFailures": s.repeat_failures,
+        "lastIncident": str(s.last_incident_date) if s.last_incident_date else None,
+        "daysSinceIncident": s.days_since_incident,
+        "score": s.score,
+        "riskLevel": s.risk_level,
+    }
+
+
+def get_well_risk(db: Session, well_id: str, version: Optional[int] = None) -> Optional[RiskScore]:
+    if version is None:
+        version = get_active_version(db, create=False)
+        if version is None:
+            return None
+    return db.get(RiskScore, (version, well_id, WELL_SCOPE))
@@ -0,0 +1,223 @@
+import html
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .archive_service import catalog_query
+
+# ----------------------------
+# Full-text search (SQLite FTS5, see migrations/m0005_fulltext_search.py)
+# ----------------------------
+# The FTS indexes cover hot rows only: archived reports (archive_service.py)
+# are not searched, and a result whose scope includes any says so ("partial").
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# snippet() marks matches with private-use characters; the report text is
+# HTML-escaped before they become HIGHLIGHT_START/END
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+SNIPPET_TOKENS = 24
+MAX_LIMIT = 200
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+# SQLite errors caused by the query text itself (400); anything else is a server error
+QUERY_ERRORS = ("fts5: syntax error", "no such column")
+
+
+def is_query_error(error: Exception) -> bool:
+    message = str(getattr(error, "orig", error))
+    return any(m in message for m in QUERY_ERRORS)
+
+
+def to_fts_query(q: str) -> str:
+    """
+    Turns what an engineer types into a safe FTS5 query:
+      STUCK PIPE          -> "STUCK" "PIPE"        (all words)
+      "NO SUCCESS"        -> "NO SUCCESS"          (phrase)
+      MUD OR TOP DRIVE    -> "MUD" OR "TOP" "DRIVE"
+      STUCK*              -> "STUCK"*              (prefix)
+    Punctuation inside words (12-1/4, MWD/LWD) is kept inside quotes so it
+    can never break the FTS5 syntax.
+    """
+    parts: List[str] = []
+    for phrase, word in _TOKEN_RE.findall(q or ""):
+        if phrase:
+            cleaned = phrase.replace('"', "").strip()
+            if cleaned:
+                parts.append(f'"{cleaned}"')
+            continue
+        if word.upper() in _OPERATORS and parts:
+            parts.append(word.upper())
+            continue
+        prefix = word.endswith("*")
+        cleaned = word.rstrip("*").replace('"', "")
+        if cleaned:
+            parts.append(f'"{cleaned}"' + ("*" if prefix else ""))
+
+    # A trailing/duplicated operator is a syntax error: drop it
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+    return " ".join(p for i, p in enumerate(parts) if not (p in _OPERATORS and parts[i - 1] in _OPERATORS))
+
+
+# source -> (FTS table, base table, alias, id column, searchable FTS columns, snippet column)
+# Column weights for ranking are the tables' "rank" setting (see the migration).
+_SOURCES = {
+    "operations": ("operations_fts", "operations", "o", "operation_id", "description operation_type", 0),
+    "events": ("events_fts", "events", "e", "event_id", "event_description event_type equipment actions_taken", -1),
+}
+
+
+def _match_expression(fts_query: str, columns: str, well_id: Optional[str]) -> str:
+    """
+    User terms only match the text columns; a well filter is a column filter on
+    the indexed well_id, so FTS5 intersects it before anything is ranked. That
+    filter is a token phrase ("WELL-1" also matches "WELL-1-ST1"): _filters adds
+    the exact well_id predicate on the base row.
+    """
+    expr = f"{{{columns}}} : ({fts_query})"
+    if well_id:
+        expr += ' AND well_id : "' + well_id.replace('"', '""') + '"'
+    return expr
+
+
+def _filters(alias: str, well_id, start, end, depth_min, depth_max, params: Dict[str, Any]) -> str:
+    sql = []
+    if well_id:
+        sql.append(f"AND {alias}.well_id = :well_id")
+        params["well_id"] = well_id
+    if start:
+        sql.append("AND r.report_date >= :start")
+        params["start"] = start.isoformat()
+    if end:
+        sql.append("AND r.report_date <= :end")
+        params["end"] = end.isoformat()
+    # Depth ranges overlap (parsed rows are not always from <= to)
+    if depth_min is not None:
+        sql.append(f"AND MAX(COALESCE({alias}.depth_from, 0), COALESCE({alias}.depth_to, 0)) >= :depth_min")
+        params["depth_min"] = depth_min
+    if depth_max is not None:
+        sql.append(f"AND MIN(COALESCE({alias}.depth_from, 0), COALESCE({alias}.depth_to, 0)) <= :depth_max")
+        params["depth_max"] = depth_max
+    return " ".join(sql)
+
+
+def _search_source(db: Session, source: str, filters: str, params: Dict[str, Any]) -> List[Any]:
+    """
+    One query driven by the FTS5 table: ORDER BY rank lets FTS5 hand rows out
+    already ranked, so joins, filters and snippet() only run until `limit`
+    rows pass instead of once per match of a common term.
+    """
+    fts, table, alias, id_col, _, snippet_col = _SOURCES[source]
+    rows = db.execute(text(f"""
+        SELECT {alias}.*, r.report_date, {fts}.rank AS score,
+               snippet({fts}, {snippet_col}, :hl_start, :hl_end, '…', :tokens) AS snippet
+        FROM {fts}
+        JOIN {table} {alias} ON {alias}.{id_col} = {fts}.rowid
+        JOIN daily_reports r ON r.report_id = {alias}.report_id
+        WHERE {fts} MATCH :q {filters}
+        ORDER BY {fts}.rank
+        LIMIT :limit
+    """), params).mappings().all()
+    return rows
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet, quote=False)
+    return escaped.replace(_MARK_START, HIGHLIGHT_START).replace(_MARK_END, HIGHLIGHT_END)
+
+
+def _operation_result(row) -> Dict[str, Any]:
+    return {
+        "kind": "operation",
+        "id": row["operation_id"],
+        "reportId": row["report_id"],
+        "wellId": row["well_id"],
+        "reportDate": row["report_date"],
+        "depthFrom": row["depth_from"],
+        "depthTo": row["depth_to"],
+        "type": row["operation_type"],
+        "nptHours": row["npt_hours"],
+        "highlight": _highlight(row["snippet"]),
+        "score": round(-row["score"], 4),
+    }
+
+
+def _event_result(row) -> Dict[str, Any]:
+    return {
+        "kind": "event",
+        "id": row["event_id"],
+        "reportId": row["report_id"],
+        "wellId": row["well_id"],
+        "reportDate": row["report_date"],
+        "depthFrom": row["depth_from"],
+        "depthTo": row["depth_to"],
+        "type": row["event_type"],
+        "nptHours": row["npt_hours"],
+        "severity": row["severity"],
+        "highlight": _highlight(row["snippet"]),
+        "score": round(-row["score"], 4),
+    }
+
+
+def search_fleet(
+    db: Session,
+    q: str,
+    kind: str = "all",
+    well_id: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    depth_min: Optional[float] = None,
+    depth_max: Optional[float] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Ranked matches across operations and/or events with highlighted
+    snippets. bm25 scores ("score") of the two FTS tables are not comparable
+    (different columns, weights and corpus statistics): each source's scores
+    are divided by its best match and results are merged on that
+    ("relevance", 1.0 for the top match of each source). "partial" is true when archived reports in the well/date scope
+    were not searched ("archivedReports" of them). Raises ValueError for an
+    empty or unsupported query.
+    """
+    if db.bind.dialect.name != "sqlite":
+        raise ValueError("Full-text search needs the SQLite FTS5 index")
+
+    fts_query = to_fts_query(q)
+    if not fts_query:
+        raise ValueError("Search query is empty")
+
+    limit = max(1, min(limit, MAX_LIMIT))
+    results: List[Dict[str, Any]] = []
+
+    for source, to_result in (("operations", _operation_result), ("events", _event_result)):
+        if kind not in ("all", source):
+            continue
+        params: Dict[str, Any] = {
+            "q": _match_expression(fts_query, _SOURCES[source][4], well_id),
+            "limit": limit, "tokens": SNIPPET_TOKENS,
+            "hl_start": _MARK_START, "hl_end": _MARK_END,
+        }
+        filters = _filters(_SOURCES[source][2], well_id, start, end, depth_min, depth_max, params)
+        rows = _search_source(db, source, filters, params)
+        best = rows[0]["score"] if rows else None
+        for row in rows:
+            result = to_result(row)
+            # rank is negative bm25, best first; a zero best score means every match ties
+            result["relevance"] = round(row["score"] / best, 4) if best else 1.0
+            results.append(result)
+
+    # Stable: equal relevance keeps operations before events
+    results.sort(key=lambda r: -r["relevance"])
+    archived = catalog_query(db, [well_id] if well_id else None, start, end).count()
+    return {
+        "query": q, "ftsQuery": fts_query, "count": len(results[:limit]), "results": results[:limit],
+        "partial": archived > 0, "archivedReports": archived,
+    }
@@ -0,0 +1,153 @@
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.operation import Operation
+from .archive_service import archived_rows
+
+# ----------------------------
+# Absolute operation times
+# ----------------------------
+# Reports list From/To as HH:MM on the report day; rows are in time order and
+# the last one usually ends at "0:00" (midnight of the next day).
+_CLOCK_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+# Longest operation a timeline window has to reach back for. A report covers
+# one day, so no single row can span more; the margin covers late reports.
+MAX_OPERATION_HOURS = 48
+
+MAX_TIMELINE_ROWS = 50000
+
+
+def parse_clock(value: Optional[str]) -> Optional[timedelta]:
+    """
+    "6:30" -> 6h30m, "24:00" -> 24h. None for anything that is not a clock time.
+    """
+    m = _CLOCK_RE.match((value or "").strip())
+    if not m:
+        return None
+    hours, minutes = int(m.group(1)), int(m.group(2))
+    if minutes > 59 or hours > 24 or (hours == 24 and minutes):
+        return None
+    return timedelta(hours=hours, minutes=minutes)
+
+
+def operation_times(
+    report_date: date, operations: Sequence[Dict[str, Any]]
+) -> List[Tuple[Optional[datetime], Optional[datetime]]]:
+    """
+    (start_time, end_time) for each parsed row, anchored on the report date.
+    A clock going backwards moves to the next day (midnight rollover), and an
+    end at or before its start ends on the next day ("18:30 - 0:00", or
+    "0:00 - 0:00" for a 24 h row). Rows that already carry datetimes keep them.
+    """
+    day = datetime.combine(report_date, datetime.min.time())
+    previous_end: Optional[datetime] = None
+    times = []
+
+    for o in operations:
+        if isinstance(o.get("start_time"), datetime):
+            times.append((o["start_time"], o.get("end_time")))
+            previous_end = o.get("end_time") or previous_end
+            continue
+
+        start_clock = parse_clock(o.get("start_time_str"))
+        end_clock = parse_clock(o.get("end_time_str"))
+        if start_clock is None:
+            times.append((None, None))
+            continue
+
+        start = day + start_clock
+        if previous_end is not None and start < previous_end:
+            day += timedelta(days=1)
+            start += timedelta(days=1)
+
+        end = None
+        if end_clock is not None:
+            end = day + end_clock
+            if end < start or (end == start and (o.get("duration_hours") or 0) > 0):
+                end += timedelta(days=1)
+
+        times.append((start, end))
+        previous_end = end or start
+
+    return times
+
+
+# ----------------------------
+# Timeline (time-window queries)
+# ----------------------------
+TIMELINE_FIELDS = (
+    "operation_id", "report_id", "well_id", "start_time", "end_time",
+    "depth_from", "depth_to", "operation_type", "description", "duration_hours", "npt_hours",
+)
+
+
+def timeline_query(db: Session, well_ids: Sequence[str], start: datetime, end: datetime):
+    """
+    Operations overlapping [start, end). The start_time bounds are what
+    ix_operations_well_start range-scans per well; end_time is checked from
+    the same index entries.
+    """
+    columns = [getattr(Operation, name) for name in TIMELINE_FIELDS]
+    return (
+        db.query(*columns)
+        .filter(Operation.well_id.in_(list(well_ids)))
+        .filter(*timeline_window(start, end))
+    )
+
+
+def timeline_window(start: datetime, end: datetime) -> list:
+    """
+    Conditions for an operation overlapping [start, end) (hot table and archive partitions).
+    """
+    return [
+        Operation.start_time >= start - timedelta(hours=MAX_OPERATION_HOURS),
+        Operation.start_time < end,
+        Operation.end_time > start,
+    ]
+
+
+def fleet_timeline(
+    db: Session,
+    well_ids: Sequence[str],
+    start: datetime,
+    end: datetime,
+    limit: int = 10000,
+) -> Dict[str, Any]:
+    """
+    Operations of one or many wells that overlap the window, in time order.
+    Raises ValueError for an empty or inverted window.
+    """
+    if not well_ids:
+        raise ValueError("At least one well_id is required")
+    if end <= start:
+        raise ValueError("end must be after start")
+
+    limit = max(1, min(limit, MAX_TIMELINE_ROWS))
+    rows = (
+        timeline_query(db, well_ids, start, end)
+        .order_by(Operation.start_time.asc(), Operation.well_id.asc(), Operation.operation_id.asc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    # Archived reports: a row starts on or after its report day, at most two days later
+    archived = archived_rows(
+        db, Operation, [getattr(Operation, name) for name in TIMELINE_FIELDS], well_ids=well_ids,
+        start=(start - timedelta(hours=2 * MAX_OPERATION_HOURS)).date(), end=end.date(),
+        where=timeline_window(start, end),
+    )
+    if archived:
+        rows = sorted(rows + archived, key=lambda r: (r.start_time, r.well_id, r.operation_id))[:limit + 1]
+
+    return {
+        "start": start,
+        "end": end,
+        "wells": list(well_ids),
+        "count": min(len(rows), limit),
+        "truncated": len(rows) > limit,
+        "operations": [dict(zip(TIMELINE_FIELDS, row)) for row in rows[:limit]],
+    }
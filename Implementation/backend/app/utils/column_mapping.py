@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import re
-import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pandas is imported inside the functions that need it
+    import pandas as pd
 
 # ---------------------------------------------------------
 # 1) COLUMN NORMALIZATION + MAPPING
@@ -135,6 +140,8 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
 # 4) FULL TRANSFORMATION PIPELINE
 # ---------------------------------------------------------
 def transform_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    import pandas as pd
+
     # Normalize headers + map to internal names
     df = normalize_columns(df)
 
@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import re
-import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pandas is imported inside the functions that need it
+    import pandas as pd
 
 from app.utils.column_mapping import COLUMN_MAPPING
 
@@ -50,6 +55,8 @@ def clean_header(col: object) -> str:
 # MAIN TRANSFORMATION PIPELINE
 # ---------------------------------------------------------
 def transform_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    import pandas as pd
+
     # 1) Clean + normalize raw column names
     df.columns = [clean_header(c) for c in df.columns]
 
@@ -0,0 +1,318 @@
+"""
+Hot/cold tiering check: archive a synthetic fleet's old reports and one
+completed well, then verify readers see the same data and measure sizes.
+
+Seeds a fleet into a temporary database, links events and rescores, and
+records the API responses of a few wells (operations, segments, events per
+operation, timeline, progress, offset wells, KPIs). After
+archive_service.run_archival (vacuumed) every response must be unchanged
+(dashboard segments of archived days become rollup segments; KPIs must
+match), a rescore must reproduce the same scores, a restored report must get
+its rows back with their ids (a rewrite keeps the superseded file until the
+prune grace period), search must flag scopes with archived reports as
+partial, and restoring everything must give back the
+original operations/events tables with both FTS indexes in sync. Finally the
+well holding the newest ids is archived and a backfill swap reinserts the
+newest hot report: its new ids must stay above every archived id, so
+restoring the archive cannot collide, no event may stay linked to a swapped-out
+operation, and a report replaced after staging must be skipped.
+
+Also prints the hot database size before/after, the archive size, hot-path
+latencies before/after and archived reads cold (decompress) vs warm.
+
+Usage (from Implementation/backend):
+    pip install -r requirements-dev.txt         # httpx (TestClient)
+    python benchmarks/archive_check.py
+    python benchmarks/archive_check.py --wells 30 --days 365 --months 6
+
+Exit code is 1 when any check fails.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=12)
+    ap.add_argument("--days", type=int, default=240)
+    ap.add_argument("--months", type=int, default=3, help="archive reports older than this many months")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="archive_"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp / 'hot.db'}"
+    os.environ["ARCHIVE_DIR"] = str(tmp / "archive")
+    os.environ["ARCHIVE_CACHE_DIR"] = str(tmp / "archive-cache")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select, text
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import (ArchivePartition, BackfillItem, BackfillJob, DailyReport, Event, Operation, ReportRollup,
+                            RiskScore, Well)
+    from app.services import archive_service
+    from app.services.backfill import swap_job
+    from app.services.event_linking import link_fleet
+    from app.services.risk_batch import rescore_fleet
+    from app.services.risk_services import get_active_version
+    from synthetic_fleet import START_DATE, seed_fleet
+
+    results = []
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        results.append(ok)
+        print(f"[{'OK' if ok else 'FAIL'}] {name}" + (f"  ({detail})" if detail else ""))
+
+    seeded = seed_fleet(args.wells, args.days, events_per_day=2)
+    print(f"seeded {seeded}")
+    today = START_DATE + timedelta(days=args.days)
+    cutoff = archive_service.months_before(today, args.months)
+
+    db = SessionLocal()
+    link_fleet(db)
+    rescore_fleet(db)
+    completed, active = "SYN-0000", "SYN-0001"
+    db.query(Well).filter(Well.well_id == completed).update({Well.well_status: "Completed"})
+    db.commit()
+
+    def table(model):
+        return sorted(tuple(r) for r in db.execute(select(model.__table__)))
+
+    def risk_scores():
+        version = get_active_version(db, create=False)
+        return sorted(
+            (s.well_id, s.equipment, str(s.as_of_date), round(s.npt_window_hours, 6), s.repeat_failures,
+             str(s.last_incident_date), s.days_since_incident, round(s.score, 6), s.risk_level)
+            for s in db.query(RiskScore).filter(RiskScore.score_version == version)
+        )
+
+    # An archived-period operation of the active well that has events
+    old_op = db.execute(
+        select(Event.operation_id)
+        .join(DailyReport, DailyReport.report_id == Event.report_id)
+        .where(Event.well_id == active, Event.operation_id.isnot(None), DailyReport.report_date < cutoff)
+        .limit(1)
+    ).scalar()
+    window_start = datetime.combine(START_DATE + timedelta(days=30), datetime.min.time())
+    recent_start = datetime.combine(today - timedelta(days=7), datetime.min.time())
+    requests = {
+        "operations (all)": f"/wells/{active}/operations",
+        "operations (archived window)": f"/wells/{active}/operations?start={START_DATE}&end={START_DATE + timedelta(days=40)}",
+        "operations (completed well)": f"/wells/{completed}/operations",
+        "segments": f"/wells/{active}/segments",
+        "events of an archived operation": f"/wells/{active}/operations/{old_op}/events",
+        "timeline across the cutoff": (
+            f"/timeline/?well_id={active}&well_id={completed}"
+            f"&start={window_start:%Y-%m-%dT%H:%M}&end={datetime.combine(cutoff, datetime.min.time()) + timedelta(days=2):%Y-%m-%dT%H:%M}"
+        ),
+        "progress": f"/progress/?well_id={active}&well_id={completed}",
+        "offset wells": f"/wells/SYN-0005/offset-wells?depth_from=0&depth_to=5000&limit=1000",
+    }
+
+    with TestClient(app) as client:
+        def hot_reads():
+            client.get(f"/wells/{active}/operations?start={today - timedelta(days=7)}&end={today}")
+            client.get(f"/timeline/?well_id={active}&start={recent_start:%Y-%m-%dT%H:%M}"
+                       f"&end={recent_start + timedelta(days=2):%Y-%m-%dT%H:%M}")
+
+        before = {name: client.get(url).json() for name, url in requests.items()}
+        kpis_before = {w: client.get(f"/wells/{w}/dashboard").json()["kpis"] for w in (active, completed)}
+        segments_before = len(client.get(f"/wells/{completed}/dashboard").json()["segments"])
+        tables_before = {m.__tablename__: table(m) for m in (Operation, Event)}
+        scores_before = risk_scores()
+        hot_before_ms = median_ms(hot_reads, args.repeat)
+
+        t0 = time.perf_counter()
+        archived = archive_service.run_archival(db, months=args.months, today=today, vacuum=True)
+        seconds = time.perf_counter() - t0
+        print(f"    archival: {archived}  ({seconds:.1f} s)")
+        stored = db.query(func.sum(ArchivePartition.stored_size), func.sum(ArchivePartition.size)).one()
+        hot_rows = db.query(func.count(Operation.operation_id)).scalar()
+        print(f"    hot db {archived['hot_bytes_before'] / 1e6:.1f} MB -> {archived['hot_bytes_after'] / 1e6:.1f} MB, "
+              f"{hot_rows} operations left hot; archive {stored[0] / 1e6:.2f} MB on disk "
+              f"({stored[1] / 1e6:.1f} MB uncompressed) in {archived['partitions']} partitions")
+        left_hot = db.query(DailyReport).filter(
+            DailyReport.archive_partition_id.is_(None),
+            (DailyReport.well_id == completed) | (DailyReport.report_date < cutoff),
+        ).count()
+        check("old reports and the completed well were archived", archived["reports"] > 0 and left_hot == 0)
+
+        after = {name: client.get(url).json() for name, url in requests.items()}
+        for name in requests:
+            rows = after[name]
+            size = len(rows) if isinstance(rows, list) else len(rows.get("operations") or rows.get("segments")
+                                                                 or rows.get("intervals") or rows.get("wells") or [])
+            check(f"{name} unchanged", before[name] == after[name], f"{size} rows")
+        kpis_after = {w: client.get(f"/wells/{w}/dashboard").json()["kpis"] for w in (active, completed)}
+        check("dashboard KPIs unchanged (rollups)", kpis_before == kpis_after)
+        segments_after = len(client.get(f"/wells/{completed}/dashboard").json()["segments"])
+        print(f"    completed well dashboard: {segments_before} segments -> {segments_after} rollup segments")
+
+        rescore_fleet(db)
+        check("rescore over hot + archived rows reproduces the scores", risk_scores() == scores_before)
+
+        flagged = client.get(f"/search/?q=POOH&well_id={completed}").json()
+        recent = client.get(f"/search/?q=POOH&well_id={active}&start={cutoff}").json()
+        check("search flags scopes with archived reports as partial",
+              flagged["partial"] and flagged["archivedReports"] > 0 and not recent["partial"],
+              f"{flagged['archivedReports']} archived reports not searched")
+
+        hot_after_ms = median_ms(hot_reads, args.repeat)
+        print(f"    hot reads (recent window, active well): {hot_before_ms:.1f} ms -> {hot_after_ms:.1f} ms")
+
+        def cold_read():
+            archive_service._open_partitions.clear()
+            client.get(f"/wells/{completed}/operations")
+
+        cold_ms = median_ms(cold_read, 3)
+        warm_ms = median_ms(lambda: client.get(f"/wells/{completed}/operations"), args.repeat)
+        print(f"    completed well operations: cold {cold_ms:.1f} ms, warm {warm_ms:.1f} ms")
+
+        # Fleet-wide reads touch every partition; the cache must hold them all, not re-decompress
+        archive_service.archived_rows(db, Operation, [Operation.operation_id])
+        cached = dict(archive_service._open_partitions._engines)
+        archive_service.archived_rows(db, Operation, [Operation.operation_id])
+        partitions = db.query(ArchivePartition).count()
+        check("repeated fleet reads reuse every decompressed partition",
+              len(cached) == partitions and all(archive_service._open_partitions._engines.get(k) is e
+                                                for k, e in cached.items()),
+              f"{len(cached)} of {partitions} partitions cached")
+        budget, archive_service._open_partitions.max_bytes = archive_service._open_partitions.max_bytes, 0
+        try:
+            first, second = db.query(ArchivePartition).limit(2).all()
+            with archive_service.open_partition(first) as engine:
+                with archive_service.open_partition(second):
+                    pass
+                with engine.connect() as conn:
+                    pinned = conn.execute(text("SELECT COUNT(*) FROM operations")).scalar()
+            check("partitions in use are never evicted", pinned == first.operation_count, f"{pinned} rows")
+        finally:
+            archive_service._open_partitions.max_bytes = budget
+
+        # Restore one report, archive it again (its partition is rewritten and drops the stale copy)
+        report = db.query(DailyReport).filter(DailyReport.well_id == active,
+                                              DailyReport.archive_partition_id.isnot(None)).first()
+        ops_before = [r for r in tables_before["operations"] if r[1] == report.report_id]
+        superseded = db.get(ArchivePartition, report.archive_partition_id).key
+        archive_service.restore_reports(db, [report])
+        restored = sorted(tuple(r) for r in db.execute(
+            select(Operation.__table__).where(Operation.report_id == report.report_id)))
+        check("restored report has its rows back with their ids", restored == ops_before, f"{len(restored)} rows")
+        check("restored report has no rollups",
+              not db.query(ReportRollup).filter(ReportRollup.report_id == report.report_id).count())
+        again = archive_service.run_archival(db, months=args.months, today=today)
+        partition = db.get(ArchivePartition, report.archive_partition_id)
+        with archive_service.open_partition(partition) as engine, engine.connect() as conn:
+            in_file = conn.execute(text("SELECT COUNT(*) FROM operations")).scalar()
+        check("re-archived report rewrites its partition without duplicates",
+              again["reports"] == 1 and in_file == partition.operation_count, f"{in_file} rows in the file")
+        check("superseded partition file is kept for the prune grace period",
+              partition.key != superseded and (Path(archive_service.ARCHIVE_DIR) / superseded).exists())
+
+        for name, url in requests.items():
+            if client.get(url).json() != before[name]:
+                check(f"{name} unchanged after the round trip", False)
+
+        archived_reports = db.query(DailyReport).filter(DailyReport.archive_partition_id.isnot(None)).all()
+        archive_service.restore_reports(db, archived_reports)
+        check("restoring everything gives back operations and events",
+              all(table(m) == tables_before[m.__tablename__] for m in (Operation, Event)))
+        check("no partitions or rollups left",
+              not db.query(ArchivePartition).count() and not db.query(ReportRollup).count())
+        for fts in ("operations_fts", "events_fts"):
+            try:
+                db.execute(text(f"INSERT INTO {fts}({fts}, rank) VALUES ('integrity-check', 1)"))
+                check(f"{fts} in sync with its table", True)
+            except Exception as e:
+                check(f"{fts} in sync with its table", False, str(e))
+        pruned = archive_service.prune_archive_files(db, grace_seconds=0)
+        check("emptied partition files are pruned",
+              pruned > 0 and not list(Path(archive_service.ARCHIVE_DIR).glob("*/*.sqlite*")), f"{pruned} files")
+
+        # Archive the well holding the newest ids, then swap the newest hot report:
+        # with max(id) + 1 its rows would get archived ids back
+        last_well = db.query(Operation.well_id).order_by(Operation.operation_id.desc()).limit(1).scalar()
+        db.query(Well).filter(Well.well_id == last_well).update({Well.well_status: "Completed"})
+        db.commit()
+        archive_service.run_archival(db, months=args.months, today=today)
+        archived_max = archive_service.archived_max_ids(db)
+        hot_max = db.query(func.max(Operation.operation_id)).scalar()
+        newest = db.get(DailyReport, db.query(Operation.report_id).order_by(Operation.operation_id.desc()).limit(1).scalar())
+        ops = db.query(Operation).filter(Operation.report_id == newest.report_id).order_by(Operation.operation_id).all()
+        evs = db.query(Event).filter(Event.report_id == newest.report_id).all()
+        payload = {
+            "operations": [{
+                "depth_from": o.depth_from, "depth_to": o.depth_to, "operation_type": o.operation_type,
+                "description": o.description, "duration_hours": o.duration_hours, "npt_hours": o.npt_hours,
+                "start_time_str": f"{o.start_time:%H:%M}" if o.start_time else None,
+                "end_time_str": f"{o.end_time:%H:%M}" if o.end_time else None,
+            } for o in ops],
+            "events": [{
+                "depth_from": e.depth_from, "depth_to": e.depth_to, "event_type": e.event_type,
+                "event_description": e.event_description, "event_duration_hours": e.event_duration_hours,
+                "npt_hours": e.npt_hours, "severity": e.severity, "equipment": e.equipment,
+                "actions_taken": e.actions_taken, "recorded_at": e.recorded_at,
+            } for e in evs],
+        }
+        job = BackfillJob(parser_type=newest.parser_type, parser_version=0, status="running", report_count=1)
+        db.add(job)
+        db.flush()
+        # Staged like stage_job (timestamps as strings); a second item's report was replaced after staging
+        replaced = db.query(DailyReport).filter(DailyReport.archive_partition_id.is_(None),
+                                                DailyReport.report_id != newest.report_id).first()
+        replaced_ops = db.query(Operation).filter(Operation.report_id == replaced.report_id).count()
+        db.add(BackfillItem(job_id=job.job_id, report_id=newest.report_id, status="staged",
+                            payload=json.dumps(payload, default=str), file_hash=newest.file_hash))
+        db.add(BackfillItem(job_id=job.job_id, report_id=replaced.report_id, status="staged",
+                            payload=json.dumps({"operations": [], "events": []}), file_hash="replaced"))
+        db.commit()
+        old_ids = [o.operation_id for o in ops]
+        result = swap_job(db, job)
+        check("swap skips reports replaced after staging",
+              result["skipped"] == 1 and result["swapped"] == 1
+              and db.query(Operation).filter(Operation.report_id == replaced.report_id).count() == replaced_ops,
+              f"{result}")
+        check("no event is left linked to a swapped-out operation",
+              not db.query(Event).filter(Event.operation_id.in_(old_ids)).count())
+        swapped = [o for (o,) in db.query(Operation.operation_id).filter(Operation.report_id == newest.report_id)]
+        swapped_events = [e for (e,) in db.query(Event.event_id).filter(Event.report_id == newest.report_id)]
+        check("swapped rows get ids above every archived id",
+              archived_max["operations"] > hot_max and min(swapped) > archived_max["operations"]
+              and (not swapped_events or min(swapped_events) > archived_max["events"]),
+              f"archived up to {archived_max['operations']}, hot up to {hot_max}, swapped from {min(swapped)}")
+        try:
+            archive_service.restore_reports(
+                db, db.query(DailyReport).filter(DailyReport.archive_partition_id.isnot(None)).all())
+            check("restoring after the swap keeps ids unique",
+                  db.query(func.count(Operation.operation_id)).scalar() == len(tables_before["operations"]))
+        except Exception as e:
+            db.rollback()
+            check("restoring after the swap keeps ids unique", False, str(e).splitlines()[0])
+
+    db.close()
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
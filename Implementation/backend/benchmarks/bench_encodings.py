@@ -0,0 +1,169 @@
+"""
+Serialization benchmark for the /segments and /operations encodings.
+
+Seeds one long synthetic well into a throwaway SQLite file, then for every
+available media type x content encoding (see app/encoding.py) reports the
+CPU time to serialize/compress the payload and the bytes on the wire. An
+end-to-end pass through the API checks that each negotiated response
+decodes back to the same rows as plain JSON.
+
+Usage (from Implementation/backend):
+    pip install -r requirements-dev.txt                  # httpx (TestClient)
+    python benchmarks/bench_encodings.py                 # 1 well x 365 days x 8 ops
+    python benchmarks/bench_encodings.py --days 1500 --repeat 20
+    python benchmarks/bench_encodings.py --json out.json
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def time_call(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def decode_rows(media_type: str, body: bytes, rows_key):
+    """
+    Turns any encoding back into a list of row dicts (for the round-trip check).
+    """
+    from app import encoding
+
+    if media_type == encoding.JSON:
+        data = json.loads(body)
+        return data[rows_key] if rows_key else data
+    if media_type == encoding.ARROW:
+        import pyarrow as pa
+
+        reader = pa.ipc.open_stream(body)
+        return reader.read_all().to_pylist()
+
+    data = encoding.msgpack.unpackb(body, raw=False) if media_type == encoding.MSGPACK else json.loads(body)
+    columns = {}
+    for name, col in data["columns"].items():
+        if isinstance(col, dict):
+            columns[name] = [col["dictionary"][c] if c >= 0 else None for c in col["codes"]]
+        else:
+            columns[name] = col
+    return [dict(zip(columns, values)) for values in zip(*columns.values())] if columns else []
+
+
+def bench_payload(name, rows, names, meta, rows_key, repeat: int):
+    from app import encoding
+
+    results = []
+    for media_type in encoding.available_media_types():
+        body = encoding.encode_rows(media_type, rows, names, meta, rows_key)
+        encode_s = time_call(lambda: encoding.encode_rows(media_type, rows, names, meta, rows_key), repeat)
+
+        for content_encoding in (None, "gzip", "br"):
+            wire = encoding.compress(body, content_encoding)
+            compress_s = time_call(lambda: encoding.compress(body, content_encoding), repeat) if content_encoding else 0.0
+            results.append({
+                "payload": name,
+                "media_type": media_type,
+                "content_encoding": content_encoding or "identity",
+                "rows": len(rows),
+                "bytes": len(wire),
+                "encode_ms": round(encode_s * 1000, 2),
+                "compress_ms": round(compress_s * 1000, 2),
+                "total_ms": round((encode_s + compress_s) * 1000, 2),
+            })
+
+    # Baseline: what FastAPI's default JSONResponse path costs (jsonable_encoder + json.dumps)
+    from fastapi.encoders import jsonable_encoder
+    payload = {**meta, rows_key: rows} if rows_key else rows
+    baseline = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode()
+    baseline_s = time_call(lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")), repeat)
+    results.insert(0, {
+        "payload": name, "media_type": "default (jsonable_encoder)", "content_encoding": "identity",
+        "rows": len(rows), "bytes": len(baseline), "encode_ms": round(baseline_s * 1000, 2),
+        "compress_ms": 0.0, "total_ms": round(baseline_s * 1000, 2),
+    })
+    return results
+
+
+def check_round_trip(client, well_id: str) -> int:
+    """
+    Every negotiated encoding of the live endpoints must decode to the JSON rows.
+    """
+    from app import encoding
+
+    failures = 0
+    for path, rows_key in ((f"/wells/{well_id}/segments", "segments"), (f"/wells/{well_id}/operations", None)):
+        reference = decode_rows(encoding.JSON, client.get(path, headers={"Accept-Encoding": "identity"}).content, rows_key)
+        for media_type in encoding.available_media_types():
+            for content_encoding in ("identity", "gzip"):
+                resp = client.get(path, headers={"Accept": media_type, "Accept-Encoding": content_encoding})
+                body = resp.content
+                # httpx transparently decodes gzip; decode manually only if it did not
+                if resp.headers.get("content-encoding") == "gzip" and body[:2] == b"\x1f\x8b":
+                    body = gzip.decompress(body)
+                ok = resp.status_code == 200 and decode_rows(media_type, body, rows_key) == reference
+                failures += 0 if ok else 1
+                print(f"  [{'OK' if ok else 'FAIL'}] {path} {media_type} {content_encoding}")
+    return failures
+
+
+def print_results(results) -> None:
+    print(f"{'payload':<11}{'media type':<40}{'enc':<10}{'bytes':>11}{'encode ms':>11}{'compress ms':>13}{'total ms':>10}")
+    for r in results:
+        print(f"{r['payload']:<11}{r['media_type']:<40}{r['content_encoding']:<10}{r['bytes']:>11,}"
+              f"{r['encode_ms']:>11}{r['compress_ms']:>13}{r['total_ms']:>10}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--ops-per-day", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    ap.add_argument("--json", type=Path, default=None, help="write the results as JSON")
+    args = ap.parse_args()
+
+    db_path = Path(tempfile.mkdtemp(prefix="encodings_")) / "encodings.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from fastapi.testclient import TestClient
+    from synthetic_fleet import seed_fleet
+    from app.main import app
+    from app import encoding
+
+    print(seed_fleet(1, args.days, args.ops_per_day))
+    well_id = "SYN-0000"
+    print(f"orjson={'yes' if encoding.orjson else 'no'}")
+
+    with TestClient(app) as client:
+        segments = client.get(f"/wells/{well_id}/segments").json()
+        operations = client.get(f"/wells/{well_id}/operations").json()
+
+        from app.routers.operations import SEGMENT_FIELDS, OPERATION_FIELDS
+        results = bench_payload(
+            "segments", segments["segments"], SEGMENT_FIELDS,
+            {"well_id": segments["well_id"], "depthMax": segments["depthMax"]}, "segments", args.repeat,
+        )
+        results += bench_payload("operations", operations, OPERATION_FIELDS, {}, None, args.repeat)
+        print_results(results)
+
+        print("\nRound trip through the API:")
+        failures = check_round_trip(client, well_id)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
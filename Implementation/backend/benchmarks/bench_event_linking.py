@@ -0,0 +1,109 @@
+"""
+Event -> operation linking benchmark + correctness check.
+
+Seeds a throwaway SQLite database with a synthetic fleet whose events are
+recorded inside known operations, runs the bulk linking pass
+(services/event_linking.link_fleet) and checks that:
+  - every event is linked, to an operation whose time window contains it
+  - the sweep-line join picks the same operation as a nested-loop reference
+  - a re-run without --relink has nothing left to do
+It also times the sweep against the nested loop on one well.
+
+Usage (from Implementation/backend):
+    python benchmarks/bench_event_linking.py
+    python benchmarks/bench_event_linking.py --wells 20 --days 365 --events-per-day 3
+
+Exit code is 1 when any check fails.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def nested_loop_reference(operations, events):
+    """
+    O(n * m) reference: every operation is a candidate for every event.
+    """
+    from app.services.event_linking import best_operation, _event_window, _operation_window, _overlap
+
+    links = {}
+    for e in events:
+        window = _event_window(e)
+        candidates = [op for op in operations if _overlap(window, _operation_window(op)) is not None]
+        links[e.event_id] = best_operation(e, candidates)
+    return links
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=10)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--events-per-day", type=float, default=2.0)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp(prefix='linking_')) / 'linking.db'}"
+
+    from app.database import SessionLocal
+    from app.models import Event, Operation
+    from app.services.event_linking import _EVENT_COLUMNS, _OPERATION_COLUMNS, link_fleet, match_events
+    from synthetic_fleet import seed_fleet
+
+    seeded = seed_fleet(args.wells, args.days, events_per_day=args.events_per_day)
+    print(f"seeded: {seeded}")
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        t0 = time.perf_counter()
+        result = link_fleet(db)
+        elapsed = time.perf_counter() - t0
+        print(f"link_fleet: {result} in {elapsed:.2f}s ({result['events'] / elapsed:,.0f} events/s)")
+
+        def check(name, ok, detail=""):
+            nonlocal failures
+            failures += 0 if ok else 1
+            print(f"[{'OK' if ok else 'FAIL'}] {name}" + (f"  ({detail})" if detail else ""))
+
+        check("every event linked", result["unlinked_total"] == 0, f"{result['unlinked_total']} unlinked")
+
+        outside = (
+            db.query(Event.event_id)
+            .join(Operation, Operation.operation_id == Event.operation_id)
+            .filter((Event.recorded_at < Operation.start_time) | (Event.recorded_at > Operation.end_time))
+            .count()
+        )
+        check("linked operation contains the event time", outside == 0, f"{outside} outside")
+
+        again = link_fleet(db)
+        check("second pass has nothing to link", again["events"] == 0)
+
+        well_id = "SYN-0000"
+        operations = db.query(*_OPERATION_COLUMNS).filter(Operation.well_id == well_id).all()
+        events = db.query(*_EVENT_COLUMNS).filter(Event.well_id == well_id).all()
+
+        t0 = time.perf_counter()
+        swept = match_events(operations, events)
+        t_sweep = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        reference = nested_loop_reference(operations, events)
+        t_nested = time.perf_counter() - t0
+
+        check("sweep matches nested-loop reference", swept == reference,
+              f"{sum(1 for k in swept if swept[k] != reference.get(k))} differ")
+        print(f"{well_id}: {len(operations)} operations x {len(events)} events: "
+              f"sweep {t_sweep * 1000:.1f} ms, nested loop {t_nested * 1000:.1f} ms")
+    finally:
+        db.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
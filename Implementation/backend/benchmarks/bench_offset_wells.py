@@ -0,0 +1,129 @@
+"""
+Offset-well lookup benchmark: depth-bucket index vs scanning every operation
+and event of the location's other wells.
+
+Seeds a synthetic fleet (with events) into a temporary database, then for
+random (well, depth window) pairs checks that the index returns exactly the
+problem intervals the brute-force scan finds, with the same overlaps, and
+times both. Also checks that re-indexing one report leaves the index unchanged.
+
+Usage (from Implementation/backend):
+    python benchmarks/bench_offset_wells.py
+    python benchmarks/bench_offset_wells.py --wells 100 --days 365 --lookups 200
+
+Exit code is 1 when any result differs.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def brute_force(db, well_id: str, location: str, depth_from: float, depth_to: float) -> dict:
+    """
+    (source, id) -> overlap_ft from every operation/event of the other wells in the location.
+    """
+    from app.models import Event, Operation, Well
+    from app.services.offset_wells import MAX_BUCKETS_PER_INTERVAL, bucket_of, event_level, operation_level
+
+    others = db.query(Well.well_id).filter(Well.location == location, Well.well_id != well_id)
+    found = {}
+
+    def consider(source, row_id, lo, hi, level):
+        if lo is None and hi is None or level is None:
+            return
+        values = [v for v in (lo, hi) if v is not None]
+        lo, hi = min(values), max(values)
+        if bucket_of(hi) - bucket_of(lo) >= MAX_BUCKETS_PER_INTERVAL:
+            return
+        overlap = min(hi, depth_to) - max(lo, depth_from)
+        if overlap >= 0:
+            found[(source, row_id)] = round(overlap, 1)
+
+    for o in db.query(Operation.operation_id, Operation.depth_from, Operation.depth_to, Operation.description,
+                      Operation.duration_hours, Operation.npt_hours).filter(Operation.well_id.in_(others)):
+        consider("operation", o.operation_id, o.depth_from, o.depth_to,
+                 operation_level(o.description, o.duration_hours, o.npt_hours))
+    for e in db.query(Event.event_id, Event.depth_from, Event.depth_to, Event.severity,
+                      Event.npt_hours).filter(Event.well_id.in_(others)):
+        consider("event", e.event_id, e.depth_from, e.depth_to, event_level(e.severity, e.npt_hours))
+    return found
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=40)
+    ap.add_argument("--days", type=int, default=180)
+    ap.add_argument("--events-per-day", type=float, default=1.5)
+    ap.add_argument("--lookups", type=int, default=60)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    db_path = Path(tempfile.mkdtemp(prefix="offset_")) / "offset.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.database import SessionLocal
+    from app.models import DailyReport, DepthBucket, Operation, Well
+    from app.services.offset_wells import MAX_OFFSET_INTERVALS, index_report, offset_intervals
+    from synthetic_fleet import seed_fleet
+
+    print(seed_fleet(args.wells, args.days, events_per_day=args.events_per_day))
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    failures = 0
+    t_index, t_scan = [], []
+    try:
+        entries = db.query(DepthBucket).count()
+        print(f"index entries: {entries}")
+        wells = db.query(Well.well_id, Well.location).all()
+        max_depth = db.query(Operation.depth_to).order_by(Operation.depth_to.desc()).limit(1).scalar() or 1000.0
+
+        for _ in range(args.lookups):
+            well_id, location = rng.choice(wells)
+            top = rng.uniform(0, max_depth)
+            bottom = top + rng.uniform(10, 1500)
+
+            t0 = time.perf_counter()
+            result = offset_intervals(db, well_id, top, bottom, limit=MAX_OFFSET_INTERVALS)
+            t1 = time.perf_counter()
+            expected = brute_force(db, well_id, location, top, bottom)
+            t2 = time.perf_counter()
+            t_index.append(t1 - t0)
+            t_scan.append(t2 - t1)
+
+            got = {(i["source"], i["id"]): i["overlapFt"] for i in result["intervals"]}
+            complete = not result["truncated"]
+            ok = result["count"] == len(expected) and all(expected.get(k) == v for k, v in got.items())
+            if complete:
+                ok = ok and got == expected
+            if not ok:
+                failures += 1
+                print(f"[FAIL] {well_id} {top:.0f}-{bottom:.0f} ft: index {result['count']}, scan {len(expected)}")
+
+        # Re-indexing a report (ingest replay / backfill swap) must not duplicate or drop entries
+        report_id, well_id = db.query(DailyReport.report_id, DailyReport.well_id).order_by(DailyReport.report_id).first()
+        index_report(db, well_id, report_id)
+        db.commit()
+        reindexed = db.query(DepthBucket).count()
+        print(f"[{'OK' if reindexed == entries else 'FAIL'}] re-indexing a report keeps {entries} entries (now {reindexed})")
+        failures += reindexed != entries
+    finally:
+        db.close()
+
+    print(f"[{'OK' if not failures else 'FAIL'}] {args.lookups} lookups match the brute-force scan")
+    print(f"index lookup: median {statistics.median(t_index) * 1000:.2f} ms, max {max(t_index) * 1000:.2f} ms")
+    print(f"full scan:    median {statistics.median(t_scan) * 1000:.2f} ms, max {max(t_scan) * 1000:.2f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
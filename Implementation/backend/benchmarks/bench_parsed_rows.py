@@ -0,0 +1,171 @@
+"""
+Parsed-row representation benchmark: per-row dicts (with raw_line) vs
+ParsedOperation records (raw_line only in debug mode), per 10k rows.
+
+Source rows are the table cells of real reports (parsed once in debug mode
+to recover them), cycled up to --rows. Measures:
+  - build: time and retained memory (tracemalloc) of the parser's row objects
+  - insert: loading the rows into operations (previous per-row ORM adds vs
+    insert_operations_events' single executemany), rolled back each time
+  - backfill payload: JSON size of the staged operations
+
+Usage (from Implementation/backend):
+    python benchmarks/bench_parsed_rows.py
+    python benchmarks/bench_parsed_rows.py --rows 50000 --repeat 5
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+DATA_DIR = BACKEND_DIR.parent / "data"
+
+
+def source_lines(data_dir: Path, files: int):
+    from app.parsers.nnpc_format_a import parse_nnpc_format_a
+
+    lines = []
+    for path in sorted((data_dir / "DDR OKOLOMA-2").rglob("*.pdf"))[:files]:
+        lines += [op.raw_line for op in parse_nnpc_format_a(path.read_bytes(), debug=True)["operations"]]
+    return lines
+
+
+def build_dicts(lines):
+    """
+    The previous parser output: one dict per row, joined source row kept.
+    """
+    rows = []
+    for line in lines:
+        cells = line.split(" | ")
+        rows.append({
+            "depth_from": float(cells[-3]) if cells[-3].replace(".", "", 1).isdigit() else None,
+            "depth_to": float(cells[-2]) if cells[-2].replace(".", "", 1).isdigit() else None,
+            "operation_type": "Drilling",
+            "description": cells[-1][:500],
+            "duration_hours": float(cells[2]) if cells[2].replace(".", "", 1).isdigit() else None,
+            "npt_hours": None,
+            "start_time_str": cells[0],
+            "end_time_str": cells[1],
+            "raw_line": " | ".join(cells),
+        })
+    return rows
+
+
+def build_records(lines, debug=False):
+    from app.parsers.base import ParsedOperation
+
+    rows = []
+    for line in lines:
+        cells = line.split(" | ")
+        rows.append(ParsedOperation(
+            depth_from=float(cells[-3]) if cells[-3].replace(".", "", 1).isdigit() else None,
+            depth_to=float(cells[-2]) if cells[-2].replace(".", "", 1).isdigit() else None,
+            operation_type="Drilling",
+            description=cells[-1][:500],
+            duration_hours=float(cells[2]) if cells[2].replace(".", "", 1).isdigit() else None,
+            npt_hours=None,
+            start_time_str=cells[0],
+            end_time_str=cells[1],
+            raw_line=" | ".join(cells) if debug else None,
+        ))
+    return rows
+
+
+def measure_build(build, lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        rows = build(lines)
+        best = min(best, time.perf_counter() - t0)
+        del rows
+    gc.collect()
+    tracemalloc.start()
+    rows = build(lines)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return best, retained, rows
+
+
+def orm_insert(db, report_id, well_id, ops, times):
+    """
+    The previous insert path: one ORM object per row, then a flush.
+    """
+    from app.models import Operation
+
+    for o, (start_time, end_time) in zip(ops, times):
+        db.add(Operation(
+            report_id=report_id, well_id=well_id, depth_from=o.get("depth_from"), depth_to=o.get("depth_to"),
+            operation_type=o.get("operation_type"), description=o.get("description"), start_time=start_time,
+            end_time=end_time, duration_hours=o.get("duration_hours"), npt_hours=o.get("npt_hours"),
+        ))
+    db.flush()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--files", type=int, default=10)
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp(prefix='rows_')) / 'rows.db'}"
+    from app.database import engine, SessionLocal
+    from app.migrations import run_migrations
+    from app.models import DailyReport, Well
+    from app.services.ingestion_service import insert_operations_events
+    from app.services.timeline_service import operation_times
+
+    base = source_lines(args.data_dir, args.files)
+    if not base:
+        print(f"No operation rows found under {args.data_dir}")
+        return 1
+    lines = (base * (args.rows // len(base) + 1))[: args.rows]
+    per = 10_000 / len(lines)
+
+    print(f"{len(lines)} rows from {len(base)} source rows; figures per 10k rows")
+    results = {}
+    for name, build in (("dict + raw_line", build_dicts), ("ParsedOperation", build_records)):
+        seconds, retained, rows = measure_build(build, lines, args.repeat)
+        payload = len(json.dumps([r if isinstance(r, dict) else r.to_dict() for r in rows]))
+        results[name] = rows
+        print(f"  {name:<16} build {seconds * per * 1000:7.1f} ms   retained {retained * per / 1e6:6.2f} MB"
+              f"   backfill payload {payload * per / 1e6:5.2f} MB")
+
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        db.add(Well(well_id="BENCH", well_name="BENCH", location=None))
+        db.add(DailyReport(report_id=1, well_id="BENCH", report_date=date(2025, 1, 1), source_filename="x.pdf",
+                           parser_type="NNPC_FORMAT_A", file_hash="x"))
+        db.commit()
+
+        for name, run in (
+            ("per-row ORM adds", lambda ops: orm_insert(db, 1, "BENCH", ops, operation_times(date(2025, 1, 1), ops))),
+            ("executemany", lambda ops: insert_operations_events(db, 1, "BENCH", {"operations": ops}, date(2025, 1, 1), commit=False)),
+        ):
+            rows = results["dict + raw_line" if name.startswith("per-row") else "ParsedOperation"]
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                run(rows)
+                best = min(best, time.perf_counter() - t0)
+                db.rollback()
+            print(f"  insert, {name:<16} {best * per * 1000:7.1f} ms")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
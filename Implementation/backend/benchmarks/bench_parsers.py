@@ -0,0 +1,165 @@
+"""
+Parser benchmark + golden-output regression check.
+
+Runs every registered parser (ingestion_service.PARSERS) over the sample
+reports in Implementation/data and reports pages/sec, rows/sec, peak RSS and
+per-stage timings (open, preview, load, locate, extract_tables, row_filter) and the
+share of page area that went through table extraction. Parsed rows are
+compared with the stored golden outputs in benchmarks/golden/.
+
+Usage (from Implementation/backend):
+    python benchmarks/bench_parsers.py                  # benchmark + compare
+    python benchmarks/bench_parsers.py --limit 10       # first 10 files only
+    python benchmarks/bench_parsers.py --update-golden  # re-record golden outputs
+    python benchmarks/bench_parsers.py --json out.json  # also write the report as JSON
+    python benchmarks/bench_parsers.py --cold           # forget learned layouts before each file
+
+Exit code is 1 when any parser output differs from its golden file.
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.ingestion_service import PARSERS, _parser_module, get_parser  # noqa: E402
+
+DATA_DIR = BACKEND_DIR.parent / "data"
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+# Fields compared against golden output (raw_line is debug-only and not compared)
+GOLDEN_FIELDS = (
+    "depth_from", "depth_to", "operation_type", "description",
+    "duration_hours", "npt_hours", "start_time_str", "end_time_str",
+)
+
+
+def corpus_files(data_dir: Path):
+    files = sorted((data_dir / "DDR OKOLOMA-2").rglob("*.pdf"))
+    single = data_dir / "dailydrilling.pdf"
+    if single.exists():
+        files.append(single)
+    return files
+
+
+def golden_rows(parsed: dict):
+    return [{k: op.get(k) for k in GOLDEN_FIELDS} for op in parsed.get("operations", [])]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_parser(name, parse, files, data_dir: Path, update_golden: bool, cold: bool = False):
+    golden_path = GOLDEN_DIR / f"{name.lower()}.json"
+    golden = {}
+    if golden_path.exists() and not update_golden:
+        golden = json.loads(golden_path.read_text(encoding="utf-8"))
+
+    stages = {}
+    areas = []
+    pages = rows = 0
+    mismatched, missing = [], []
+    recorded = {}
+
+    start = time.perf_counter()
+    for f in files:
+        key = f.relative_to(data_dir).as_posix()
+        if cold:
+            # Output must not depend on which layouts this process has already seen
+            getattr(_parser_module(name), "_TEMPLATES", {}).clear()
+        parsed = parse(f.read_bytes())
+
+        pages += parsed.get("page_count", 0)
+        rows += len(parsed.get("operations", []))
+        if parsed.get("extracted_area") is not None:
+            areas.append(parsed["extracted_area"])
+        for stage, seconds in (parsed.get("timings") or {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+        out = golden_rows(parsed)
+        recorded[key] = out
+        if update_golden:
+            continue
+        if key not in golden:
+            missing.append(key)
+        elif golden[key] != out:
+            mismatched.append(key)
+    elapsed = time.perf_counter() - start
+
+    if update_golden:
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+        golden_path.write_text(json.dumps(recorded, indent=1, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    return {
+        "parser": name,
+        "files": len(files),
+        "pages": pages,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+        "rows_per_sec": round(rows / elapsed, 2) if elapsed else None,
+        "stage_seconds": {k: round(v, 3) for k, v in stages.items()},
+        "extracted_area": round(sum(areas) / len(areas), 3) if areas else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "golden": "updated" if update_golden else {"mismatched": mismatched, "missing": missing},
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"== {result['parser']}")
+    print(f"  files={result['files']} pages={result['pages']} rows={result['rows']} time={result['seconds']}s")
+    print(f"  pages/sec={result['pages_per_sec']} rows/sec={result['rows_per_sec']} peak RSS={result['peak_rss_mb']} MB")
+    total = sum(result["stage_seconds"].values()) or 1.0
+    for stage, seconds in result["stage_seconds"].items():
+        print(f"  {stage:<15} {seconds:>8.3f}s  {100 * seconds / total:5.1f}%")
+    if result["extracted_area"] is not None:
+        print(f"  page area extracted: {100 * result['extracted_area']:.1f}% (mean per file)")
+    golden = result["golden"]
+    if golden == "updated":
+        print("  golden: updated")
+    else:
+        print(f"  golden: {len(golden['mismatched'])} mismatched, {len(golden['missing'])} missing")
+        for key in golden["mismatched"]:
+            print(f"    MISMATCH {key}")
+        for key in golden["missing"]:
+            print(f"    MISSING  {key}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--parser", action="append", help="parser_type to run (default: all registered)")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--limit", type=int, default=None, help="only the first N files")
+    ap.add_argument("--update-golden", action="store_true")
+    ap.add_argument("--json", type=Path, default=None, help="write the report as JSON")
+    ap.add_argument("--cold", action="store_true", help="forget learned layout templates before each file")
+    args = ap.parse_args()
+
+    files = corpus_files(args.data_dir)[: args.limit]
+    if not files:
+        print(f"No PDFs found under {args.data_dir}")
+        return 1
+
+    names = args.parser or list(PARSERS)
+    results = []
+    for name in names:
+        result = run_parser(name, get_parser(name), files, args.data_dir, args.update_golden, args.cold)
+        print_report(result)
+        results.append(result)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    failed = any(r["golden"] != "updated" and (r["golden"]["mismatched"] or r["golden"]["missing"]) for r in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
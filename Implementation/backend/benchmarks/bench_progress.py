@@ -0,0 +1,141 @@
+"""
+Progress/ROP curve benchmark: vectorized compute vs a row-by-row reference,
+and a multi-well request cold vs cached.
+
+Seeds a synthetic fleet into a temporary database, checks every well's
+totals (elapsed hours, footage, drilling hours, flat hours, NPT, end depth)
+and full-resolution curve against a plain Python loop over the same rows,
+then times fleet_progress() for all wells at once, cold and warm.
+
+Usage (from Implementation/backend):
+    python benchmarks/bench_progress.py
+    python benchmarks/bench_progress.py --wells 60 --days 365 --points 300
+
+Exit code is 1 when any result differs.
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def reference(cols) -> dict:
+    """
+    Same definitions as progress_service.compute_progress, one row at a time.
+    """
+    n = len(cols["duration"])
+    day_start = {}
+    clock, depth, start_depth = None, None, None
+    totals = {"footage": 0.0, "drilling": 0.0, "flat": 0.0, "npt": 0.0}
+    t0, last_end, curve = None, 0.0, []
+    running = 0.0
+
+    for i in range(n):
+        dur = cols["duration"][i]
+        dur = 0.0 if math.isnan(dur) else max(dur, 0.0)
+        day = int(cols["day"][i])
+        if day not in day_start:
+            day_start[day] = running
+        start = cols["start"][i]
+        if math.isnan(start):
+            start = (day - 719163) * 24.0 + (running - day_start[day])
+        running += dur
+        t0 = start if t0 is None else t0
+
+        values = [v for v in (cols["depth_from"][i], cols["depth_to"][i]) if not math.isnan(v)]
+        if values and start_depth is None:
+            start_depth = depth = min(values)
+        if values:
+            depth = max(depth, max(values))
+        made = depth - (curve[-1][1] if curve else (start_depth if start_depth is not None else depth)) if depth is not None else 0.0
+
+        if made > 0:
+            totals["footage"] += made
+            totals["drilling"] += dur
+        elif dur > 0:
+            totals["flat"] += dur
+        npt = cols["npt"][i]
+        totals["npt"] += 0.0 if math.isnan(npt) else npt
+        last_end = max(last_end, start + dur - t0)
+        curve.append((start + dur - t0, depth))
+
+    return {"totals": totals, "elapsed": last_end, "curve": curve, "depth_end": depth}
+
+
+def close(a, b, tol=0.06) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= tol
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=40)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--points", type=int, default=500)
+    args = ap.parse_args()
+
+    db_path = Path(tempfile.mkdtemp(prefix="progress_")) / "progress.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.database import SessionLocal
+    from app.models import Well
+    from app.services.progress_service import MAX_POINTS, compute_progress, fleet_progress, load_well_columns
+    from synthetic_fleet import seed_fleet
+
+    print(seed_fleet(args.wells, args.days))
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        well_ids = [w for (w,) in db.query(Well.well_id).order_by(Well.well_id)]
+
+        for well_id in well_ids:
+            cols = load_well_columns(db, well_id)
+            got = compute_progress(cols, MAX_POINTS)
+            ref = reference(cols)
+            s = got["summary"]
+            ok = (
+                close(s["elapsedHours"], ref["elapsed"])
+                and close(s["footage"], ref["totals"]["footage"], 0.5)
+                and close(s["drillingHours"], ref["totals"]["drilling"])
+                and close(s["flatHours"], ref["totals"]["flat"])
+                and close(s["nptHours"], ref["totals"]["npt"])
+                and close(s["depthEnd"], ref["depth_end"])
+            )
+            if len(ref["curve"]) + 1 <= MAX_POINTS:
+                ok = ok and all(
+                    close(t, rt) and close(d, rd)
+                    for t, d, (rt, rd) in zip(got["curve"]["elapsedHours"][1:], got["curve"]["depth"][1:], ref["curve"])
+                )
+            if not ok:
+                failures += 1
+                print(f"[FAIL] {well_id}: {s} vs {ref['totals']}, elapsed {ref['elapsed']}")
+        print(f"[{'OK' if not failures else 'FAIL'}] {len(well_ids)} wells match the row-by-row reference")
+
+        t0 = time.perf_counter()
+        cold = fleet_progress(db, well_ids, args.points)
+        t1 = time.perf_counter()
+        warm = fleet_progress(db, well_ids, args.points)
+        t2 = time.perf_counter()
+        same = cold == warm
+        failures += not same
+        longest = max(len(w["curve"]["elapsedHours"]) for w in cold["wells"])
+        print(f"[{'OK' if same else 'FAIL'}] cached result equals computed result")
+        print(f"{len(well_ids)} wells, <= {longest} points per curve: cold {(t1 - t0) * 1000:.0f} ms, "
+              f"cached {(t2 - t1) * 1000:.1f} ms")
+    finally:
+        db.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
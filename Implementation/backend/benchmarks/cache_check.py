@@ -0,0 +1,157 @@
+"""
+Two-tier cache check: simulates several API workers sharing one cache server.
+
+Each "worker" is its own TieredCache (own LRU, own invalidation subscriber)
+pointed at the same Redis-protocol server: by default an in-process stand-in
+(fakeredis), or a real server with --url. Checks:
+  - a result computed by one worker is served to the others from the shared tier
+  - a burst of concurrent misses on one key computes once across all workers
+  - invalidating a well reaches every worker (pub/sub) and bumps its version
+  - other wells' entries survive a well's invalidation
+  - the local-only cache (no CACHE_URL) invalidates too
+
+Usage (from Implementation/backend):
+    pip install -r requirements-dev.txt         # fakeredis stand-in server, not needed with --url
+    python benchmarks/cache_check.py
+    python benchmarks/cache_check.py --url redis://localhost:6379/15 --workers 8
+
+Exit code is 1 when any check fails.
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.cache import TieredCache  # noqa: E402
+
+INVALIDATION_WAIT_SECONDS = 3.0
+
+
+def shared_clients(url: str, n: int):
+    if url:
+        import redis
+        first = redis.Redis.from_url(url)
+        first.flushdb()
+        return [redis.Redis.from_url(url) for _ in range(n)]
+    import fakeredis
+    server = fakeredis.FakeServer()
+    return [fakeredis.FakeRedis(server=server) for _ in range(n)]
+
+
+class Counted:
+    """
+    compute() stand-in that counts calls and takes a little while (a dashboard query).
+    """
+    def __init__(self, value, seconds: float = 0.0):
+        self.value = value
+        self.seconds = seconds
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.seconds)
+        return self.value
+
+
+def wait_until(predicate, timeout: float = INVALIDATION_WAIT_SECONDS) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def run_checks(workers, local_only) -> list:
+    results = []
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        results.append(ok)
+        print(f"[{'OK' if ok else 'FAIL'}] {name}" + (f"  ({detail})" if detail else ""))
+
+    # 1) shared tier serves other workers
+    compute = Counted({"nptHours": 1.5, "segments": [{"from": 0.0, "to": 10.0}]})
+    values = [w.get_or_compute("W1", "dashboard", compute) for w in workers]
+    check("one computation serves every worker", compute.calls == 1 and all(v == values[0] for v in values),
+          f"computed {compute.calls}x")
+
+    # 2) stampede: 8 threads per worker miss the same key at once
+    compute = Counted({"kpis": 42}, seconds=0.3)
+    barrier = threading.Barrier(8 * len(workers))
+
+    def hit(w):
+        barrier.wait()
+        w.get_or_compute("W2", "kpis", compute)
+
+    threads = [threading.Thread(target=hit, args=(w,)) for w in workers for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("concurrent misses compute once", compute.calls == 1, f"{len(threads)} requests, computed {compute.calls}x")
+
+    # 3) invalidation reaches every worker, other wells untouched
+    old = {w: w.key("W1", "dashboard") for w in workers}
+    workers[0].invalidate_well("W1")
+    dropped = wait_until(lambda: all(w.key("W1", "dashboard") != old[w] for w in workers))
+    check("invalidation reaches every worker", dropped)
+
+    compute = Counted({"nptHours": 9.0})
+    values = [w.get_or_compute("W1", "dashboard", compute) for w in workers]
+    check("invalidated well is recomputed once", compute.calls == 1 and all(v == {"nptHours": 9.0} for v in values),
+          f"computed {compute.calls}x")
+
+    compute = Counted({"kpis": 0})
+    for w in workers:
+        w.get_or_compute("W2", "kpis", compute)
+    check("other wells stay cached", compute.calls == 0)
+
+    # 4) fleet-wide invalidation (risk rescore)
+    workers[-1].invalidate_all()
+    compute = Counted({"kpis": 7})
+    wait_until(lambda: all(not len(w.local) for w in workers))
+    for w in workers:
+        w.get_or_compute("W2", "kpis", compute)
+    check("fleet invalidation drops every well", compute.calls == 1, f"computed {compute.calls}x")
+
+    # 5) local-only cache
+    compute = Counted({"x": 1})
+    local_only.get_or_compute("W1", "dashboard", compute)
+    local_only.get_or_compute("W1", "dashboard", compute)
+    local_only.invalidate_well("W1")
+    local_only.get_or_compute("W1", "dashboard", compute)
+    check("local-only cache hits and invalidates", compute.calls == 2, f"computed {compute.calls}x")
+
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="", help="real Redis-protocol server (default: fakeredis stand-in)")
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    try:
+        clients = shared_clients(args.url, args.workers)
+    except ImportError as e:
+        print(f"Cannot build the shared tier: {e}")
+        return 1
+
+    workers = [TieredCache(shared=c) for c in clients]
+    try:
+        results = run_checks(workers, TieredCache())
+    finally:
+        for w in workers:
+            w.close()
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Query-plan check for the hot queries.
+
+Builds a throwaway SQLite database through the migrations, seeds a small
+synthetic fleet, runs ANALYZE, then asserts that EXPLAIN QUERY PLAN for the
+router queries uses the intended composite/covering indexes (and no full
+scans or temp sorts).
+
+Usage (from Implementation/backend):
+    python benchmarks/explain_plans.py            # exit 1 if any plan regresses
+    python benchmarks/explain_plans.py --verbose  # print every plan
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def explain(db, query) -> str:
+    """
+    EXPLAIN QUERY PLAN for an ORM query (or Core select), returned as one string per plan row.
+    """
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(dialect=db.bind.dialect, compile_kwargs={"render_postcompile": True})
+    params = []
+    for name in compiled.positiontup:
+        v = compiled.params[name]
+        params.append(v.isoformat(sep=" ") if isinstance(v, datetime) else v.isoformat() if isinstance(v, date) else v)
+
+    cursor = db.connection().connection.cursor()
+    rows = cursor.execute("EXPLAIN QUERY PLAN " + str(compiled), params).fetchall()
+    return "\n".join(r[-1] for r in rows)
+
+
+def hot_queries(db, well_id: str):
+    """
+    (name, ORM query, must contain, must not contain) mirroring the routers.
+    """
+    from app.models import Operation, DailyReport, Event, ReportRollup
+    from app.services.archive_service import catalog_query
+    from app.services.offset_wells import offset_query
+    from app.services.progress_service import progress_query
+    from app.services.timeline_service import timeline_query
+
+    segment_cols = (
+        Operation.operation_id, Operation.depth_from, Operation.depth_to, Operation.operation_type, Operation.description,
+        Operation.npt_hours, Operation.duration_hours, DailyReport.report_date,
+    )
+
+    yield (
+        "dashboard: operations by well ordered by depth",
+        db.query(Operation).filter(Operation.well_id == well_id).order_by(Operation.depth_from.asc()),
+        ["ix_operations_well_depth"],
+        ["USE TEMP B-TREE", "SCAN operations"],
+    )
+    yield (
+        "segments: projection ordered by operation_id",
+        db.query(*segment_cols)
+        .join(DailyReport, DailyReport.report_id == Operation.report_id)
+        .filter(Operation.well_id == well_id)
+        .order_by(Operation.operation_id.asc()),
+        ["COVERING INDEX ix_operations_segment_cover"],
+        ["USE TEMP B-TREE", "SCAN operations"],
+    )
+    yield (
+        "segments: date window joined on report date",
+        db.query(*segment_cols)
+        .join(DailyReport, DailyReport.report_id == Operation.report_id)
+        .filter(Operation.well_id == well_id)
+        .filter(DailyReport.well_id == well_id)
+        .filter(DailyReport.report_date >= date(2025, 3, 1), DailyReport.report_date <= date(2025, 3, 7))
+        .order_by(Operation.operation_id.asc()),
+        ["ux_daily_reports_well_date"],
+        ["SCAN operations", "SCAN daily_reports"],
+    )
+    yield (
+        "operations of one report",
+        db.query(Operation).filter(Operation.well_id == well_id, Operation.report_id == 10),
+        ["ix_operations_well_report"],
+        ["SCAN operations"],
+    )
+    yield (
+        "timeline: operations of several wells overlapping a time window",
+        timeline_query(db, [well_id, "SYN-0004"], datetime(2025, 3, 1, 6), datetime(2025, 3, 2, 18)),
+        ["ix_operations_well_start"],
+        ["SCAN operations"],
+    )
+    yield (
+        "drill-down: events linked to one operation",
+        db.query(Event).filter(Event.operation_id == 100).order_by(Event.recorded_at.asc(), Event.event_id.asc()),
+        ["ix_events_operation_id"],
+        ["SCAN events"],
+    )
+    yield (
+        "offset wells: problem intervals of a location in a depth window",
+        offset_query(db, "ONITSHA", well_id, 1500.0, 2500.0),
+        ["PRIMARY KEY (location=? AND bucket>? AND bucket<?)"],
+        ["SCAN depth_buckets", "operations", "events"],
+    )
+    yield (
+        "progress: a well's operations with their report dates",
+        progress_query(well_id),
+        ["USING INDEX ix_operations_", "daily_reports USING INTEGER PRIMARY KEY"],
+        ["SCAN operations", "SCAN daily_reports"],
+    )
+    yield (
+        "archive catalog: archived reports of a well in a date window",
+        catalog_query(db, [well_id], date(2025, 3, 1), date(2025, 3, 31)),
+        ["ux_daily_reports_well_date"],
+        ["SCAN daily_reports"],
+    )
+    yield (
+        "dashboard: rollups of a well's archived days",
+        db.query(ReportRollup).filter(ReportRollup.well_id == well_id, ReportRollup.source == "operation"),
+        ["PRIMARY KEY (well_id=? AND source=?)"],
+        ["SCAN report_rollups"],
+    )
+    yield (
+        "daily report by (well, date)",
+        db.query(DailyReport).filter(DailyReport.well_id == well_id, DailyReport.report_date == date(2025, 3, 1)),
+        ["ux_daily_reports_well_date"],
+        ["SCAN daily_reports"],
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=20)
+    ap.add_argument("--days", type=int, default=120)
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    db_path = Path(tempfile.mkdtemp(prefix="explain_")) / "plans.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import text
+    from app.database import engine, SessionLocal
+    from app.migrations import run_migrations
+    from synthetic_fleet import seed_fleet
+
+    run_migrations(engine)
+    seed_fleet(args.wells, args.days)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        for name, query, must, must_not in hot_queries(db, "SYN-0003"):
+            plan = explain(db, query)
+            missing = [m for m in must if m not in plan]
+            forbidden = [m for m in must_not if m in plan]
+            ok = not missing and not forbidden
+            failures += 0 if ok else 1
+
+            print(f"[{'OK' if ok else 'FAIL'}] {name}")
+            if args.verbose or not ok:
+                print("    " + plan.replace("\n", "\n    "))
+            for m in missing:
+                print(f"    expected: {m}")
+            for m in forbidden:
+                print(f"    unexpected: {m}")
+    finally:
+        db.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Import-time budget for the API process (worker boot / autoscaling cost).
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the median cumulative import time, the slowest top-level imports and
+the time on top of the bare framework (`import fastapi, sqlalchemy.orm`).
+Fails when:
+  - a lazily-loaded heavy stack (PDF parsing, NumPy, pandas, redis) is imported, or
+  - the app's own import cost exceeds the budget.
+
+Usage (from Implementation/backend):
+    python benchmarks/import_time.py                     # default budget
+    python benchmarks/import_time.py --budget-ms 250 --runs 7
+    python benchmarks/import_time.py --json out.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Must only load on first ingest / rescore (redis: only with CACHE_URL set), never at startup
+FORBIDDEN_AT_STARTUP = ("pdfplumber", "pdfminer", "pypdfium2", "PIL", "numpy", "pandas", "pyarrow", "redis")
+
+# Extra milliseconds app.main may add on top of importing fastapi + sqlalchemy.orm
+DEFAULT_BUDGET_MS = 300.0
+
+
+def import_profile(statement: str, env: dict) -> dict:
+    """
+    module -> (self_us, cumulative_us, depth) from one -X importtime run.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def measure(runs: int) -> dict:
+    # A throwaway database, so nothing touches drilling.db even if an import had side effects
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{Path(tempfile.mkdtemp(prefix='importtime_')) / 'import.db'}"}
+
+    # Warm-up: compile .pyc files so the runs measure imports, not compilation
+    import_profile("import app.main", env)
+
+    app_ms, framework_ms, profiles = [], [], []
+    for _ in range(runs):
+        app_profile = import_profile("import app.main", env)
+        framework = import_profile("import fastapi, sqlalchemy.orm", env)
+        app_ms.append(app_profile["app.main"][1] / 1000)
+        framework_ms.append((framework["fastapi"][1] + framework["sqlalchemy.orm"][1]) / 1000)
+        profiles.append(app_profile)
+
+    profile = profiles[len(profiles) // 2]
+    top_level = sorted(
+        ((name, cum / 1000) for name, (_, cum, depth) in profile.items() if depth <= 1 and name != "app.main"),
+        key=lambda item: -item[1],
+    )[:12]
+
+    return {
+        "runs": runs,
+        "app_main_ms": round(statistics.median(app_ms), 1),
+        "framework_ms": round(statistics.median(framework_ms), 1),
+        "app_overhead_ms": round(statistics.median(a - f for a, f in zip(app_ms, framework_ms)), 1),
+        "forbidden_imported": sorted({
+            name.split(".")[0] for name in profile if name.split(".")[0] in FORBIDDEN_AT_STARTUP
+        }),
+        "slowest_imports_ms": [(name, round(ms, 1)) for name, ms in top_level],
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                    help=f"max import time app.main adds over the framework (default {DEFAULT_BUDGET_MS})")
+    ap.add_argument("--json", type=Path, default=None, help="write the report as JSON")
+    args = ap.parse_args()
+
+    report = measure(args.runs)
+    report["budget_ms"] = args.budget_ms
+
+    print(f"import app.main: {report['app_main_ms']} ms (median of {report['runs']})")
+    print(f"  framework (fastapi + sqlalchemy.orm): {report['framework_ms']} ms")
+    print(f"  app overhead: {report['app_overhead_ms']} ms (budget {args.budget_ms} ms)")
+    print("  slowest top-level imports:")
+    for name, ms in report["slowest_imports_ms"]:
+        print(f"    {name:<40} {ms:>8.1f} ms")
+
+    failed = False
+    if report["forbidden_imported"]:
+        print(f"FAIL: imported at startup: {', '.join(report['forbidden_imported'])}")
+        failed = True
+    if report["app_overhead_ms"] > args.budget_ms:
+        print(f"FAIL: app overhead {report['app_overhead_ms']} ms exceeds budget {args.budget_ms} ms")
+        failed = True
+    if not failed:
+        print("OK")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Live update check: SSE deltas reach clients connected to any worker.
+
+Simulates API workers as separate LiveHub instances, each with its own client
+to one Redis-protocol server (an in-process stand-in, fakeredis, or a real
+server with --url), the way each uvicorn worker has its own cache client.
+Checks:
+  - a report published on one worker reaches clients of every other worker
+  - a well watched on one worker is watched for all of them
+  - event ids are shared, so Last-Event-ID replays on another worker
+  - a missed event (id gap) makes connected clients resync
+  - without a shared tier the hub still delivers locally
+
+Usage (from Implementation/backend):
+    pip install -r requirements-dev.txt         # fakeredis stand-in server, not needed with --url
+    python benchmarks/live_check.py
+    python benchmarks/live_check.py --url redis://localhost:6379/15
+
+Exit code is 1 when any check fails.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.live_updates import LiveHub  # noqa: E402
+
+DELIVERY_WAIT_SECONDS = 3.0
+
+
+def shared_clients(url: str, n: int):
+    if url:
+        import redis
+        first = redis.Redis.from_url(url)
+        first.flushdb()
+        return [redis.Redis.from_url(url) for _ in range(n)]
+    import fakeredis
+    server = fakeredis.FakeServer()
+    return [fakeredis.FakeRedis(server=server) for _ in range(n)]
+
+
+def parse(message: str):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields.get("event"), int(fields["id"]) if "id" in fields else None, fields.get("data")
+
+
+async def next_message(queue: asyncio.Queue):
+    try:
+        return parse(await asyncio.wait_for(queue.get(), timeout=DELIVERY_WAIT_SECONDS))
+    except asyncio.TimeoutError:
+        return None
+
+
+async def run(url: str, workers: int) -> int:
+    results = []
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        results.append(ok)
+        print(f"[{'OK' if ok else 'FAIL'}] {name}" + (f"  ({detail})" if detail else ""))
+
+    loop = asyncio.get_running_loop()
+    clients = shared_clients(url, workers + 1)
+    hubs = [LiveHub(lambda c=c: c) for c in clients[:workers]]
+    try:
+        well = "LIVE-1"
+        check("unwatched well is not published", not hubs[0].is_watched(well))
+
+        queues = []
+        for hub in hubs[1:]:
+            queues.append(hub.subscribe(well))
+            await loop.run_in_executor(None, hub.watch, well)
+        check("a well watched on one worker is watched on all", hubs[0].is_watched(well))
+
+        event_id = await loop.run_in_executor(None, hubs[0].publish, well, "report", {"reportId": 1})
+        received = [await next_message(q) for q in queues]
+        check("a report published on one worker reaches every other worker",
+              all(r is not None and r[:2] == ("report", event_id) and json.loads(r[2])["reportId"] == 1
+                  for r in received),
+              f"{sum(r is not None for r in received)} of {len(queues)} workers")
+
+        second = await loop.run_in_executor(None, hubs[-1].publish, well, "report", {"reportId": 2})
+        for q in queues:
+            await next_message(q)
+        # A client that saw the first event reconnects to another worker
+        replay = hubs[1].subscribe(well, last_event_id=event_id)
+        got = await next_message(replay)
+        check("Last-Event-ID replays across workers (shared ids)",
+              got is not None and got[:2] == ("report", second), f"{got}")
+
+        # Event ids skip one: a message was missed
+        seq = f"drilling:live:seq:{well}"
+        await loop.run_in_executor(None, clients[-1].incr, seq)
+        await loop.run_in_executor(None, hubs[0].publish, well, "report", {"reportId": 4})
+        got = [await next_message(queues[0]), await next_message(queues[0])]
+        check("a missed event makes connected clients resync",
+              got[0] is not None and got[0][0] == "resync" and got[1] is not None and got[1][0] == "report",
+              f"{[g[0] if g else None for g in got]}")
+
+        local = LiveHub(lambda: None)
+        queue = local.subscribe(well)
+        local_id = local.publish(well, "report", {"reportId": 1})
+        got = await next_message(queue)
+        check("local-only hub delivers to its own clients", got is not None and got[1] == local_id)
+    finally:
+        for hub in hubs:
+            hub.close()
+
+    return 0 if all(results) else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="", help="Redis URL (default: in-process fakeredis)")
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+    return asyncio.run(run(args.url, args.workers))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
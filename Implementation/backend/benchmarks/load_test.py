@@ -0,0 +1,190 @@
+"""
+End-to-end API load test against a local stand-in database.
+
+Seeds a synthetic fleet (benchmarks/synthetic_fleet.py) into a throwaway
+SQLite file, then drives mixed traffic in-process through httpx's ASGI
+transport and reports p50/p90/p99 latency and throughput per endpoint.
+
+Usage (from Implementation/backend):
+    pip install -r requirements-dev.txt         # httpx
+    python benchmarks/load_test.py --wells 10 --days 365 --requests 2000 --concurrency 16
+    python benchmarks/load_test.py --wells 1000 --days 365 --db /tmp/fleet_1000.db   # reused on the next run
+    python benchmarks/load_test.py --mix dashboard=40,segments=40,upload=0
+
+Endpoints in the mix: wells, dashboard, segments, operations, search, timeline, upload.
+Uploads post a real report from data/DDR OKOLOMA-2 for dates after the seeded range.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_MIX = "wells=5,dashboard=30,segments=30,operations=30,upload=5"
+SEARCH_TERMS = ["STUCK", '"NO SUCCESS"', "MUD PUMP", "TOP DRIVE", "REAM*", "BOP"]
+DEFAULT_PDF = next(iter(sorted((BACKEND_DIR.parent / "data" / "DDR OKOLOMA-2").rglob("*.pdf"))), None)
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, weight = part.split("=")
+        if float(weight) > 0:
+            mix[name.strip()] = float(weight)
+    return mix
+
+
+async def run_load(app, well_ids, days: int, mix: dict, total_requests: int, concurrency: int, pdf_path: Path) -> dict:
+    import httpx
+    from synthetic_fleet import START_DATE
+
+    rng = random.Random(7)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    pdf_bytes = pdf_path.read_bytes() if pdf_path and "upload" in mix else b""
+    upload_day = {"next": days}
+
+    latencies = {n: [] for n in names}
+    errors = {n: 0 for n in names}
+    remaining = {"n": total_requests}
+
+    def build_request(kind: str):
+        well_id = rng.choice(well_ids)
+        if kind == "wells":
+            return "GET", "/wells/", {}
+        if kind == "dashboard":
+            return "GET", f"/wells/{well_id}/dashboard", {}
+        if kind == "segments":
+            return "GET", f"/wells/{well_id}/segments", {}
+        if kind == "operations":
+            return "GET", f"/wells/{well_id}/operations", {}
+        if kind == "search":
+            return "GET", "/search/", {"params": {"q": rng.choice(SEARCH_TERMS), "limit": 50}}
+        if kind == "timeline":
+            day = START_DATE + timedelta(days=rng.randrange(max(days - 7, 1)))
+            params = {"well_id": rng.sample(well_ids, min(3, len(well_ids))), "start": f"{day}T06:00", "end": f"{day + timedelta(days=7)}T06:00"}
+            return "GET", "/timeline/", {"params": params}
+        if kind == "upload":
+            report_date = START_DATE + timedelta(days=upload_day["next"])
+            upload_day["next"] += 1
+            url = f"/upload/daily-report?well_id={well_id}&report_date={report_date}&parser_type=NNPC_FORMAT_A"
+            return "POST", url, {"files": {"file": (pdf_path.name, pdf_bytes, "application/pdf")}}
+        raise ValueError(f"Unknown endpoint in mix: {kind}")
+
+    async def worker(client):
+        while remaining["n"] > 0:
+            remaining["n"] -= 1
+            kind = rng.choices(names, weights)[0]
+            method, url, kwargs = build_request(kind)
+            start = time.perf_counter()
+            resp = await client.request(method, url, **kwargs)
+            latencies[kind].append(time.perf_counter() - start)
+            if resp.status_code >= 400:
+                errors[kind] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        # Warm-up (imports, first connections, SQLite page cache)
+        for well_id in well_ids[:3]:
+            await client.get(f"/wells/{well_id}/dashboard")
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        wall = time.perf_counter() - wall_start
+
+    report = {"wall_seconds": round(wall, 3), "requests": total_requests,
+              "throughput_rps": round(total_requests / wall, 1), "endpoints": {}}
+    for kind in names:
+        lat = sorted(latencies[kind])
+        report["endpoints"][kind] = {
+            "count": len(lat),
+            "errors": errors[kind],
+            "rps": round(len(lat) / wall, 1),
+            "p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "p90_ms": round(percentile(lat, 90) * 1000, 2),
+            "p99_ms": round(percentile(lat, 99) * 1000, 2),
+            "max_ms": round((lat[-1] if lat else 0) * 1000, 2),
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['requests']} requests in {report['wall_seconds']}s -> {report['throughput_rps']} req/s")
+    print(f"{'endpoint':<12}{'count':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for kind, r in report["endpoints"].items():
+        print(f"{kind:<12}{r['count']:>8}{r['errors']:>8}{r['rps']:>9}{r['p50_ms']:>10}{r['p90_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=10)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--ops-per-day", type=int, default=8)
+    ap.add_argument("--db", type=Path, default=None, help="SQLite file to use (seeded if missing); default: temp file")
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default: {DEFAULT_MIX})")
+    ap.add_argument("--upload-pdf", type=Path, default=DEFAULT_PDF)
+    ap.add_argument("--json", type=Path, default=None, help="write the report as JSON")
+    args = ap.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp(prefix="loadtest_")) / "fleet.db"
+    needs_seed = not db_path.exists()
+
+    # Must be set before anything imports app.database
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    from synthetic_fleet import seed_fleet
+    if needs_seed:
+        print(f"Seeding {args.wells} wells x {args.days} days into {db_path} ...")
+        print(seed_fleet(args.wells, args.days, args.ops_per_day))
+
+        from app.database import SessionLocal
+        from app.services.risk_batch import rescore_fleet
+        db = SessionLocal()
+        try:
+            print({"risk": rescore_fleet(db)["timings_s"]})
+        finally:
+            db.close()
+
+    from app.main import app
+    from app.database import SessionLocal, engine
+    from app.migrations import run_migrations
+    from app.models import Well
+
+    # httpx's ASGI transport does not run the app's lifespan (startup migrations)
+    run_migrations(engine)
+
+    db = SessionLocal()
+    try:
+        well_ids = [w for (w,) in db.query(Well.well_id).all()]
+    finally:
+        db.close()
+
+    report = asyncio.run(run_load(
+        app, well_ids, args.days, parse_mix(args.mix), args.requests, args.concurrency, args.upload_pdf
+    ))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
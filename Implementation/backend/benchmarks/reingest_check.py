@@ -0,0 +1,208 @@
+"""
+Corrected-report (replace=true) check against a from-scratch ingest.
+
+Ingests three real DDRs for one well, then replaces the middle day with a
+different report (the "correction"). A second well ingests the corrected
+sequence directly. Every derived structure must end up identical:
+  - operations per day (all stored fields)
+  - risk_daily_stats and risk_scores (adjusted incrementally on replace)
+  - depth_buckets (offset-well index)
+  - the FTS5 indexes (integrity-check against their content tables)
+A second pair of wells applies a lightly edited parse of one report (two
+rows changed, one dropped, one added) and must see exactly those changes,
+with the untouched rows keeping their ids. Also checks that re-sending a
+report is a no-op, that a duplicate upload without replace is refused and
+that an ingest failing halfway leaves no report (re-sending it ingests it).
+
+Usage (from Implementation/backend):
+    python benchmarks/reingest_check.py
+    python benchmarks/reingest_check.py --data-dir ../data
+
+Exit code is 1 when any check fails.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+DATA_DIR = BACKEND_DIR.parent / "data"
+PARSER = "NNPC_FORMAT_A"
+DAY = date(2025, 1, 1)
+
+
+def report_files(data_dir: Path, n: int):
+    """
+    First n PDFs with distinct report dates (DD-MM-YYYY in the name).
+    """
+    files, seen = [], set()
+    for path in sorted(data_dir.rglob("*.pdf")):
+        m = re.search(r"(\d\d)-(\d\d)-(\d{4})", path.name)
+        if m and m.group(0) not in seen:
+            seen.add(m.group(0))
+            files.append(path)
+    return files[:n]
+
+
+def state(db, well_id: str) -> dict:
+    from app.models import DailyReport, DepthBucket, Operation, RiskDailyStat, RiskScore
+    from app.services.report_diff import OPERATION_FIELDS
+
+    ops = sorted((
+        (str(day),) + tuple(row)
+        for day, *row in db.query(DailyReport.report_date, *[getattr(Operation, f) for f in OPERATION_FIELDS])
+        .join(DailyReport, DailyReport.report_id == Operation.report_id)
+        .filter(Operation.well_id == well_id)
+    ), key=str)
+    stats = sorted(
+        (s.score_version, s.equipment, str(s.report_date), s.operation_count, round(s.operation_hours, 6),
+         round(s.npt_hours, 6), s.incident_count)
+        for s in db.query(RiskDailyStat).filter(RiskDailyStat.well_id == well_id)
+    )
+    scores = sorted(
+        (s.score_version, s.equipment, str(s.as_of_date), s.npt_window_hours, s.npt_trend, s.repeat_failures,
+         str(s.last_incident_date), s.days_since_incident, s.score, s.risk_level)
+        for s in db.query(RiskScore).filter(RiskScore.well_id == well_id)
+    )
+    buckets = sorted((
+        (b.location, b.bucket, b.source, b.depth_from, b.depth_to, b.level, b.kind, b.npt_hours)
+        for b in db.query(DepthBucket).filter(DepthBucket.well_id == well_id)
+    ), key=str)
+    return {"operations": ops, "risk_daily_stats": stats, "risk_scores": scores, "depth_buckets": buckets}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = ap.parse_args()
+
+    files = report_files(args.data_dir, 4)
+    if len(files) < 4:
+        print(f"Need 4 dated DDR PDFs under {args.data_dir}")
+        return 1
+
+    tmp = Path(tempfile.mkdtemp(prefix="reingest_"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp / 'reingest.db'}"
+    os.environ["BLOB_STORE_DIR"] = str(tmp / "blobs")
+
+    from sqlalchemy import text
+    from app.database import engine, SessionLocal
+    from app.migrations import run_migrations
+    from app.models import DailyReport, Operation, Well
+    from app.services import ingestion_service
+    from app.services.ingestion_service import (
+        create_daily_report, ingest_daily_report_pdf, insert_operations_events, parse_pdf_report,
+    )
+    from app.services.report_diff import apply_report_diff
+    from app.services.risk_services import update_risk_for_report
+
+    run_migrations(engine)
+    pdf = [f.read_bytes() for f in files]
+    days = [DAY + timedelta(days=i) for i in range(3)]
+
+    results = []
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        results.append(ok)
+        print(f"[{'OK' if ok else 'FAIL'}] {name}" + (f"  ({detail})" if detail else ""))
+
+    def ingest(well_id, i, day, replace=False):
+        return ingest_daily_report_pdf(db, well_id, day, files[i].name, pdf[i], PARSER, replace=replace)
+
+    def parsed_rows(i):
+        return len(parse_pdf_report(pdf[i], PARSER)["operations"])
+
+    db = SessionLocal()
+    try:
+        db.add_all([Well(well_id=w, well_name=w, location="CHECK") for w in ("LIVE", "REF", "EDIT", "EDITREF")])
+        db.commit()
+
+        for i, day in enumerate(days):
+            ingest("LIVE", i, day)
+        corrected = ingest("LIVE", 3, days[1], replace=True)
+        print(f"    diff: {', '.join(f'{k}={v}' for k, v in corrected.items() if k.startswith('operations_'))}")
+        check("correction is applied as a diff", corrected["replaced"])
+
+        for i, day in zip((0, 3, 2), days):
+            ingest("REF", i, day)
+
+        live, ref = state(db, "LIVE"), state(db, "REF")
+        for name in live:
+            check(f"{name} match a fresh ingest", live[name] == ref[name], f"{len(live[name])} rows")
+
+        for table in ("operations_fts", "events_fts"):
+            try:
+                db.execute(text(f"INSERT INTO {table}({table}, rank) VALUES ('integrity-check', 1)"))
+                check(f"{table} in sync with its table", True)
+            except Exception as e:
+                check(f"{table} in sync with its table", False, str(e))
+
+        # Small edits (no such PDFs in the corpus): the same steps replace_daily_report runs on a parse
+        parsed = parse_pdf_report(pdf[1], PARSER)
+        edited = {**parsed, "operations": [o.to_dict() for o in parsed["operations"]]}
+        ops = edited["operations"]
+        ops[0]["description"] = (ops[0]["description"] or "") + " - STRING STUCK"
+        ops[1]["npt_hours"] = 1.5
+        del ops[2]
+        ops.append({**ops[-1], "start_time_str": "23:00", "end_time_str": "23:30", "description": "FLOW CHECK"})
+
+        ingest("EDIT", 1, days[0])
+        report = db.query(DailyReport).filter(DailyReport.well_id == "EDIT").one()
+        ids_before = {o.operation_id for o in db.query(Operation.operation_id).filter(Operation.well_id == "EDIT")}
+        changes = apply_report_diff(db, report, edited)
+        update_risk_for_report(db, "EDIT", days[0], changes["added"], removed=changes["removed"], commit=False)
+        db.commit()
+        ids_after = {o.operation_id for o in db.query(Operation.operation_id).filter(Operation.well_id == "EDIT")}
+        counts = changes["operations"]
+        print(f"    diff: {counts}")
+        check("edits become 2 updates, 1 delete, 1 insert",
+              (counts["update"], counts["delete"], counts["insert"]) == (2, 1, 1)
+              and counts["unchanged"] == len(parsed["operations"]) - 3)
+        check("unchanged and updated rows keep their ids", len(ids_before & ids_after) == len(ids_before) - 1)
+
+        ref_report = create_daily_report(db, "EDITREF", days[0], files[1].name, PARSER, "edited")
+        insert_operations_events(db, ref_report.report_id, "EDITREF", edited, days[0])
+        update_risk_for_report(db, "EDITREF", days[0], edited["operations"])
+        live, ref = state(db, "EDIT"), state(db, "EDITREF")
+        for name in live:
+            check(f"edited {name} match a fresh ingest", live[name] == ref[name], f"{len(live[name])} rows")
+
+        live = state(db, "LIVE")
+        again = ingest("LIVE", 3, days[1], replace=True)
+        check("re-sending the same report is a no-op", not again["replaced"] and state(db, "LIVE") == live)
+
+        try:
+            ingest("LIVE", 0, days[0])
+            check("duplicate upload without replace is refused", False)
+        except ValueError:
+            db.rollback()
+            check("duplicate upload without replace is refused", True)
+
+        # A failure after the report row is written must not leave a report behind
+        retry_day = days[2] + timedelta(days=1)
+        real_update = ingestion_service.update_risk_for_report
+        ingestion_service.update_risk_for_report = lambda *args, **kwargs: 1 / 0
+        try:
+            ingest("LIVE", 0, retry_day, replace=True)
+        except ZeroDivisionError:
+            pass
+        finally:
+            ingestion_service.update_risk_for_report = real_update
+        left = db.query(DailyReport).filter(DailyReport.well_id == "LIVE", DailyReport.report_date == retry_day).count()
+        retried = ingest("LIVE", 0, retry_day, replace=True)
+        check("a failed ingest leaves no report; re-sending the file ingests it",
+              left == 0 and not retried.get("replaced") and retried["operations_inserted"] == parsed_rows(0),
+              f"{retried['operations_inserted']} operations")
+    finally:
+        db.close()
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Synthetic fleet generator for load tests and query-plan checks.
+
+Seeds wells, one daily report per well per day, a day's worth of
+operations per report and (optionally) events recorded during some of those
+operations into the database the app is configured with (DATABASE_URL),
+using bulk inserts. Events are left unlinked (operation_id NULL), as parsed
+events are before services/event_linking.py runs.
+
+Usage (from Implementation/backend):
+    DATABASE_URL=sqlite:////tmp/fleet.db python benchmarks/synthetic_fleet.py --wells 10 --days 365
+    DATABASE_URL=sqlite:////tmp/fleet.db python benchmarks/synthetic_fleet.py --events-per-day 2
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import engine, SessionLocal  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import Well, DailyReport, Operation, Event  # noqa: E402
+from app.services.offset_wells import rebuild_depth_index  # noqa: E402
+
+START_DATE = date(2025, 1, 1)
+LOCATIONS = ["LAGOS", "PORT HARCOURT", "WARRI", "ONITSHA", "OWERRI"]
+
+# (operation_type, description template, typical hours)
+OPERATION_TEMPLATES = [
+    ("Drilling", "CONTINUED DRILLING 12-1/4\" DIR HOLE FROM {d0:,.0f} FT - {d1:,.0f} FT", 6.0),
+    ("Drilling", "DRILLED AHEAD WITH RSS BHA, WOB 15-25 KIPS, GPM 750", 5.0),
+    ("Reaming", "REAM UP & DOWN PRIOR TO CONNECTION", 1.5),
+    ("Circulating", "CIRCULATED 2 X BOTTOMS UP, FLOW CHECKED THE WELL - STATIC", 2.0),
+    ("Tripping", "POOH THE BHA ON 5-1/2'' DP WHILE MONITORING WELL ON TRIP TANK", 4.0),
+    ("Tripping", "RIH WITH NEW BIT TO {d0:,.0f} FT", 3.0),
+    ("Testing", "PRESSURE TEST BOP TO 3000 PSI - OK", 2.0),
+    ("Downtime", "WAITING ON MUD PUMP REPAIR (NPT)", 3.0),
+    ("Downtime", "STRING STUCK AT {d0:,.0f} FT, WORKED PIPE - NO SUCCESS", 4.5),
+    ("Other", "HELD SAFETY MEETING AND SERVICED TOP DRIVE", 1.0),
+]
+
+# (event_type, description, severity)
+EVENT_TEMPLATES = [
+    ("Stuck Pipe", "STRING STUCK, WORKED PIPE FREE", "critical"),
+    ("Mud Loss", "PARTIAL LOSSES TO FORMATION, PUMPED LCM PILL", "warning"),
+    ("Equipment Failure", "MUD PUMP #2 LINER WASHED OUT", "warning"),
+    ("Kick", "WELL FLOWING ON FLOW CHECK, SHUT IN AND MONITORED", "critical"),
+    ("Survey", "MWD SURVEY TAKEN", "normal"),
+]
+
+INSERT_CHUNK_ROWS = 10_000
+
+
+def _flush(db, model, rows):
+    if rows:
+        db.execute(insert(model), rows)
+        rows.clear()
+
+
+def seed_fleet(wells: int, days: int, ops_per_day: int = 8, seed: int = 42, well_prefix: str = "SYN",
+               events_per_day: float = 0.0) -> dict:
+    """
+    Brings the schema up to date (migrations) and inserts the synthetic fleet. Returns counts.
+    """
+    rng = random.Random(seed)
+    run_migrations(engine)
+    db = SessionLocal()
+
+    t0 = time.perf_counter()
+    n_reports = n_ops = n_events = 0
+    try:
+        db.execute(insert(Well), [
+            {
+                "well_id": f"{well_prefix}-{w:04d}",
+                "well_name": f"Synthetic {w:04d}",
+                "location": LOCATIONS[w % len(LOCATIONS)],
+                "well_status": "Normal",
+            }
+            for w in range(wells)
+        ])
+
+        next_report_id = (db.query(DailyReport.report_id).order_by(DailyReport.report_id.desc()).limit(1).scalar() or 0) + 1
+        op_rows = []
+        event_rows = []
+
+        for w in range(wells):
+            well_id = f"{well_prefix}-{w:04d}"
+            depth = rng.uniform(0, 500)
+            report_rows = []
+
+            for d in range(days):
+                report_date = START_DATE + timedelta(days=d)
+                report_id = next_report_id
+                next_report_id += 1
+                report_rows.append({
+                    "report_id": report_id,
+                    "well_id": well_id,
+                    "report_date": report_date,
+                    "report_no": str(d + 1),
+                    "source_filename": f"{well_id}_{report_date}.pdf",
+                    "parser_type": "SYNTHETIC",
+                })
+
+                clock = datetime.combine(report_date, datetime.min.time())
+                hours_left = 24.0
+                for i in range(ops_per_day):
+                    op_type, template, typical = rng.choice(OPERATION_TEMPLATES)
+                    dur = hours_left if i == ops_per_day - 1 else min(hours_left, round(rng.uniform(0.5, 1.5) * typical, 2))
+                    hours_left -= dur
+                    progress = rng.uniform(20, 150) * dur / 6 if op_type == "Drilling" else 0.0
+                    d0, d1 = depth, depth + progress
+                    depth = d1
+                    npt = round(dur, 2) if op_type == "Downtime" else None
+
+                    op_rows.append({
+                        "report_id": report_id,
+                        "well_id": well_id,
+                        "depth_from": round(d0, 1),
+                        "depth_to": round(d1, 1),
+                        "operation_type": op_type,
+                        "description": template.format(d0=d0, d1=d1),
+                        "start_time": clock,
+                        "end_time": clock + timedelta(hours=dur),
+                        "duration_hours": dur,
+                        "npt_hours": npt,
+                    })
+                    # An event recorded inside this operation's time and depth span
+                    if events_per_day and rng.random() < events_per_day / ops_per_day:
+                        ev_type, ev_text, severity = rng.choice(EVENT_TEMPLATES)
+                        ev_depth = round(rng.uniform(d0, d1), 1)
+                        event_rows.append({
+                            "report_id": report_id,
+                            "well_id": well_id,
+                            "depth_from": ev_depth,
+                            "depth_to": ev_depth,
+                            "event_type": ev_type,
+                            "event_description": ev_text,
+                            "npt_hours": npt,
+                            "severity": severity,
+                            "recorded_at": clock + timedelta(hours=dur * rng.uniform(0.1, 0.9)),
+                        })
+                        n_events += 1
+                    clock += timedelta(hours=dur)
+
+                if len(op_rows) >= INSERT_CHUNK_ROWS:
+                    _flush(db, DailyReport, report_rows)
+                    _flush(db, Operation, op_rows)
+                    _flush(db, Event, event_rows)
+
+                n_reports += 1
+                n_ops += ops_per_day
+
+            _flush(db, DailyReport, report_rows)
+            _flush(db, Operation, op_rows)
+            _flush(db, Event, event_rows)
+
+        # Bulk inserts bypass ingest, so the offset-well depth index is built here
+        rebuild_depth_index(db, [f"{well_prefix}-{w:04d}" for w in range(wells)])
+        db.commit()
+    finally:
+        db.close()
+
+    return {"wells": wells, "reports": n_reports, "operations": n_ops, "events": n_events, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--wells", type=int, default=10)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--ops-per-day", type=int, default=8)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--events-per-day", type=float, default=0.0)
+    args = ap.parse_args()
+    print(seed_fleet(args.wells, args.days, args.ops_per_day, args.seed, events_per_day=args.events_per_day))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
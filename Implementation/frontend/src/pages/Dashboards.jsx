@@ -16,7 +16,19 @@ export default function Dashboard() {
   const [selectedSegment, setSelectedSegment] = useState(null);
 
   useEffect(() => {
+    // Deltas that arrive while the dashboard is loading wait for it; any
+    // whose report the loaded dashboard already includes is dropped
+    let loaded = false;
+    let pending = [];
+
+    function applyDelta(prev, delta) {
+      if (!prev || prev.reportIds.includes(delta.reportId)) return prev;
+      const segments = [...prev.segments, ...delta.segments].sort((a, b) => a.from - b.from);
+      return { ...prev, kpis: delta.kpis, segments, reportIds: [...prev.reportIds, delta.reportId] };
+    }
+
     async function load() {
+      loaded = false;
       setLoading(true);
       setError("");
 
@@ -24,7 +36,10 @@ export default function Dashboard() {
         const res = await fetch(`http://127.0.0.1:8000/wells/${wellId}/dashboard`);
         if (!res.ok) throw new Error(`Backend error: ${res.status}`);
         const data = await res.json();
-        setDash(data);
+        const missed = pending;
+        pending = [];
+        loaded = true;
+        setDash(missed.reduce(applyDelta, data));
       } catch (e) {
         setError(e.message || "Failed to load dashboard");
       } finally {
@@ -33,6 +48,23 @@ export default function Dashboard() {
     }
 
     load();
+
+    // Live updates: the backend pushes each new report's segments + KPIs
+    const source = new EventSource(`http://127.0.0.1:8000/wells/${wellId}/stream`);
+
+    source.addEventListener("report", (e) => {
+      const delta = JSON.parse(e.data);
+      if (!loaded) {
+        pending.push(delta);
+        return;
+      }
+      setDash((prev) => applyDelta(prev, delta));
+    });
+
+    // Missed too many events: fall back to a full reload
+    source.addEventListener("resync", () => load());
+
+    return () => source.close();
   }, [wellId]);
 
   if (loading) return <div style={{ padding: 16 }}>Loading dashboard…</div>;